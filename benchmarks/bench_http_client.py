@@ -0,0 +1,113 @@
+"""Benchmark of Confluence client connection handling against a local stub.
+
+Serves a recorded content listing from a local uvicorn server and sends the
+same requests through a new client per request (the previous fallback when
+no client was initialised), a shared client with httpx default limits, and a
+shared client built by ``confluence._build_transport`` from the settings.
+Reports throughput and the number of TCP connections the server saw.
+
+HTTP/2 needs TLS with ALPN on both ends, which the local uvicorn stub does not
+offer, so ``CONFLUENCE_HTTP2`` has to be measured against a real site.
+
+Usage:
+    python -m benchmarks.bench_http_client --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple
+
+import httpx
+
+from benchmarks.stub_confluence import start_server
+from src.services import confluence
+
+PAYLOAD = (Path(__file__).parent / "payloads" / "content_listing.json").read_bytes()
+
+
+class StubServer:
+    """Minimal ASGI app that answers every request with the listing payload."""
+
+    def __init__(self) -> None:
+        self.peers: Set[Tuple[str, int]] = set()
+
+    async def __call__(
+        self,
+        scope: Dict[str, Any],
+        receive: Callable[[], Awaitable[Dict[str, Any]]],
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        if scope["type"] != "http":
+            return
+        self.peers.add(tuple(scope["client"]))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": PAYLOAD})
+
+
+async def run(
+    get: Callable[[str], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            response = await get(f"/wiki/rest/api/content?start={i}")
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start
+
+
+async def bench(
+    base_url: str, app: StubServer, requests: int, concurrency: int
+) -> None:
+    async def per_request(path: str) -> httpx.Response:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            return await client.get(path)
+
+    default_client = httpx.AsyncClient(base_url=base_url)
+    tuned_client = httpx.AsyncClient(
+        base_url=base_url,
+        transport=confluence._build_transport(),  # pyright: ignore[reportPrivateUsage]
+    )
+    scenarios = (
+        ("client per request", per_request),
+        ("shared, defaults", default_client.get),
+        ("shared, settings", tuned_client.get),
+    )
+    for name, get in scenarios:
+        app.peers.clear()
+        elapsed = await run(get, requests, concurrency)
+        print(
+            f"{name:<20} {requests / elapsed:8.0f} req/s "
+            f"{len(app.peers):6d} connections"
+        )
+    await default_client.aclose()
+    await tuned_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    app = StubServer()
+    server, base_url = start_server(app)
+    try:
+        asyncio.run(bench(base_url, app, args.requests, args.concurrency))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
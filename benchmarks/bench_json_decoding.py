@@ -0,0 +1,76 @@
+"""Benchmark of decoding Confluence content listing responses.
+
+Compares ``httpx.Response.json()`` followed by the previous nested-lookup
+parsing with ``_parse_listing``, which decodes the raw bytes (with orjson
+when installed) and keeps only the fields of ``PageRecord``.
+
+The default payload, ``payloads/content_listing.json``, is an anonymised
+listing in the shape Confluence Cloud returns for
+``/wiki/rest/api/content?expand=body.storage,version``. Pass ``--payload``
+to replay a response captured from a real site instead.
+
+Usage:
+    python -m benchmarks.bench_json_decoding --listings 200
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Callable, List
+
+import httpx
+
+from benchmarks.bench_page_parsing import parse_models
+from src.services import confluence
+
+DEFAULT_PAYLOAD = Path(__file__).parent / "payloads" / "content_listing.json"
+
+
+def decode_response_json(content: bytes) -> List[Any]:
+    """The previous path: ``response.json()`` then a model per result."""
+    data = httpx.Response(200, content=content).json()
+    return parse_models(data.get("results", []))
+
+
+def decode_listing(content: bytes) -> List[Any]:
+    listing = confluence._parse_listing(  # pyright: ignore[reportPrivateUsage]
+        content, "BENCH"
+    )
+    return listing.pages
+
+
+def measure(
+    decode: Callable[[bytes], List[Any]], content: bytes, listings: int
+) -> float:
+    """Return the best time per page, in microseconds, over three runs."""
+    best = float("inf")
+    pages = 0
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(listings):
+            pages = len(decode(content))
+        best = min(best, time.perf_counter() - start)
+    return best / (listings * max(pages, 1)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payload", type=Path, default=DEFAULT_PAYLOAD)
+    parser.add_argument("--listings", type=int, default=200)
+    args = parser.parse_args()
+
+    content = args.payload.read_bytes()
+    loads = confluence._loads  # pyright: ignore[reportPrivateUsage]
+    decoder = getattr(loads, "__module__", None)
+    print(
+        f"payload: {args.payload.name} ({len(content) / 1024:.0f} KiB), decoder: {decoder}"
+    )
+    for name, decode in (
+        ("response.json()", decode_response_json),
+        ("_parse_listing", decode_listing),
+    ):
+        print(f"{name:<16} {measure(decode, content, args.listings):8.2f} us/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""End-to-end benchmark of space refinement against local stand-ins.
+
+Each space size runs in a fresh process with a temporary SQLite job store,
+page cache and ChromaDB, against ``stub_confluence`` and ``fake_llm`` served
+on local ports. Two phases are timed:
+
+- ``space_refinement``: ``process_space_refinement`` lists and ingests the
+  space, then every page goes through the analyst, writer and reviewer.
+- ``webhook_ingest``: a ``page_updated`` event per page is posted to
+  ``/webhooks/confluence`` and the queue is flushed, re-fetching and
+  re-indexing the whole space in batches.
+
+For each size the results hold pages/sec per phase, job latency (creation to
+last update) and stage percentiles, peak RSS, SQLite writes per operation,
+and ChromaDB embedding time. They are written as JSON; ``--compare`` prints
+the change against an earlier results file.
+
+Embeddings use a deterministic hashing function by default, so runs need no
+model download; ``--embedding default`` measures ChromaDB's ONNX model when
+it is available locally.
+
+Usage:
+    python -m benchmarks.bench_space_refinement --sizes 100 1000 10000
+    python -m benchmarks.bench_space_refinement --sizes 100 --compare old.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import chromadb
+import httpx
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.config import Settings as ChromaSettings
+from prometheus_client import Histogram
+
+from benchmarks.fake_llm import FakeLLM, FakeLLMConfig
+from benchmarks.stub_confluence import StubConfig, StubConfluence, start_server
+from src import database, webhooks
+from src.agents import common
+from src.config import settings
+from src.deps import background_tasks_set
+from src.job_metrics import summarize_stages
+from src.main import app
+from src.metrics import RAG_EMBEDDING_BATCH_SECONDS, SQLITE_WRITE_SECONDS
+from src.models.domain import JobMetrics
+from src.services import confluence, page_cache, rag
+from src.tasks import process_space_refinement
+
+SPACE_KEY = "BENCH"
+DEFAULT_OUTPUT = Path(__file__).parent / "results"
+
+
+class HashEmbedding(EmbeddingFunction[Documents]):
+    """Deterministic bag-of-words vectors, so runs need no embedding model."""
+
+    def __init__(self, dimensions: int = 384) -> None:
+        self.dimensions = dimensions
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings: Embeddings = []
+        for document in input:
+            vector = [0.0] * self.dimensions
+            for word in document.lower().split():
+                digest = hashlib.blake2b(word.encode(), digest_size=4).digest()
+                vector[int.from_bytes(digest, "little") % self.dimensions] += 1.0
+            norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+            embeddings.append([v / norm for v in vector])
+        return embeddings
+
+
+def _histogram_totals(histogram: Histogram) -> Dict[str, Dict[str, float]]:
+    """Sum and count of a histogram, per label set joined with commas."""
+    totals: Dict[str, Dict[str, float]] = {}
+    for metric in histogram.collect():
+        for sample in metric.samples:
+            for suffix in ("_sum", "_count"):
+                if sample.name.endswith(suffix):
+                    key = ",".join(sample.labels.values()) or "all"
+                    totals.setdefault(key, {})[suffix[1:]] = sample.value
+    return totals
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _wait_for_jobs() -> None:
+    while background_tasks_set:
+        await asyncio.gather(*list(background_tasks_set), return_exceptions=True)
+
+
+async def _run_phases() -> Dict[str, float]:
+    await confluence.init_client()
+    timings: Dict[str, float] = {}
+    try:
+        start = time.perf_counter()
+        await process_space_refinement(SPACE_KEY)
+        await _wait_for_jobs()
+        timings["space_refinement"] = time.perf_counter() - start
+
+        page_ids = [page.id for page in await confluence.list_space_pages(SPACE_KEY)]
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers={"X-API-Key": settings.APP_API_KEY},
+        ) as client:
+            start = time.perf_counter()
+            for page_id in page_ids:
+                response = await client.post(
+                    "/webhooks/confluence",
+                    json={"event": "page_updated", "page": {"id": page_id}},
+                )
+                response.raise_for_status()
+            await webhooks.stop()
+            timings["webhook_ingest"] = time.perf_counter() - start
+    finally:
+        await confluence.close_client()
+    return timings
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Benchmark one space size in this process and return its results."""
+    pages = args.run
+    # Per-job INFO logs would dominate the run at large sizes
+    logging.getLogger().setLevel(logging.WARNING)
+    workdir = Path(tempfile.mkdtemp(prefix="bench-space-"))
+
+    stub = StubConfluence(
+        StubConfig(
+            spaces={SPACE_KEY: pages},
+            body_size=args.body_size,
+            latency=args.confluence_latency,
+        )
+    )
+    fake = FakeLLM(
+        FakeLLMConfig(ttft=args.ttft, token_latency=args.token_latency, seed=1)
+    )
+    confluence_server, confluence_url = start_server(stub.app)
+    llm_server, llm_url = start_server(fake.app)
+
+    settings.CONFLUENCE_URL = confluence_url
+    settings.OPENAI_BASE_URL = f"{llm_url}/v1"
+    settings.OPENAI_API_KEY = "fake"
+    settings.DB_PATH = str(workdir / "jobs.db")
+    settings.PAGE_CACHE_PATH = str(workdir / "page_cache.db")
+    settings.CHROMA_DB_PATH = str(workdir / "chroma")
+    settings.DB_MAINTENANCE_INTERVAL = 0
+    common.set_client(None)
+    database.init_db()
+
+    if args.embedding == "hash":
+        chroma = chromadb.PersistentClient(
+            path=settings.CHROMA_DB_PATH, settings=ChromaSettings(allow_reset=True)
+        )
+        collection = chroma.get_or_create_collection(
+            name="confluence_pages",
+            metadata={"hnsw:space": "cosine"},
+            # chromadb annotates the parameter for images as well as documents
+            embedding_function=HashEmbedding(),  # pyright: ignore[reportArgumentType]
+        )
+        rag._chroma_client = chroma  # pyright: ignore[reportPrivateUsage]
+        rag._collection = collection  # pyright: ignore[reportPrivateUsage]
+
+    try:
+        timings = asyncio.run(_run_phases())
+    finally:
+        database.close_db()
+        page_cache.close()
+        confluence_server.should_exit = True
+        llm_server.should_exit = True
+
+    with sqlite3.connect(settings.DB_PATH) as conn:
+        rows = conn.execute(
+            "SELECT status, created_at, updated_at, metrics FROM jobs"
+        ).fetchall()
+    statuses: Dict[str, int] = {}
+    job_metrics: List[JobMetrics] = []
+    for status, created_at, updated_at, metrics in rows:
+        statuses[status] = statuses.get(status, 0) + 1
+        stage_metrics = (
+            JobMetrics.model_validate_json(metrics) if metrics else JobMetrics()
+        )
+        stage_metrics.stage_ms["job"] = (updated_at - created_at) * 1000
+        job_metrics.append(stage_metrics)
+    stages = {
+        name: stats.model_dump()
+        for name, stats in summarize_stages(job_metrics).items()
+    }
+
+    embedding = _histogram_totals(RAG_EMBEDDING_BATCH_SECONDS).get("all", {})
+    sqlite_writes = {
+        operation: int(totals.get("count", 0))
+        for operation, totals in _histogram_totals(SQLITE_WRITE_SECONDS).items()
+    }
+    return {
+        "pages": pages,
+        "seconds": {name: round(value, 3) for name, value in timings.items()},
+        "pages_per_sec": {
+            name: round(pages / value, 2) for name, value in timings.items()
+        },
+        "job_latency_ms": stages.pop("job", {}),
+        "stages_ms": stages,
+        "jobs": statuses,
+        "peak_rss_mb": _peak_rss_mb(),
+        "sqlite_writes": sqlite_writes,
+        "sqlite_writes_total": sum(sqlite_writes.values()),
+        "embedding_seconds": round(embedding.get("sum", 0.0), 3),
+        "embedding_batches": int(embedding.get("count", 0)),
+        "confluence_requests": stub.stats.requests,
+        "llm_requests": fake.stats.requests,
+    }
+
+
+def _run_size(pages: int, args: argparse.Namespace) -> Dict[str, Any]:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_space_refinement",
+        "--run",
+        str(pages),
+        "--body-size",
+        str(args.body_size),
+        "--confluence-latency",
+        str(args.confluence_latency),
+        "--ttft",
+        str(args.ttft),
+        "--token-latency",
+        str(args.token_latency),
+        "--embedding",
+        args.embedding,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise RuntimeError(f"Benchmark of {pages} pages failed")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    latency = result["job_latency_ms"]
+    rates = result["pages_per_sec"]
+    print(
+        f"{result['pages']:>6} pages  "
+        f"refine {rates.get('space_refinement', 0):8.2f} pages/s  "
+        f"webhook ingest {rates.get('webhook_ingest', 0):8.2f} pages/s  "
+        f"job p50/p95/p99 {latency.get('p50_ms', 0):.0f}/"
+        f"{latency.get('p95_ms', 0):.0f}/{latency.get('p99_ms', 0):.0f} ms  "
+        f"rss {result['peak_rss_mb']} MB  "
+        f"sqlite writes {result['sqlite_writes_total']}  "
+        f"embedding {result['embedding_seconds']} s"
+    )
+
+
+def _compare(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """Print the relative change of the headline numbers per space size."""
+    before = {result["pages"]: result for result in previous["results"]}
+    metrics: Tuple[Tuple[str, str, Optional[str]], ...] = (
+        ("refine pages/s", "pages_per_sec", "space_refinement"),
+        ("ingest pages/s", "pages_per_sec", "webhook_ingest"),
+        ("job p95 ms", "job_latency_ms", "p95_ms"),
+        ("peak RSS MB", "peak_rss_mb", None),
+        ("sqlite writes", "sqlite_writes_total", None),
+        ("embedding s", "embedding_seconds", None),
+    )
+
+    def value(result: Dict[str, Any], key: str, field: Optional[str]) -> float:
+        found: Any = result.get(key)
+        if field is not None and found:
+            found = found.get(field)
+        return float(found or 0)
+
+    for result in current["results"]:
+        old = before.get(result["pages"])
+        if old is None:
+            continue
+        print(f"{result['pages']} pages vs {previous.get('commit') or 'previous'}:")
+        for name, key, field in metrics:
+            new_value, old_value = value(result, key, field), value(old, key, field)
+            if not new_value or not old_value:
+                continue
+            change = (new_value - old_value) / old_value * 100
+            print(
+                f"  {name:<15} {old_value:>10.6g} -> {new_value:>10.6g} ({change:+.1f}%)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--body-size", type=int, default=4000)
+    parser.add_argument("--confluence-latency", type=float, default=0.005)
+    parser.add_argument("--ttft", type=float, default=0.02)
+    parser.add_argument("--token-latency", type=float, default=0.0001)
+    parser.add_argument("--embedding", choices=("hash", "default"), default="hash")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--run", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        # Child process: one size, results on the last line of stdout
+        print(json.dumps(run(args)))
+        return
+
+    report: Dict[str, Any] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {
+            name: getattr(args, name)
+            for name in (
+                "body_size",
+                "confluence_latency",
+                "ttft",
+                "token_latency",
+                "embedding",
+            )
+        },
+        "results": [],
+    }
+    for pages in args.sizes:
+        result = _run_size(pages, args)
+        _print_result(result)
+        report["results"].append(result)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = DEFAULT_OUTPUT / f"space_refinement_{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+    if args.compare is not None:
+        _compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Local OpenAI-compatible chat completions backend, for load tests and benchmarks.
+
+Answers ``POST /v1/chat/completions`` like the OpenAI API, plain or streamed,
+with deterministic outputs in the shapes the agents parse: critiques for the
+analyst, a rewritten document for the writer and a decision for the reviewer.
+The same prompt always gets the same answer. Generation time is simulated as a
+time to first token plus a delay per completion token, and a request budget
+answered with ``429`` and random rate limit errors can be injected.
+
+Run it as a server and point the service at it:
+
+    python -m benchmarks.fake_llm --ttft 0.4 --token-latency 0.01 --port 8091
+    OPENAI_BASE_URL=http://127.0.0.1:8091/v1 OPENAI_API_KEY=fake uvicorn src.main:app
+
+or keep it in-process, without sockets, with ``install(FakeLLM(...))``.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from openai import AsyncOpenAI
+
+from src.agents import common
+
+# Characters per token, close enough to the OpenAI tokenizers for English text.
+CHARS_PER_TOKEN = 4
+
+_SECTION = re.compile(
+    r"Original Text:\n(.*?)\n\n(?:Context from RAG|Critiques from)", re.S
+)
+
+_ISSUES = (
+    ("The introduction does not state who the page is for.", "Add an audience line."),
+    ("Steps are listed without their prerequisites.", "List the prerequisites first."),
+    ("A referenced dashboard link is outdated.", "Link the current dashboard."),
+    ("Terminology differs from the related runbooks.", "Use the runbook terms."),
+    ("The rollback procedure is missing.", "Document how to roll back."),
+    ("Headings skip a level.", "Use consecutive heading levels."),
+)
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@dataclass(slots=True)
+class FakeLLMConfig:
+    """How fast the fake model answers and how often it refuses.
+
+    Attributes:
+        ttft: Seconds before the first token.
+        token_latency: Seconds per completion token after the first.
+        rate_limit: Requests allowed per ``rate_window``, unlimited when None.
+        rate_window: Length of the rate limit window, in seconds.
+        error_rate: Fraction of requests answered with a rate limit error.
+        retry_after: Seconds suggested in ``retry-after`` on rate limit errors
+            from ``error_rate``.
+        approve_rate: Fraction of reviews that approve the rewrite.
+        seed: Seed of the error injection.
+    """
+
+    ttft: float = 0.0
+    token_latency: float = 0.0
+    rate_limit: Optional[int] = None
+    rate_window: float = 60.0
+    error_rate: float = 0.0
+    retry_after: float = 0.0
+    approve_rate: float = 1.0
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class FakeLLMStats:
+    """Request and token counts, reset with ``FakeLLM.reset_stats``."""
+
+    requests: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+class FakeLLM:
+    """Deterministic chat completions served by a FastAPI app (``self.app``)."""
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None) -> None:
+        self.config = config or FakeLLMConfig()
+        self.stats = FakeLLMStats()
+        self._random = random.Random(self.config.seed)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.app = self._build_app()
+
+    def reset_stats(self) -> None:
+        self.stats = FakeLLMStats()
+
+    def complete(self, system_prompt: str, prompt: str) -> str:
+        """Return the answer to a prompt, seeded by its text."""
+        seed = hashlib.sha256(f"{system_prompt}\0{prompt}".encode()).digest()
+        rng = random.Random(seed)
+        if "Analyst Agent" in system_prompt:
+            issues = rng.sample(_ISSUES, rng.randint(1, 3))
+            critiques = [
+                {
+                    "description": description,
+                    "severity": rng.choice(("low", "medium", "high")),
+                    "suggestion": suggestion,
+                }
+                for description, suggestion in issues
+            ]
+            return "```json\n" + json.dumps({"critiques": critiques}) + "\n```"
+        if "Writer Agent" in system_prompt:
+            match = _SECTION.search(prompt)
+            original = match.group(1) if match else prompt
+            return f"{original}\n\n<p>Reviewed for accuracy and consistency.</p>"
+        if "Reviewer Agent" in system_prompt:
+            approved = rng.random() < self.config.approve_rate
+            return json.dumps(
+                {
+                    "status": "approved" if approved else "failed",
+                    "feedback": (
+                        "The critiques are addressed."
+                        if approved
+                        else "The rewrite drops required steps."
+                    ),
+                }
+            )
+        return "OK"
+
+    def _rate_limited(self) -> Optional[Response]:
+        retry_after: Optional[float] = None
+        limit = self.config.rate_limit
+        if limit is not None:
+            now = time.monotonic()
+            if now - self._window_start >= self.config.rate_window:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count >= limit:
+                retry_after = self._window_start + self.config.rate_window - now
+            else:
+                self._window_count += 1
+        if retry_after is None and self._random.random() < self.config.error_rate:
+            retry_after = self.config.retry_after
+        if retry_after is None:
+            return None
+        self.stats.rate_limited += 1
+        return JSONResponse(
+            {
+                "error": {
+                    "message": "Rate limit reached for requests",
+                    "type": "requests",
+                    "param": None,
+                    "code": "rate_limit_exceeded",
+                }
+            },
+            status_code=429,
+            headers={
+                "retry-after": str(max(0, round(retry_after))),
+                "retry-after-ms": str(round(retry_after * 1000)),
+            },
+        )
+
+    async def _stream(
+        self, completion_id: str, model: str, text: str
+    ) -> AsyncGenerator[str, None]:
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str]) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        stats = self.stats
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(self.config.ttft)
+            yield chunk({"role": "assistant", "content": ""}, None)
+            for start in range(0, len(text), CHARS_PER_TOKEN):
+                if start:
+                    await asyncio.sleep(self.config.token_latency)
+                yield chunk({"content": text[start : start + CHARS_PER_TOKEN]}, None)
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+        finally:
+            stats.in_flight -= 1
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake LLM")
+
+        @app.post("/v1/chat/completions")
+        async def chat_completions(  # pyright: ignore[reportUnusedFunction]
+            request: Request,
+        ) -> Response:
+            stats = self.stats
+            stats.requests += 1
+            refused = self._rate_limited()
+            if refused is not None:
+                return refused
+
+            body = await request.json()
+            messages: List[Dict[str, Any]] = body.get("messages", [])
+            system_prompt, prompt = _prompts(messages)
+            model = body.get("model", "fake")
+            text = self.complete(system_prompt, prompt)
+            prompt_tokens = sum(count_tokens(str(m.get("content"))) for m in messages)
+            completion_tokens = count_tokens(text)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+            if body.get("stream"):
+                return StreamingResponse(
+                    self._stream(completion_id, model, text),
+                    media_type="text/event-stream",
+                )
+
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            try:
+                await asyncio.sleep(
+                    self.config.ttft
+                    + (completion_tokens - 1) * self.config.token_latency
+                )
+            finally:
+                stats.in_flight -= 1
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": text},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                }
+            )
+
+        return app
+
+
+def _prompts(messages: List[Dict[str, Any]]) -> Tuple[str, str]:
+    system_prompt = prompt = ""
+    for message in messages:
+        content = str(message.get("content") or "")
+        if message.get("role") == "system":
+            system_prompt = content
+        else:
+            prompt = content
+    return system_prompt, prompt
+
+
+def install(fake: FakeLLM) -> AsyncOpenAI:
+    """Route every agent call to a fake backend in this process.
+
+    Undo it with ``common.set_client(None)``.
+
+    Returns:
+        The OpenAI client now used by the agents.
+    """
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake.app))
+    client = AsyncOpenAI(
+        api_key="fake",
+        base_url="http://fake-llm/v1",
+        max_retries=2,
+        # Newer openai releases annotate their vendored httpx fork here
+        http_client=http_client,  # pyright: ignore[reportArgumentType]
+    )
+    common.set_client(client)
+    return client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ttft", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--rate-window", type=float, default=60.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--approve-rate", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8091)
+    args = parser.parse_args()
+
+    fake = FakeLLM(
+        FakeLLMConfig(
+            ttft=args.ttft,
+            token_latency=args.token_latency,
+            rate_limit=args.rate_limit,
+            rate_window=args.rate_window,
+            error_rate=args.error_rate,
+            retry_after=args.retry_after,
+            approve_rate=args.approve_rate,
+            seed=args.seed,
+        )
+    )
+    print(f"Serving fake chat completions on http://127.0.0.1:{args.port}/v1")
+    uvicorn.run(fake.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
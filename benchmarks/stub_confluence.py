@@ -0,0 +1,424 @@
+"""Local stand-in for the Confluence REST API, for load tests and benchmarks.
+
+Serves synthetic spaces through the endpoints ``src.services.confluence``
+uses: content listings with ``_links.next`` paging and a server-side cap on
+the page size, single pages, version lookups, the CQL page count and v2 page
+updates with version checks. Latency, a request budget answered with ``429``
+and random ``5xx`` errors can be injected, and responses recorded from a real
+site can be replayed in place of the synthetic ones.
+
+Run it as a server and point ``CONFLUENCE_URL`` at it:
+
+    python -m benchmarks.stub_confluence --space DEMO=1000 --latency 0.05
+
+or mount ``StubConfluence(...).app`` on an ``httpx.ASGITransport`` to drive the
+client without sockets, as the tests do. ``Recorder`` captures real responses
+for ``--replay``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+# Listing page size caps Confluence Cloud applies, with and without bodies.
+MAX_LIMIT_WITH_BODY = 50
+MAX_LIMIT = 200
+
+_CQL_SPACE = re.compile(r'space\s*=\s*"?([^"\s]+)"?')
+
+_WORDS = (
+    "deploy service cluster runbook incident owner alert dashboard latency "
+    "release rollback config token access review backup restore queue "
+    "worker schedule retention migration index cache endpoint quota"
+).split()
+
+_ReplayKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def _replay_key(method: str, path: str, query: str) -> _ReplayKey:
+    params = tuple(sorted(urllib.parse.parse_qsl(query, keep_blank_values=True)))
+    return method.upper(), path, params
+
+
+@dataclass(slots=True)
+class StubConfig:
+    """What the stub serves and how badly it behaves.
+
+    Attributes:
+        spaces: Number of pages per space key.
+        body_size: Approximate length of each page body, in characters.
+        latency: Seconds added to every response.
+        jitter: Extra random latency, up to this many seconds.
+        rate_limit: Requests allowed per ``rate_window``, unlimited when None.
+        rate_window: Length of the rate limit window, in seconds.
+        error_rate: Fraction of requests answered with a random 5xx error.
+        seed: Seed of the random latency and error injection.
+        replay: Recorded responses, as written by ``Recorder``, served in
+            place of the synthetic ones for the same method, path and query.
+    """
+
+    spaces: Dict[str, int] = field(default_factory=lambda: {"DEMO": 100})
+    body_size: int = 2000
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate_limit: Optional[int] = None
+    rate_window: float = 1.0
+    error_rate: float = 0.0
+    seed: int = 0
+    replay: Optional[Path] = None
+
+
+@dataclass(slots=True)
+class StubStats:
+    """Request counts, reset with ``StubConfluence.reset_stats``."""
+
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    replayed: int = 0
+    updates: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+@dataclass(slots=True)
+class _Page:
+    id: str
+    space_key: str
+    title: str
+    version: int = 1
+    body: Optional[str] = None
+
+
+class StubConfluence:
+    """Synthetic Confluence site served by a FastAPI app (``self.app``)."""
+
+    def __init__(self, config: Optional[StubConfig] = None) -> None:
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self._random = random.Random(self.config.seed)
+        self._spaces: Dict[str, List[_Page]] = {}
+        self._pages: Dict[str, _Page] = {}
+        for index, (space_key, count) in enumerate(self.config.spaces.items()):
+            first_id = (index + 1) * 10_000_000
+            pages = [
+                _Page(str(first_id + n), space_key, f"{space_key} page {n}")
+                for n in range(count)
+            ]
+            self._spaces[space_key] = pages
+            self._pages.update((page.id, page) for page in pages)
+        self._replay = self._load_replay(self.config.replay)
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.app = self._build_app()
+
+    def reset_stats(self) -> None:
+        self.stats = StubStats()
+
+    def page_version(self, page_id: str) -> int:
+        return self._pages[page_id].version
+
+    def page_body(self, page_id: str) -> str:
+        page = self._pages[page_id]
+        return page.body if page.body is not None else self._synthetic_body(page)
+
+    @staticmethod
+    def _load_replay(path: Optional[Path]) -> Dict[_ReplayKey, Dict[str, Any]]:
+        if path is None:
+            return {}
+        recorded: Dict[_ReplayKey, Dict[str, Any]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry: Dict[str, Any] = json.loads(line)
+                url = urllib.parse.urlsplit(str(entry["url"]))
+                recorded[_replay_key(entry["method"], url.path, url.query)] = entry
+        return recorded
+
+    def _synthetic_body(self, page: _Page) -> str:
+        # Seeded by the page id, so every fetch of a page returns the same body
+        rng = random.Random(page.id)
+        parts = [f"<h1>{page.title}</h1>"]
+        size = len(parts[0])
+        while size < self.config.body_size:
+            words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(20, 60)))
+            block = (
+                f"<h2>{words.split()[0].title()}</h2>"
+                if rng.random() < 0.15
+                else f"<p>{words.capitalize()}.</p>"
+            )
+            parts.append(block)
+            size += len(block)
+        return "".join(parts)
+
+    def _content(self, page: _Page, expand: str) -> Dict[str, Any]:
+        expanded = set(expand.split(","))
+        item: Dict[str, Any] = {
+            "id": page.id,
+            "type": "page",
+            "status": "current",
+            "title": page.title,
+            "_links": {"webui": f"/spaces/{page.space_key}/pages/{page.id}"},
+        }
+        if "version" in expanded:
+            item["version"] = {"number": page.version}
+        if "space" in expanded:
+            item["space"] = {"key": page.space_key}
+        if "body.storage" in expanded:
+            item["body"] = {
+                "storage": {
+                    "value": self.page_body(page.id),
+                    "representation": "storage",
+                }
+            }
+        return item
+
+    def _throttle(self) -> Optional[Response]:
+        """Count the request against the rate limit window, or refuse it."""
+        limit = self.config.rate_limit
+        if limit is None:
+            return None
+        now = time.monotonic()
+        if now - self._window_start >= self.config.rate_window:
+            self._window_start = now
+            self._window_count = 0
+        reset = self._window_start + self.config.rate_window - now
+        if self._window_count >= limit:
+            self.stats.throttled += 1
+            return Response(
+                status_code=429,
+                headers={
+                    "Retry-After": f"{reset:.3f}",
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+        self._window_count += 1
+        return None
+
+    def _rate_limit_headers(self, response: Response) -> None:
+        limit = self.config.rate_limit
+        if limit is None:
+            return
+        remaining = max(0, limit - self._window_count)
+        response.headers["X-RateLimit-Limit"] = str(limit)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        if remaining < limit * 0.2:
+            response.headers["X-RateLimit-NearLimit"] = "true"
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI(title="Confluence stub")
+
+        @app.middleware("http")
+        async def inject_faults(  # pyright: ignore[reportUnusedFunction]
+            request: Request, call_next: Callable[[Request], Awaitable[Response]]
+        ) -> Response:
+            stats = self.stats
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            try:
+                delay = self.config.latency + self._random.uniform(
+                    0, self.config.jitter
+                )
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                throttled = self._throttle()
+                if throttled is not None:
+                    return throttled
+                if self._random.random() < self.config.error_rate:
+                    stats.errors += 1
+                    return Response(status_code=self._random.choice((500, 502, 503)))
+
+                entry = self._replay.get(
+                    _replay_key(request.method, request.url.path, request.url.query)
+                )
+                if entry is not None:
+                    stats.replayed += 1
+                    response: Response = JSONResponse(
+                        entry.get("body"), status_code=entry.get("status", 200)
+                    )
+                else:
+                    response = await call_next(request)
+                self._rate_limit_headers(response)
+                return response
+            finally:
+                stats.in_flight -= 1
+
+        @app.get("/wiki/rest/api/content")
+        async def list_content(  # pyright: ignore[reportUnusedFunction]
+            spaceKey: str, expand: str = "", limit: int = 25, start: int = 0
+        ) -> Dict[str, Any]:
+            cap = MAX_LIMIT_WITH_BODY if "body.storage" in expand else MAX_LIMIT
+            limit = max(1, min(limit, cap))
+            pages = self._spaces.get(spaceKey, [])
+            window = pages[start : start + limit]
+            data: Dict[str, Any] = {
+                "results": [self._content(page, expand) for page in window],
+                "start": start,
+                "limit": limit,
+                "size": len(window),
+                "_links": {"context": "/wiki"},
+            }
+            if start + limit < len(pages):
+                query = urllib.parse.urlencode(
+                    {
+                        "spaceKey": spaceKey,
+                        "expand": expand,
+                        "limit": limit,
+                        "start": start + limit,
+                    },
+                    safe=",",
+                )
+                data["_links"]["next"] = f"/rest/api/content?{query}"
+            return data
+
+        @app.get("/wiki/rest/api/content/{page_id}")
+        async def get_content(  # pyright: ignore[reportUnusedFunction]
+            page_id: str, expand: str = ""
+        ) -> Response:
+            page = self._pages.get(page_id)
+            if page is None:
+                return JSONResponse({"message": "Page not found"}, status_code=404)
+            return JSONResponse(self._content(page, expand))
+
+        @app.get("/wiki/rest/api/search")
+        async def search(  # pyright: ignore[reportUnusedFunction]
+            cql: str, limit: int = 25
+        ) -> Dict[str, Any]:
+            match = _CQL_SPACE.search(cql)
+            pages = self._spaces.get(match.group(1), []) if match else []
+            results = [{"content": {"id": page.id}} for page in pages[:limit]]
+            return {"results": results, "size": len(results), "totalSize": len(pages)}
+
+        @app.put("/wiki/api/v2/pages/{page_id}")
+        async def update_page(  # pyright: ignore[reportUnusedFunction]
+            page_id: str, request: Request
+        ) -> Response:
+            page = self._pages.get(page_id)
+            if page is None:
+                return JSONResponse({"message": "Page not found"}, status_code=404)
+            payload = await request.json()
+            version = payload.get("version", {}).get("number")
+            if version != page.version + 1:
+                return JSONResponse(
+                    {"message": f"Version must be {page.version + 1}"},
+                    status_code=409,
+                )
+            page.version = version
+            page.title = payload.get("title", page.title)
+            page.body = payload.get("body", {}).get("value", "")
+            self.stats.updates += 1
+            return JSONResponse(
+                {"id": page.id, "title": page.title, "version": {"number": version}}
+            )
+
+        return app
+
+
+class Recorder:
+    """``httpx`` response event hook that appends responses to a replay file.
+
+    Attach it to a client talking to a real site, e.g.
+    ``client.event_hooks["response"].append(Recorder(path))``, then serve the
+    file with ``StubConfig(replay=path)``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    async def __call__(self, response: httpx.Response) -> None:
+        await response.aread()
+        try:
+            body = response.json()
+        except ValueError:
+            return
+        url = response.request.url
+        entry = {
+            "method": response.request.method,
+            "url": f"{url.path}?{url.query.decode()}" if url.query else url.path,
+            "status": response.status_code,
+            "body": body,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def start_server(app: Any) -> Tuple[uvicorn.Server, str]:
+    """Serve an ASGI app on a free local port from a background thread.
+
+    Returns:
+        The server, to stop with ``server.should_exit = True``, and its URL.
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    config = uvicorn.Config(app, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(
+        target=server.run, kwargs={"sockets": [sock]}, daemon=True
+    )
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def _space(value: str) -> Tuple[str, int]:
+    key, _, count = value.partition("=")
+    return key, int(count or 100)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--space",
+        type=_space,
+        action="append",
+        metavar="KEY=PAGES",
+        help="a synthetic space and its page count (repeatable, default DEMO=100)",
+    )
+    parser.add_argument("--body-size", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--rate-window", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", type=Path, default=None)
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        spaces=dict(args.space) if args.space else {"DEMO": 100},
+        body_size=args.body_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        replay=args.replay,
+    )
+    stub = StubConfluence(config)
+    pages = sum(config.spaces.values())
+    print(f"Serving {pages} pages in {len(config.spaces)} spaces on port {args.port}")
+    uvicorn.run(stub.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
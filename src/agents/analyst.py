@@ -9,6 +9,20 @@ from src.agents.common import (
 )
 from src.models.domain import AnalysisResult
 
+SYSTEM_PROMPT = (
+    "You are an Analyst Agent. Your task is to review the provided Confluence documentation text "
+    "and compare it against the provided context. Identify any flaws, outdated information, formatting issues, "
+    "or inconsistencies. Provide a list of critiques in a structured JSON format matching this schema:\n"
+    '{"critiques": [{"description": "Issue description", "severity": "low|medium|high", '
+    '"suggestion": "How to fix"}]}'
+)
+
+PROMPT_TEMPLATE = (
+    "Original Text:\n{original_text}\n\n"
+    "Context from RAG:\n{context}\n\n"
+    "Please provide the critiques in JSON format."
+)
+
 
 async def analyze_content(original_text: str, context: List[str]) -> AnalysisResult:
     """Analyze the content against the given context to identify flaws.
@@ -20,25 +34,14 @@ async def analyze_content(original_text: str, context: List[str]) -> AnalysisRes
     Returns:
         AnalysisResult: An AnalysisResult object containing the generated critiques.
     """
-
-    system_prompt = (
-        "You are an Analyst Agent. Your task is to review the provided Confluence documentation text "
-        "and compare it against the provided context. Identify any flaws, outdated information, formatting issues, "
-        "or inconsistencies. Provide a list of critiques in a structured JSON format matching this schema:\n"
-        '{"critiques": [{"description": "Issue description", "severity": "low|medium|high", '
-        '"suggestion": "How to fix"}]}'
-    )
-
     context_str = "\n".join(
         [f"Context Block {i + 1}: {ctx}" for i, ctx in enumerate(context)]
     )
-    prompt = (
-        f"Original Text:\n{original_text}\n\n"
-        f"Context from RAG:\n{context_str}\n\n"
-        "Please provide the critiques in JSON format."
-    )
+    prompt = PROMPT_TEMPLATE.format(original_text=original_text, context=context_str)
 
-    response = await generate_response(prompt=prompt, system_prompt=system_prompt)
+    response = await generate_response(
+        prompt=prompt, system_prompt=SYSTEM_PROMPT, agent="analyst"
+    )
     cleaned_json = clean_json_response(response)
 
     try:
@@ -3,11 +3,18 @@ import re
 from typing import Optional
 
 from openai import AsyncOpenAI
+from openai.types import CompletionUsage
 
+from src import job_metrics
 from src.config import settings
+from src.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from src.tracing import span
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = "gpt-4-turbo-preview"
+DEFAULT_TEMPERATURE = 0.7
+
 _openai_client: Optional[AsyncOpenAI] = None
 
 
@@ -19,16 +26,27 @@ def _get_client() -> Optional[AsyncOpenAI]:
             return None
         _openai_client = AsyncOpenAI(
             api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
             max_retries=2,
         )
     return _openai_client
 
 
+def set_client(client: Optional[AsyncOpenAI]) -> None:
+    """Use the given client for every agent, e.g. one bound to a local backend.
+
+    ``None`` drops it, so the next call builds one from the settings again.
+    """
+    global _openai_client
+    _openai_client = client
+
+
 async def generate_response(
     prompt: str,
     system_prompt: str,
-    model: str = "gpt-4-turbo-preview",
-    temperature: float = 0.7,
+    model: str = DEFAULT_MODEL,
+    temperature: float = DEFAULT_TEMPERATURE,
+    agent: str = "unknown",
 ) -> str:
     """Helper function to generate a response from OpenAI's Chat API.
 
@@ -37,6 +55,7 @@ async def generate_response(
         system_prompt (str): The system instruction prompt.
         model (str): The LLM model to use.
         temperature (float): The generation temperature.
+        agent (str): Name of the calling agent, used to label metrics.
 
     Returns:
         str: The generated response as a string.
@@ -49,14 +68,25 @@ async def generate_response(
             '"severity": "low", "suggestion": "Fix it."}]}'
         )
 
-    response = await client.chat.completions.create(
-        model=model,
-        temperature=temperature,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt},
-        ],
-    )
+    with (
+        span("llm.generate_response", agent=agent, model=model),
+        LLM_REQUEST_SECONDS.labels(agent).time(),
+    ):
+        response = await client.chat.completions.create(
+            model=model,
+            temperature=temperature,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+        )
+
+    # OpenAI-compatible backends may omit usage entirely
+    usage: Optional[CompletionUsage] = getattr(response, "usage", None)
+    if usage is not None:
+        job_metrics.record_tokens(usage.prompt_tokens, usage.completion_tokens)
+        LLM_TOKENS.labels(agent, "prompt").inc(usage.prompt_tokens)
+        LLM_TOKENS.labels(agent, "completion").inc(usage.completion_tokens)
 
     content = response.choices[0].message.content
     return content if content else ""
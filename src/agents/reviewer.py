@@ -8,6 +8,21 @@ from src.agents.common import (
 )
 from src.models.domain import AnalysisResult, RefinementStatus
 
+SYSTEM_PROMPT = (
+    "You are a Reviewer Agent. Your task is to evaluate the rewritten Confluence documentation "
+    "against the original text and the Analyst's critiques. Ensure the rewritten text is coherent, "
+    "factually correct, and has properly addressed the critiques. "
+    "Respond in JSON format with two keys: 'status' (can be 'completed', 'accepted', 'approved', "
+    "'failed', 'pending') and 'feedback' (string detailing your decision)."
+)
+
+PROMPT_TEMPLATE = (
+    "Original Text:\n{original_text}\n\n"
+    "Rewritten Text:\n{rewritten_text}\n\n"
+    "Analyst Critiques:\n{critiques}\n\n"
+    "Please provide your review in JSON format."
+)
+
 
 class ReviewResult(BaseModel):
     status: RefinementStatus = Field(
@@ -29,27 +44,19 @@ async def review_content(
     Returns:
         ReviewResult: A ReviewResult object containing the status and feedback.
     """
-
-    system_prompt = (
-        "You are a Reviewer Agent. Your task is to evaluate the rewritten Confluence documentation "
-        "against the original text and the Analyst's critiques. Ensure the rewritten text is coherent, "
-        "factually correct, and has properly addressed the critiques. "
-        "Respond in JSON format with two keys: 'status' (can be 'completed', 'accepted', 'approved', "
-        "'failed', 'pending') and 'feedback' (string detailing your decision)."
-    )
-
     critiques_str = "\n".join(
         [f"- {c.severity.upper()}: {c.description}" for c in critiques.critiques]
     )
 
-    prompt = (
-        f"Original Text:\n{original_text}\n\n"
-        f"Rewritten Text:\n{rewritten_text}\n\n"
-        f"Analyst Critiques:\n{critiques_str}\n\n"
-        "Please provide your review in JSON format."
+    prompt = PROMPT_TEMPLATE.format(
+        original_text=original_text,
+        rewritten_text=rewritten_text,
+        critiques=critiques_str,
     )
 
-    response = await generate_response(prompt=prompt, system_prompt=system_prompt)
+    response = await generate_response(
+        prompt=prompt, system_prompt=SYSTEM_PROMPT, agent="reviewer"
+    )
     cleaned_json = clean_json_response(response)
 
     try:
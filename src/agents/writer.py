@@ -3,6 +3,19 @@ from typing import List
 from src.agents.common import generate_response
 from src.models.domain import AnalysisResult
 
+SYSTEM_PROMPT = (
+    "You are a Writer Agent. Your task is to rewrite the provided Confluence documentation "
+    "incorporating the provided critiques and ensuring it is consistent with the provided context. "
+    "Return ONLY the rewritten markdown text, without any introductory or concluding remarks."
+)
+
+PROMPT_TEMPLATE = (
+    "Original Text:\n{original_text}\n\n"
+    "Critiques from Analyst:\n{critiques}\n\n"
+    "Context from RAG:\n{context}\n\n"
+    "Please rewrite the document."
+)
+
 
 async def rewrite_content(
     original_text: str, critiques: AnalysisResult, context: List[str]
@@ -20,13 +33,6 @@ async def rewrite_content(
     Raises:
         ValueError: If the agent returns an empty response.
     """
-
-    system_prompt = (
-        "You are a Writer Agent. Your task is to rewrite the provided Confluence documentation "
-        "incorporating the provided critiques and ensuring it is consistent with the provided context. "
-        "Return ONLY the rewritten markdown text, without any introductory or concluding remarks."
-    )
-
     critiques_str = "\n".join(
         [
             f"- {c.severity.upper()}: {c.description} -> Suggestion: {c.suggestion}"
@@ -38,14 +44,13 @@ async def rewrite_content(
         [f"Context Block {i + 1}: {ctx}" for i, ctx in enumerate(context)]
     )
 
-    prompt = (
-        f"Original Text:\n{original_text}\n\n"
-        f"Critiques from Analyst:\n{critiques_str}\n\n"
-        f"Context from RAG:\n{context_str}\n\n"
-        "Please rewrite the document."
+    prompt = PROMPT_TEMPLATE.format(
+        original_text=original_text, critiques=critiques_str, context=context_str
     )
 
-    response = await generate_response(prompt=prompt, system_prompt=system_prompt)
+    response = await generate_response(
+        prompt=prompt, system_prompt=SYSTEM_PROMPT, agent="writer"
+    )
     if not response:
         raise ValueError("Writer agent returned an empty response.")
     return response.strip()
@@ -13,11 +13,40 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = (
         ""  # Default empty to allow tests and environments without LLM
     )
+    OPENAI_BASE_URL: str | None = None  # Any OpenAI-compatible API, e.g. a local one
+    CONFLUENCE_HTTP2: bool = False
+    CONFLUENCE_MAX_CONNECTIONS: int = 50
+    CONFLUENCE_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    CONFLUENCE_KEEPALIVE_EXPIRY: float = 30.0
+    CONFLUENCE_MAX_RETRIES: int = 5
+    CONFLUENCE_RETRY_BACKOFF: float = 1.0
+    CONFLUENCE_MAX_RETRY_WAIT: float = 60.0
+    CONFLUENCE_NEAR_LIMIT_INTERVAL: float = 0.2
+    CONFLUENCE_LISTING_CONCURRENCY: int = 4
+    CONFLUENCE_FETCH_CONCURRENCY: int = 8
+    PUBLISH_CONCURRENCY: int = 8
+    PUBLISH_CONFLICT_RETRIES: int = 3
+    PAGE_CACHE_PATH: str | None = "page_cache.db"
+    PAGE_CACHE_MAX_AGE: float = 300.0
+    CONFLUENCE_WEBHOOK_SECRET: str | None = None
+    WEBHOOK_DEBOUNCE_SECONDS: float = 2.0
+    WEBHOOK_MAX_DELAY_SECONDS: float = 30.0
+    WEBHOOK_BATCH_SIZE: int = 100
     CHROMA_DB_PATH: str = "chroma_db"
     DB_PATH: str = "jobs.db"
+    DB_READ_POOL_SIZE: int = 4
+    DB_WRITE_BATCH_SIZE: int = 256
+    DB_WRITE_BEHIND_SECONDS: float = 0.5
+    RETENTION_COMPLETED_PER_PAGE: int = 5
+    RETENTION_FAILED_DAYS: float = 30.0
+    DB_MAINTENANCE_INTERVAL: float = 3600.0
+    DB_MAINTENANCE_BATCH_SIZE: int = 500
     REDIS_URL: str | None = None
     INGESTION_CONCURRENCY: int = 10
     REFINEMENT_CONCURRENCY: int = 5
+    SHUTDOWN_DRAIN_TIMEOUT: float = 30.0
+    REQUEUE_PENDING_ON_STARTUP: bool = True
+    TRACE_EXPORT_PATH: str | None = None
     APP_API_KEY: str
     ALLOWED_ORIGINS: list[str] = []
 
@@ -1,41 +1,633 @@
 import asyncio
+import hashlib
 import logging
+import queue
 import sqlite3
-from typing import List, Optional
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
+from src import events
 from src.config import settings
-from src.models.domain import RefinementJob, RefinementStatus
+from src.metrics import SQLITE_WRITE_SECONDS
+from src.models.domain import JobMetrics, RefinementJob, RefinementStatus
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Columns added after the initial schema; applied to existing databases on startup.
+_MIGRATED_COLUMNS: Dict[str, str] = {
+    "page_version": "INTEGER",
+    "pipeline_hash": "TEXT",
+    "space_key": "TEXT",
+    "metrics": "TEXT",
+    "original_hash": "TEXT",
+    "refined_hash": "TEXT",
+    "created_at": "REAL",
+    "updated_at": "REAL",
+}
+
+_JOB_COLUMN_NAMES: Tuple[str, ...] = (
+    "id",
+    "page_id",
+    "status",
+    "error",
+    "original_hash",
+    "refined_hash",
+    "page_version",
+    "pipeline_hash",
+    "space_key",
+    "metrics",
+)
+_JOB_COLUMNS = ", ".join(_JOB_COLUMN_NAMES)
+
+_BLOB_COLUMNS = ("original_hash", "refined_hash")
+
+
+# Parameters are the job columns followed by created_at and updated_at, both
+# set to the write time; created_at is kept when the job already exists.
+_UPSERT_JOB_SQL = f"""
+    INSERT INTO jobs ({_JOB_COLUMNS}, created_at, updated_at)
+    VALUES ({", ".join("?" for _ in _JOB_COLUMN_NAMES)}, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        {", ".join(f"{c}=excluded.{c}" for c in _JOB_COLUMN_NAMES[2:])},
+        updated_at=excluded.updated_at
+    """
+
+# Fields selectable through list_jobs/get_jobs_by_ids, with their SQL expression.
+_JOB_FIELDS: Dict[str, str] = {
+    "id": "jobs.id",
+    "page_id": "jobs.page_id",
+    "status": "jobs.status",
+    "error": "jobs.error",
+    "original_text": "original.data",
+    "refined_text": "refined.data",
+    "page_version": "jobs.page_version",
+    "pipeline_hash": "jobs.pipeline_hash",
+    "space_key": "jobs.space_key",
+    "metrics": "jobs.metrics",
+    "created_at": "jobs.created_at",
+    "updated_at": "jobs.updated_at",
+}
+JOB_FIELDS = tuple(_JOB_FIELDS)
+TEXT_FIELDS = frozenset({"original_text", "refined_text"})
+DEFAULT_JOB_FIELDS = tuple(f for f in JOB_FIELDS if f not in TEXT_FIELDS)
+
+# Page bodies and refined texts live in the content-addressed blobs table; the
+# legacy original_text/refined_text columns are emptied on startup.
+_JOB_SELECT = ", ".join(_JOB_FIELDS.values())
+_JOB_FROM = (
+    "jobs LEFT JOIN blobs AS original ON original.hash = jobs.original_hash "
+    "LEFT JOIN blobs AS refined ON refined.hash = jobs.refined_hash"
+)
+
+# Statuses after which a job row is not expected to change again.
+_TERMINAL_STATUSES = frozenset(
+    {
+        RefinementStatus.COMPLETED.value,
+        RefinementStatus.FAILED.value,
+        RefinementStatus.CANCELLED.value,
+    }
+)
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit.
+_MAX_IN_PARAMS = 500
+
+
+# Writes run on the writer thread, which passes them its manager and connection.
+_WriteFn = Callable[["_ConnectionManager", sqlite3.Connection], T]
+
+
+@dataclass(frozen=True)
+class _Unbatched:
+    fn: _WriteFn[Any]
+
+
+@dataclass(frozen=True)
+class _JobSave:
+    job_id: str
+    values: Dict[str, Any]
+    blobs: Dict[str, str]
+    defer: bool
+
+
+class _ConnectionManager:
+    """Long-lived connections to the job store.
+
+    All writes go through a single writer connection owned by a dedicated
+    thread. Writes queued while a commit is in flight are applied together in
+    one transaction (group commit), each inside its own savepoint so that a
+    failing write does not roll back the others. Reads use a small pool of
+    read-only connections, which WAL mode lets run alongside the writer.
+
+    Job saves are written behind: the writer remembers the last committed
+    values of each active job and only writes the columns that changed.
+    Saves of ``processing`` jobs are held back for up to
+    ``DB_WRITE_BEHIND_SECONDS`` so that they coalesce with the next save of
+    the same job; any other status is committed before the save returns.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._batch_size = max(1, settings.DB_WRITE_BATCH_SIZE)
+        self._write_behind = settings.DB_WRITE_BEHIND_SECONDS
+        self._writer = self._connect()
+        # Only takes effect on a new database; see vacuum_sync.
+        self._writer.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._queue: queue.Queue[Optional[Tuple[Any, Future[Any]]]] = queue.Queue()
+        self._readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(
+            max(1, settings.DB_READ_POOL_SIZE)
+        )
+        self._opened_readers: List[sqlite3.Connection] = []
+        # Owned by the writer thread.
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._committed: Dict[str, Dict[str, Any]] = {}
+        self._blobs: Dict[str, Dict[str, str]] = {}
+        self._dirty: Dict[str, float] = {}
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path == ":memory:":
+            # A private in-memory database would not be visible to the readers.
+            conn = sqlite3.connect(
+                "file::memory:?cache=shared",
+                uri=True,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None
+            )
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def submit(self, fn: _WriteFn[T]) -> "Future[T]":
+        """Queue a write for the writer thread.
+
+        Args:
+            fn: Runs the write on the writer connection, inside a transaction.
+
+        Returns:
+            A future resolved with the result of ``fn`` once it is committed.
+        """
+        future: Future[T] = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def submit_unbatched(self, fn: _WriteFn[T]) -> "Future[T]":
+        """Queue work for the writer connection that must run outside a transaction.
+
+        Args:
+            fn: Runs on the writer connection after the current batch commits.
+
+        Returns:
+            A future resolved with the result of ``fn``.
+        """
+        future: Future[T] = Future()
+        self._queue.put((_Unbatched(fn), future))
+        return future
+
+    def submit_job(self, job: RefinementJob) -> "Future[None]":
+        """Queue a job save, written behind if the job is still processing.
+
+        Args:
+            job: The job to save.
+
+        Returns:
+            A future resolved once the save is committed, or right away when
+            the save is held back.
+        """
+        params, blobs = _job_params(job)
+        values: Dict[str, Any] = dict(zip(_JOB_COLUMN_NAMES, params))
+        defer = self._write_behind > 0 and job.status == RefinementStatus.PROCESSING
+        future: Future[None] = Future()
+        self._queue.put((_JobSave(job.id, values, blobs, defer), future))
+        return future
+
+    @contextmanager
+    def reader(self) -> Generator[sqlite3.Connection, None, None]:
+        """Borrow a read-only connection from the pool."""
+        with self._reader_slots:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                conn.execute("PRAGMA query_only=ON")
+                self._opened_readers.append(conn)
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+
+    def _next_flush_timeout(self) -> Optional[float]:
+        if not self._dirty:
+            return None
+        due = min(self._dirty.values()) + self._write_behind
+        return max(0.0, due - time.monotonic())
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._next_flush_timeout())
+            except queue.Empty:
+                self._commit([], flush_deferred=True)
+                continue
+            if item is None:
+                self._commit([], flush_deferred=True)
+                return
+            batch = [item]
+            stopping = False
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            timeout = self._next_flush_timeout()
+            self._commit(batch, flush_deferred=stopping or timeout == 0.0)
+            if stopping:
+                return
+
+    def _write_job(self, conn: sqlite3.Connection, job_id: str) -> Dict[str, Any]:
+        values = self._latest[job_id]
+        blobs = self._blobs.get(job_id, {})
+        committed = self._committed.get(job_id)
+        now = time.time()
+        if committed is not None:
+            changed = [c for c in _JOB_COLUMN_NAMES[2:] if values[c] != committed[c]]
+            if not changed:
+                return values
+            for column in _BLOB_COLUMNS:
+                if column in changed and values[column] is not None:
+                    _store_blob(conn, values[column], blobs[values[column]])
+            assignments = ", ".join(f"{c} = ?" for c in changed)
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                (*(values[c] for c in changed), now, job_id),
+            )
+            if cursor.rowcount:
+                return values
+
+        for blob_hash, text in blobs.items():
+            _store_blob(conn, blob_hash, text)
+        conn.execute(_UPSERT_JOB_SQL, (*values.values(), now, now))
+        return values
+
+    def _commit(
+        self, batch: List[Tuple[Any, Future[Any]]], flush_deferred: bool = False
+    ) -> None:
+        pending = [
+            (op, future)
+            for op, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        in_transaction = [
+            (op, f) for op, f in pending if not isinstance(op, _Unbatched)
+        ]
+        if in_transaction or (flush_deferred and self._dirty):
+            self._commit_transaction(in_transaction, flush_deferred)
+
+        for op, future in pending:
+            if isinstance(op, _Unbatched):
+                try:
+                    future.set_result(op.fn(self, self._writer))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _commit_transaction(
+        self, pending: List[Tuple[Any, Future[Any]]], flush_deferred: bool
+    ) -> None:
+        conn = self._writer
+        now = time.monotonic()
+        outcomes: List[Tuple[Future[Any], Any, Optional[BaseException]]] = []
+        written: List[Tuple[str, Dict[str, Any]]] = []
+        flushed: List[str] = []
+        held: List[Future[Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, future in pending:
+                if isinstance(op, _JobSave):
+                    self._latest[op.job_id] = op.values
+                    self._blobs[op.job_id] = op.blobs
+                    if op.defer:
+                        self._dirty.setdefault(op.job_id, now)
+                        held.append(future)
+                        continue
+                    self._dirty.pop(op.job_id, None)
+                conn.execute("SAVEPOINT job_write")
+                try:
+                    if isinstance(op, _JobSave):
+                        written.append((op.job_id, self._write_job(conn, op.job_id)))
+                        outcomes.append((future, None, None))
+                    else:
+                        outcomes.append((future, op(self, conn), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job_write")
+                    outcomes.append((future, None, e))
+                conn.execute("RELEASE job_write")
+
+            if flush_deferred:
+                flushed = list(self._dirty)
+            for job_id in flushed:
+                del self._dirty[job_id]
+                conn.execute("SAVEPOINT job_write")
+                try:
+                    written.append((job_id, self._write_job(conn, job_id)))
+                except Exception as e:
+                    logger.error(f"Deferred save of job {job_id} failed: {e}")
+                    conn.execute("ROLLBACK TO job_write")
+                conn.execute("RELEASE job_write")
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"Job store commit of {len(pending)} writes failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for job_id in flushed:
+                self._dirty.setdefault(job_id, now)
+            for future in held:
+                future.set_result(None)
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for job_id, values in written:
+            self._committed[job_id] = values
+            if job_id in self._dirty:
+                continue
+            self._blobs.pop(job_id, None)
+            if values["status"] in _TERMINAL_STATUSES:
+                self._latest.pop(job_id, None)
+                self._committed.pop(job_id, None)
+        for future in held:
+            future.set_result(None)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def forget_jobs(self, job_ids: List[str]) -> None:
+        """Drop the remembered state of jobs rewritten outside ``submit_job``.
+
+        Must be called from inside a submitted write.
+        """
+        for job_id in job_ids:
+            self._latest.pop(job_id, None)
+            self._committed.pop(job_id, None)
+            self._blobs.pop(job_id, None)
+            self._dirty.pop(job_id, None)
+
+    def forget_status(self, job_id: Optional[str] = None) -> None:
+        """Force the next save to rewrite the status of a job, or of every job.
+
+        Must be called from inside a submitted write that changed statuses.
+        """
+        job_ids = list(self._committed) if job_id is None else [job_id]
+        for key in job_ids:
+            if key in self._committed:
+                self._committed[key] = {**self._committed[key], "status": None}
+
+    def close(self) -> None:
+        """Apply the queued and held-back writes, then close every connection."""
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.close()
+        for conn in self._opened_readers:
+            conn.close()
+
+
+_manager: Optional[_ConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def _get_manager() -> _ConnectionManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None or _manager.path != settings.DB_PATH:
+            if _manager is not None:
+                _manager.close()
+            _manager = _ConnectionManager(settings.DB_PATH)
+        return _manager
+
+
+def close_db() -> None:
+    """Flush pending writes and close the job store connections."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
+
+
+def _write(operation: str, fn: _WriteFn[T]) -> T:
+    with SQLITE_WRITE_SECONDS.labels(operation).time():
+        return _get_manager().submit(fn).result()
+
+
+async def _write_async(operation: str, fn: _WriteFn[T]) -> T:
+    # Waits on the writer thread without tying up a to_thread worker.
+    with SQLITE_WRITE_SECONDS.labels(operation).time():
+        return await asyncio.wrap_future(_get_manager().submit(fn))
+
+
+def _read(fn: Callable[[sqlite3.Connection], T]) -> T:
+    with _get_manager().reader() as conn:
+        return fn(conn)
+
+
+def _migrate_jobs_table(conn: sqlite3.Connection) -> None:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for column, column_type in _MIGRATED_COLUMNS.items():
+        if column not in existing:
+            logger.info(f"Adding column {column} to jobs table")
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+    if "created_at" not in existing:
+        # Jobs created before timestamps were recorded count as created now.
+        now = time.time()
+        conn.execute("UPDATE jobs SET created_at = ?, updated_at = ?", (now, now))
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _store_blob(conn: sqlite3.Connection, blob_hash: str, text: str) -> None:
+    # Identical texts are stored once; skip compressing those already present.
+    if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (blob_hash,)).fetchone():
+        return
+    conn.execute(
+        "INSERT INTO blobs (hash, data) VALUES (?, ?)",
+        (blob_hash, zlib.compress(text.encode("utf-8"))),
+    )
+
+
+def _load_blob(data: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+
+def _move_inline_texts(conn: sqlite3.Connection) -> None:
+    rows = conn.execute("""
+        SELECT id, original_text, refined_text FROM jobs
+        WHERE original_text IS NOT NULL OR refined_text IS NOT NULL
+        """).fetchall()
+    if rows:
+        logger.info(f"Moving the texts of {len(rows)} jobs to the blobs table")
+    for job_id, original_text, refined_text in rows:
+        hashes: List[Optional[str]] = []
+        for text in (original_text, refined_text):
+            if text is None:
+                hashes.append(None)
+                continue
+            blob_hash = _text_hash(text)
+            _store_blob(conn, blob_hash, text)
+            hashes.append(blob_hash)
+        conn.execute(
+            """
+            UPDATE jobs SET original_hash = ?, refined_hash = ?,
+                original_text = NULL, refined_text = NULL
+            WHERE id = ?
+            """,
+            (*hashes, job_id),
+        )
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            page_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            error TEXT,
+            original_text TEXT,
+            refined_text TEXT
+        )
+        """)
+    _migrate_jobs_table(conn)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_page_version
+        ON jobs (page_id, page_version, pipeline_hash, status)
+        """)
+    # Listing filters. Rows come out of an index in rowid order, as paging
+    # needs, only when every indexed column is compared with "=", so each
+    # supported combination of equality filters has an index of its own.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_space ON jobs (space_key)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_space_status ON jobs (space_key, status)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_page ON jobs (page_id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_page_status ON jobs (page_id, status)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at)")
+    # Let blob pruning check references without scanning the jobs table.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_original_hash ON jobs (original_hash)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_refined_hash ON jobs (refined_hash)"
+    )
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL
+        ) WITHOUT ROWID
+        """)
+    _move_inline_texts(conn)
+
 
 def init_db() -> None:
     """Initialize the SQLite database schema."""
-    with sqlite3.connect(settings.DB_PATH) as conn:
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS jobs (
-                id TEXT PRIMARY KEY,
-                page_id TEXT NOT NULL,
-                status TEXT NOT NULL,
-                error TEXT,
-                original_text TEXT,
-                refined_text TEXT
-            )
-            """)
-        conn.commit()
+    _write("init_db", lambda _, conn: _create_schema(conn))
 
 
-def save_job_sync(job: RefinementJob) -> None:
-    """Save a job to the database synchronously.
+def _job_params(job: RefinementJob) -> Tuple[Tuple[Any, ...], Dict[str, str]]:
+    """Return the row values of a job and the texts it references, by hash."""
+    blobs: Dict[str, str] = {}
+    hashes: List[Optional[str]] = []
+    for text in (job.original_text, job.refined_text):
+        if text is None:
+            hashes.append(None)
+            continue
+        blob_hash = _text_hash(text)
+        blobs[blob_hash] = text
+        hashes.append(blob_hash)
+    params = (
+        job.id,
+        job.page_id,
+        job.status.value,
+        job.error,
+        *hashes,
+        job.page_version,
+        job.pipeline_hash,
+        job.space_key,
+        job.metrics.model_dump_json() if job.metrics is not None else None,
+    )
+    return params, blobs
 
-    Args:
-        job (RefinementJob): The refinement job object to save.
+
+def _field_value(field: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if field in TEXT_FIELDS:
+        return _load_blob(value)
+    if field == "metrics":
+        return JobMetrics.model_validate_json(value)
+    if field in ("created_at", "updated_at"):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return value
+
+
+def _row_to_fields(fields: Sequence[str], row: Sequence[Any]) -> Dict[str, Any]:
+    return {field: _field_value(field, value) for field, value in zip(fields, row)}
+
+
+def _row_to_job(row: Sequence[Any]) -> RefinementJob:
+    return RefinementJob(**_row_to_fields(JOB_FIELDS, row))
+
+
+def _projection(fields: Sequence[str]) -> Tuple[str, str]:
+    """Return the SELECT list and FROM clause for a subset of job fields.
 
     Raises:
-        ValueError: If id, page_id or status are missing or invalid.
+        ValueError: If a field is unknown.
     """
+    unknown = [field for field in fields if field not in _JOB_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown job fields: {', '.join(unknown)}")
+    select = ", ".join(_JOB_FIELDS[field] for field in fields)
+    from_clause = _JOB_FROM if TEXT_FIELDS.intersection(fields) else "jobs"
+    return select, from_clause
+
+
+def _validate_job(job: RefinementJob) -> None:
     if not job.id:
         raise ValueError("Job id is required")
     if not job.page_id:
@@ -43,27 +635,36 @@ def save_job_sync(job: RefinementJob) -> None:
     if not job.status or type(job.status) is not RefinementStatus:
         raise ValueError("Job status must be a valid RefinementStatus")
 
-    with sqlite3.connect(settings.DB_PATH) as conn:
-        conn.execute(
-            """
-            INSERT INTO jobs (id, page_id, status, error, original_text, refined_text)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                status=excluded.status,
-                error=excluded.error,
-                original_text=excluded.original_text,
-                refined_text=excluded.refined_text
-            """,
-            (
-                job.id,
-                job.page_id,
-                job.status.value,
-                job.error,
-                job.original_text,
-                job.refined_text,
-            ),
-        )
-        conn.commit()
+
+def _upsert_jobs(jobs: List[RefinementJob]) -> _WriteFn[None]:
+    rows = [_job_params(job) for job in jobs]
+
+    def write(manager: _ConnectionManager, conn: sqlite3.Connection) -> None:
+        for _, blobs in rows:
+            for blob_hash, text in blobs.items():
+                _store_blob(conn, blob_hash, text)
+        now = time.time()
+        conn.executemany(_UPSERT_JOB_SQL, [(*params, now, now) for params, _ in rows])
+        manager.forget_jobs([job.id for job in jobs])
+
+    return write
+
+
+def save_job_sync(job: RefinementJob) -> None:
+    """Save a job to the database synchronously.
+
+    Saves of processing jobs are written behind and may reach the database up
+    to ``DB_WRITE_BEHIND_SECONDS`` later; any other status is durable on return.
+
+    Args:
+        job (RefinementJob): The refinement job object to save.
+
+    Raises:
+        ValueError: If id, page_id or status are missing or invalid.
+    """
+    _validate_job(job)
+    with SQLITE_WRITE_SECONDS.labels("save_job").time():
+        _get_manager().submit_job(job).result()
 
 
 def save_jobs_bulk_sync(jobs: List[RefinementJob]) -> None:
@@ -72,30 +673,7 @@ def save_jobs_bulk_sync(jobs: List[RefinementJob]) -> None:
     Args:
         jobs (List[RefinementJob]): The list of refinement job objects to save.
     """
-    with sqlite3.connect(settings.DB_PATH) as conn:
-        conn.executemany(
-            """
-            INSERT INTO jobs (id, page_id, status, error, original_text, refined_text)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                status=excluded.status,
-                error=excluded.error,
-                original_text=excluded.original_text,
-                refined_text=excluded.refined_text
-            """,
-            [
-                (
-                    job.id,
-                    job.page_id,
-                    job.status.value,
-                    job.error,
-                    job.original_text,
-                    job.refined_text,
-                )
-                for job in jobs
-            ],
-        )
-        conn.commit()
+    _write("save_jobs_bulk", _upsert_jobs(jobs))
 
 
 def get_job_sync(job_id: str) -> Optional[RefinementJob]:
@@ -107,31 +685,632 @@ def get_job_sync(job_id: str) -> Optional[RefinementJob]:
     Returns:
         The job data if found, or None.
     """
-    with sqlite3.connect(settings.DB_PATH) as conn:
+
+    def read(conn: sqlite3.Connection) -> Optional[RefinementJob]:
+        row = conn.execute(
+            f"SELECT {_JOB_SELECT} FROM {_JOB_FROM} WHERE jobs.id = ?", (job_id,)
+        ).fetchone()
+        return _row_to_job(row) if row else None
+
+    return _read(read)
+
+
+def find_completed_job_sync(
+    page_id: str, page_version: int, pipeline_hash: str
+) -> Optional[RefinementJob]:
+    """Find the most recent completed job for a page version and pipeline config.
+
+    Args:
+        page_id: The Confluence page ID.
+        page_version: The Confluence page version the job was run against.
+        pipeline_hash: Fingerprint of the pipeline configuration.
+
+    Returns:
+        The most recent matching completed job, or None.
+    """
+
+    def read(conn: sqlite3.Connection) -> Optional[RefinementJob]:
+        row = conn.execute(
+            f"""
+            SELECT {_JOB_SELECT} FROM {_JOB_FROM}
+            WHERE jobs.page_id = ? AND jobs.page_version = ?
+                AND jobs.pipeline_hash = ? AND jobs.status = ?
+            ORDER BY jobs.rowid DESC LIMIT 1
+            """,
+            (page_id, page_version, pipeline_hash, RefinementStatus.COMPLETED.value),
+        ).fetchone()
+        return _row_to_job(row) if row else None
+
+    return _read(read)
+
+
+def find_completed_job_ids_sync(
+    pages: List[Tuple[str, int]], pipeline_hash: str
+) -> Dict[Tuple[str, int], str]:
+    """Find the most recent completed job ID for each (page_id, page_version) pair.
+
+    Args:
+        pages: The (page_id, page_version) pairs to look up.
+        pipeline_hash: Fingerprint of the pipeline configuration.
+
+    Returns:
+        A mapping of (page_id, page_version) to job ID for the pairs that have one.
+    """
+    wanted = set(pages)
+    page_ids = sorted({page_id for page_id, _ in pages})
+
+    def read(conn: sqlite3.Connection) -> Dict[Tuple[str, int], str]:
+        found: Dict[Tuple[str, int], str] = {}
+        for start in range(0, len(page_ids), _MAX_IN_PARAMS):
+            batch = page_ids[start : start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in batch)
+            # SQLite returns the bare columns from the row holding MAX(rowid).
+            rows = conn.execute(
+                f"""
+                SELECT page_id, page_version, id, MAX(rowid) FROM jobs
+                WHERE pipeline_hash = ? AND status = ? AND page_id IN ({placeholders})
+                GROUP BY page_id, page_version
+                """,
+                (pipeline_hash, RefinementStatus.COMPLETED.value, *batch),
+            ).fetchall()
+            for page_id, page_version, job_id, _ in rows:
+                if (page_id, page_version) in wanted:
+                    found[(page_id, page_version)] = job_id
+        return found
+
+    return _read(read)
+
+
+def get_refined_versions_sync(page_ids: List[str]) -> Dict[str, int]:
+    """Find the latest page version refined by a completed job, per page.
+
+    Args:
+        page_ids: The pages to look up.
+
+    Returns:
+        A mapping of page ID to version for the pages that have one.
+    """
+    unique_ids = sorted(set(page_ids))
+
+    def read(conn: sqlite3.Connection) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        for start in range(0, len(unique_ids), _MAX_IN_PARAMS):
+            batch = unique_ids[start : start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = conn.execute(
+                f"""
+                SELECT page_id, MAX(page_version) FROM jobs
+                WHERE status = ? AND page_version IS NOT NULL
+                AND page_id IN ({placeholders})
+                GROUP BY page_id
+                """,
+                (RefinementStatus.COMPLETED.value, *batch),
+            ).fetchall()
+            found.update({page_id: version for page_id, version in rows})
+        return found
+
+    return _read(read)
+
+
+def _claim(job_id: str) -> _WriteFn[bool]:
+    def write(manager: _ConnectionManager, conn: sqlite3.Connection) -> bool:
         cursor = conn.execute(
-            "SELECT id, page_id, status, error, original_text, refined_text FROM jobs WHERE id = ?",
-            (job_id,),
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (
+                RefinementStatus.PROCESSING.value,
+                time.time(),
+                job_id,
+                RefinementStatus.PENDING.value,
+            ),
         )
-        row = cursor.fetchone()
-        if row:
-            return RefinementJob(
+        if cursor.rowcount:
+            manager.forget_status(job_id)
+            return True
+        row = conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is None
+
+    return write
+
+
+def claim_job_sync(job_id: str) -> bool:
+    """Atomically move a pending job to processing.
+
+    Args:
+        job_id: The ID of the job to claim.
+
+    Returns:
+        True if the job was claimed or has never been persisted, False if it is
+        no longer pending (e.g. cancelled or picked up by another worker).
+    """
+    return _write("claim_job", _claim(job_id))
+
+
+def _cancel_pending(
+    job_id: Optional[str], space_key: Optional[str]
+) -> _WriteFn[List[RefinementJob]]:
+    if job_id is None and space_key is None:
+        raise ValueError("Either job_id or space_key is required")
+
+    column, value = ("id", job_id) if job_id is not None else ("space_key", space_key)
+
+    def write(
+        manager: _ConnectionManager, conn: sqlite3.Connection
+    ) -> List[RefinementJob]:
+        rows = conn.execute(
+            f"SELECT id, page_id, space_key FROM jobs WHERE {column} = ? AND status = ?",
+            (value, RefinementStatus.PENDING.value),
+        ).fetchall()
+        cancelled = [
+            RefinementJob(
                 id=row[0],
                 page_id=row[1],
-                status=RefinementStatus(row[2]),
-                error=row[3],
-                original_text=row[4],
-                refined_text=row[5],
+                space_key=row[2],
+                status=RefinementStatus.CANCELLED,
+                error="Cancelled by request",
             )
-        return None
+            for row in rows
+        ]
+        now = time.time()
+        conn.executemany(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+            [(job.status.value, job.error, now, job.id) for job in cancelled],
+        )
+        for job in cancelled:
+            manager.forget_status(job.id)
+        return cancelled
+
+    return write
+
+
+def cancel_pending_jobs_sync(
+    job_id: Optional[str] = None, space_key: Optional[str] = None
+) -> int:
+    """Mark pending jobs as cancelled so that no worker picks them up.
+
+    Args:
+        job_id: Restrict to a single job.
+        space_key: Restrict to the jobs of a Confluence space.
+
+    Returns:
+        The number of jobs cancelled.
+
+    Raises:
+        ValueError: If neither job_id nor space_key is given.
+    """
+    return len(_write("cancel_pending_jobs", _cancel_pending(job_id, space_key)))
+
+
+def get_jobs_by_status_sync(status: RefinementStatus) -> List[RefinementJob]:
+    """Retrieve all jobs with the given status.
+
+    Args:
+        status: The status to filter on.
+
+    Returns:
+        The matching jobs, oldest first.
+    """
+
+    def read(conn: sqlite3.Connection) -> List[RefinementJob]:
+        rows = conn.execute(
+            f"SELECT {_JOB_SELECT} FROM {_JOB_FROM} "
+            "WHERE jobs.status = ? ORDER BY jobs.rowid",
+            (status.value,),
+        ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    return _read(read)
+
+
+def count_jobs_by_status_sync() -> Dict[str, int]:
+    """Count the jobs in the store per status.
+
+    Returns:
+        A mapping of status value to the number of jobs with it.
+    """
+
+    def read(conn: sqlite3.Connection) -> Dict[str, int]:
+        rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+
+    return _read(read)
+
+
+def _utc_timestamp(value: datetime) -> float:
+    """Convert a datetime to a POSIX timestamp, reading naive values as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _list_jobs_query(
+    page_id: Optional[str],
+    space_key: Optional[str],
+    status: Optional[RefinementStatus],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime],
+    fields: Sequence[str],
+    after: Optional[int],
+) -> Tuple[str, List[Any]]:
+    """Build the listing query of ``list_jobs_sync``; its last parameter is the limit."""
+    select, from_clause = _projection(fields)
+    conditions: List[str] = []
+    params: List[Any] = []
+    for column, value in (
+        ("page_id", page_id),
+        ("space_key", space_key),
+        ("status", status.value if status is not None else None),
+    ):
+        if value is not None:
+            conditions.append(f"jobs.{column} = ?")
+            params.append(value)
+    if created_after is not None:
+        conditions.append("jobs.created_at >= ?")
+        params.append(_utc_timestamp(created_after))
+    if created_before is not None:
+        conditions.append("jobs.created_at < ?")
+        params.append(_utc_timestamp(created_before))
+    if after is not None:
+        conditions.append("jobs.rowid < ?")
+        params.append(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+        SELECT jobs.rowid, {select} FROM {from_clause} {where}
+        ORDER BY jobs.rowid DESC LIMIT ?
+        """
+    return query, params
+
+
+def list_jobs_sync(
+    page_id: Optional[str] = None,
+    space_key: Optional[str] = None,
+    status: Optional[RefinementStatus] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Sequence[str] = DEFAULT_JOB_FIELDS,
+    limit: int = 100,
+    after: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """List jobs matching the given filters, newest first.
+
+    Args:
+        page_id: Restrict to the jobs of a page.
+        space_key: Restrict to the jobs of a space.
+        status: Restrict to jobs with this status.
+        created_after: Only include jobs created at or after this time.
+        created_before: Only include jobs created before this time.
+        fields: The job fields to return.
+        limit: Maximum number of jobs to return.
+        after: Cursor returned by a previous call, to continue from.
+
+    Returns:
+        The selected fields of each job, and the cursor of the next page or
+        None if this is the last one.
+
+    Raises:
+        ValueError: If a field is unknown.
+    """
+    query, params = _list_jobs_query(
+        page_id, space_key, status, created_after, created_before, fields, after
+    )
+
+    def read(conn: sqlite3.Connection) -> List[Any]:
+        return conn.execute(query, (*params, limit + 1)).fetchall()
+
+    rows = _read(read)
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    return [_row_to_fields(fields, row[1:]) for row in rows[:limit]], next_cursor
+
+
+def get_jobs_by_ids_sync(
+    job_ids: Sequence[str], fields: Sequence[str] = DEFAULT_JOB_FIELDS
+) -> List[Dict[str, Any]]:
+    """Retrieve several jobs by ID.
+
+    Args:
+        job_ids: The IDs of the jobs to retrieve.
+        fields: The job fields to return; must include ``id``.
+
+    Returns:
+        The selected fields of the jobs that exist, in no particular order.
+
+    Raises:
+        ValueError: If a field is unknown.
+    """
+    select, from_clause = _projection(fields)
+    unique_ids = list(dict.fromkeys(job_ids))
+
+    def read(conn: sqlite3.Connection) -> List[Any]:
+        rows: List[Any] = []
+        for start in range(0, len(unique_ids), _MAX_IN_PARAMS):
+            batch = unique_ids[start : start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in batch)
+            rows.extend(
+                conn.execute(
+                    f"SELECT {select} FROM {from_clause} "
+                    f"WHERE jobs.id IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            )
+        return rows
+
+    return [_row_to_fields(fields, row) for row in _read(read)]
+
+
+def get_latest_completed_job_ids_sync(space_key: str) -> List[str]:
+    """Find the most recent completed job of each page in a space.
+
+    Args:
+        space_key: The space to look up.
+
+    Returns:
+        The job IDs, ordered by page ID.
+    """
+
+    def read(conn: sqlite3.Connection) -> List[str]:
+        rows = conn.execute(
+            """
+            SELECT id FROM (
+                SELECT id, page_id, ROW_NUMBER() OVER (
+                    PARTITION BY page_id ORDER BY rowid DESC
+                ) AS position
+                FROM jobs WHERE space_key = ? AND status = ?
+            )
+            WHERE position = 1 ORDER BY page_id
+            """,
+            (space_key, RefinementStatus.COMPLETED.value),
+        ).fetchall()
+        return [job_id for (job_id,) in rows]
+
+    return _read(read)
+
+
+def find_old_completed_job_rowids_sync(
+    keep_per_page: int, after: int, limit: int
+) -> List[int]:
+    """Find completed jobs beyond the most recent ones of each page, oldest first.
+
+    Each candidate is compared with the newest completed jobs of its page by
+    a lookup bounded by ``keep_per_page`` on ``idx_jobs_page_status``, and
+    the scan resumes from ``after``, so the whole table is read once per
+    maintenance run, on a reader rather than under the write lock.
+
+    Args:
+        keep_per_page: Number of completed jobs to keep per page.
+        after: Only consider jobs with a greater rowid, to continue a scan.
+        limit: Maximum number of rowids to return.
+
+    Returns:
+        The rowids of the jobs to delete, in ascending order.
+    """
+    completed = RefinementStatus.COMPLETED.value
+
+    def read(conn: sqlite3.Connection) -> List[int]:
+        rows = conn.execute(
+            """
+            SELECT old.rowid FROM jobs AS old
+            WHERE old.status = ? AND old.rowid > ? AND old.rowid < (
+                SELECT newer.rowid FROM jobs AS newer
+                WHERE newer.page_id = old.page_id AND newer.status = ?
+                ORDER BY newer.rowid DESC LIMIT 1 OFFSET ?
+            )
+            ORDER BY old.rowid LIMIT ?
+            """,
+            (completed, after, completed, keep_per_page - 1, limit),
+        ).fetchall()
+        return [rowid for (rowid,) in rows]
+
+    return _read(read)
+
+
+def _delete_completed_rowids(rowids: List[int]) -> _WriteFn[int]:
+    def write(manager: _ConnectionManager, conn: sqlite3.Connection) -> int:
+        placeholders = ", ".join("?" for _ in rowids)
+        cursor = conn.execute(
+            f"DELETE FROM jobs WHERE status = ? AND rowid IN ({placeholders})",
+            (RefinementStatus.COMPLETED.value, *rowids),
+        )
+        return cursor.rowcount
+
+    return write
+
+
+def delete_old_completed_jobs_sync(keep_per_page: int, batch_size: int) -> int:
+    """Delete completed jobs beyond the most recent ones of each page.
+
+    The jobs to delete are found on a reader connection; each write only
+    deletes up to ``batch_size`` of them by rowid.
+
+    Args:
+        keep_per_page: Number of completed jobs to keep per page.
+        batch_size: Maximum number of jobs deleted per write.
+
+    Returns:
+        The number of jobs deleted.
+    """
+    batch_size = min(batch_size, _MAX_IN_PARAMS)
+    deleted = 0
+    after = 0
+    while rowids := find_old_completed_job_rowids_sync(
+        keep_per_page, after, batch_size
+    ):
+        deleted += _write("delete_jobs", _delete_completed_rowids(rowids))
+        after = rowids[-1]
+    return deleted
+
+
+def _delete_expired(older_than: datetime, limit: int) -> _WriteFn[int]:
+    def write(manager: _ConnectionManager, conn: sqlite3.Connection) -> int:
+        cursor = conn.execute(
+            """
+            DELETE FROM jobs WHERE rowid IN (
+                SELECT rowid FROM jobs
+                WHERE status IN (?, ?) AND updated_at < ? LIMIT ?
+            )
+            """,
+            (
+                RefinementStatus.FAILED.value,
+                RefinementStatus.CANCELLED.value,
+                older_than.timestamp(),
+                limit,
+            ),
+        )
+        return cursor.rowcount
+
+    return write
+
+
+def delete_expired_jobs_sync(older_than: datetime, limit: int) -> int:
+    """Delete failed and cancelled jobs last updated before a given time.
+
+    Args:
+        older_than: Jobs last updated before this time are deleted.
+        limit: Maximum number of jobs to delete in this call.
+
+    Returns:
+        The number of jobs deleted.
+    """
+    return _write("delete_jobs", _delete_expired(older_than, limit))
+
+
+_ORPHANED_BLOB = (
+    "NOT EXISTS (SELECT 1 FROM jobs WHERE original_hash = blobs.hash) "
+    "AND NOT EXISTS (SELECT 1 FROM jobs WHERE refined_hash = blobs.hash)"
+)
+
+
+def find_orphaned_blob_hashes_sync(after: str, limit: int) -> List[str]:
+    """Find stored texts that no job references, in hash order.
+
+    The scan runs on a reader rather than under the write lock and resumes
+    from ``after``, so the blobs table is read once per maintenance run.
+
+    Args:
+        after: Only consider blobs with a greater hash, to continue a scan.
+        limit: Maximum number of hashes to return.
+
+    Returns:
+        The hashes of the unreferenced blobs, in ascending order.
+    """
+
+    def read(conn: sqlite3.Connection) -> List[str]:
+        rows = conn.execute(
+            f"SELECT hash FROM blobs WHERE hash > ? AND {_ORPHANED_BLOB} "
+            "ORDER BY hash LIMIT ?",
+            (after, limit),
+        ).fetchall()
+        return [blob_hash for (blob_hash,) in rows]
+
+    return _read(read)
+
+
+def _delete_blob_hashes(hashes: List[str]) -> _WriteFn[int]:
+    def write(manager: _ConnectionManager, conn: sqlite3.Connection) -> int:
+        # A job saved since the scan may reference the blob again
+        placeholders = ", ".join("?" for _ in hashes)
+        cursor = conn.execute(
+            f"DELETE FROM blobs WHERE hash IN ({placeholders}) AND {_ORPHANED_BLOB}",
+            hashes,
+        )
+        return cursor.rowcount
+
+    return write
+
+
+def delete_orphaned_blobs_sync(batch_size: int) -> int:
+    """Delete stored texts that no job references any more.
+
+    The blobs to delete are found on a reader connection; each write only
+    deletes up to ``batch_size`` of them by hash.
+
+    Args:
+        batch_size: Maximum number of blobs deleted per write.
+
+    Returns:
+        The number of blobs deleted.
+    """
+    batch_size = min(batch_size, _MAX_IN_PARAMS)
+    deleted = 0
+    after = ""
+    while hashes := find_orphaned_blob_hashes_sync(after, batch_size):
+        deleted += _write("delete_blobs", _delete_blob_hashes(hashes))
+        after = hashes[-1]
+    return deleted
+
+
+def _checkpoint(manager: _ConnectionManager, conn: sqlite3.Connection) -> None:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+
+def checkpoint_wal_sync() -> None:
+    """Checkpoint the WAL into the database file and truncate it."""
+    manager = _get_manager()
+    with SQLITE_WRITE_SECONDS.labels("checkpoint").time():
+        manager.submit_unbatched(_checkpoint).result()
+
+
+def _incremental_vacuum(max_pages: int) -> _WriteFn[int]:
+    def run(manager: _ConnectionManager, conn: sqlite3.Connection) -> int:
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    return run
+
+
+def vacuum_sync(max_pages: int) -> int:
+    """Return up to ``max_pages`` free pages to the file system.
+
+    This only has an effect on databases created with incremental
+    auto-vacuum; older databases need a one-off ``VACUUM`` to switch to it.
+
+    Args:
+        max_pages: Maximum number of pages to free in this call.
+
+    Returns:
+        The number of pages freed.
+    """
+    manager = _get_manager()
+    with SQLITE_WRITE_SECONDS.labels("vacuum").time():
+        return manager.submit_unbatched(_incremental_vacuum(max_pages)).result()
+
+
+def get_recent_job_metrics_sync(limit: int) -> List[JobMetrics]:
+    """Retrieve the metrics recorded on the most recent jobs.
+
+    Args:
+        limit: Maximum number of jobs to read.
+
+    Returns:
+        The metrics of up to ``limit`` jobs, newest first.
+    """
+
+    def read(conn: sqlite3.Connection) -> List[JobMetrics]:
+        rows = conn.execute(
+            "SELECT metrics FROM jobs WHERE metrics IS NOT NULL ORDER BY rowid DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [JobMetrics.model_validate_json(row[0]) for row in rows]
+
+    return _read(read)
 
 
 async def save_job(job: RefinementJob) -> None:
-    """Save a job asynchronously using asyncio.to_thread.
+    """Save a job asynchronously on the writer thread.
+
+    Saves of processing jobs are written behind and may reach the database up
+    to ``DB_WRITE_BEHIND_SECONDS`` later; any other status is durable on return.
+    The new status is then published as a job event.
 
     Args:
         job: The refinement job object to save.
+
+    Raises:
+        ValueError: If id, page_id or status are missing or invalid.
     """
-    await asyncio.to_thread(save_job_sync, job)
+    _validate_job(job)
+    with SQLITE_WRITE_SECONDS.labels("save_job").time():
+        await asyncio.wrap_future(_get_manager().submit_job(job))
+    events.publish_job(job)
 
 
 async def get_job(job_id: str) -> Optional[RefinementJob]:
@@ -147,9 +1326,257 @@ async def get_job(job_id: str) -> Optional[RefinementJob]:
 
 
 async def save_jobs_bulk(jobs: List[RefinementJob]) -> None:
-    """Save multiple jobs asynchronously using asyncio.to_thread.
+    """Save multiple jobs asynchronously on the writer thread.
 
     Args:
         jobs: The list of refinement job objects to save.
     """
-    await asyncio.to_thread(save_jobs_bulk_sync, jobs)
+    await _write_async("save_jobs_bulk", _upsert_jobs(jobs))
+    for job in jobs:
+        events.publish_job(job)
+
+
+async def find_completed_job(
+    page_id: str, page_version: int, pipeline_hash: str
+) -> Optional[RefinementJob]:
+    """Find a reusable completed job asynchronously using asyncio.to_thread.
+
+    Args:
+        page_id: The Confluence page ID.
+        page_version: The Confluence page version.
+        pipeline_hash: Fingerprint of the pipeline configuration.
+
+    Returns:
+        The most recent matching completed job, or None.
+    """
+    return await asyncio.to_thread(
+        find_completed_job_sync, page_id, page_version, pipeline_hash
+    )
+
+
+async def find_completed_job_ids(
+    pages: List[Tuple[str, int]], pipeline_hash: str
+) -> Dict[Tuple[str, int], str]:
+    """Find reusable completed job IDs asynchronously using asyncio.to_thread.
+
+    Args:
+        pages: The (page_id, page_version) pairs to look up.
+        pipeline_hash: Fingerprint of the pipeline configuration.
+
+    Returns:
+        A mapping of (page_id, page_version) to job ID.
+    """
+    return await asyncio.to_thread(find_completed_job_ids_sync, pages, pipeline_hash)
+
+
+async def get_refined_versions(page_ids: List[str]) -> Dict[str, int]:
+    """Find the latest refined version of each page asynchronously.
+
+    Args:
+        page_ids: The pages to look up.
+
+    Returns:
+        A mapping of page ID to version.
+    """
+    return await asyncio.to_thread(get_refined_versions_sync, page_ids)
+
+
+async def claim_job(job_id: str) -> bool:
+    """Claim a pending job asynchronously on the writer thread.
+
+    Args:
+        job_id: The ID of the job to claim.
+
+    Returns:
+        True if this worker may process the job.
+    """
+    return await _write_async("claim_job", _claim(job_id))
+
+
+async def cancel_pending_jobs(
+    job_id: Optional[str] = None, space_key: Optional[str] = None
+) -> int:
+    """Cancel pending jobs asynchronously on the writer thread.
+
+    A status event is published for every cancelled job, so that subscribers
+    on any worker see the cancellation.
+
+    Args:
+        job_id: Restrict to a single job.
+        space_key: Restrict to the jobs of a Confluence space.
+
+    Returns:
+        The number of jobs cancelled.
+    """
+    cancelled = await _write_async(
+        "cancel_pending_jobs", _cancel_pending(job_id, space_key)
+    )
+    for job in cancelled:
+        events.publish_job(job)
+    return len(cancelled)
+
+
+async def get_jobs_by_status(status: RefinementStatus) -> List[RefinementJob]:
+    """Retrieve jobs by status asynchronously using asyncio.to_thread.
+
+    Args:
+        status: The status to filter on.
+
+    Returns:
+        The matching jobs, oldest first.
+    """
+    return await asyncio.to_thread(get_jobs_by_status_sync, status)
+
+
+async def get_recent_job_metrics(limit: int) -> List[JobMetrics]:
+    """Retrieve recent job metrics asynchronously using asyncio.to_thread.
+
+    Args:
+        limit: Maximum number of jobs to read.
+
+    Returns:
+        The metrics of up to ``limit`` jobs, newest first.
+    """
+    return await asyncio.to_thread(get_recent_job_metrics_sync, limit)
+
+
+async def list_jobs(
+    page_id: Optional[str] = None,
+    space_key: Optional[str] = None,
+    status: Optional[RefinementStatus] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Sequence[str] = DEFAULT_JOB_FIELDS,
+    limit: int = 100,
+    after: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """List jobs asynchronously using asyncio.to_thread.
+
+    Args:
+        page_id: Restrict to the jobs of a page.
+        space_key: Restrict to the jobs of a space.
+        status: Restrict to jobs with this status.
+        created_after: Only include jobs created at or after this time.
+        created_before: Only include jobs created before this time.
+        fields: The job fields to return.
+        limit: Maximum number of jobs to return.
+        after: Cursor returned by a previous call, to continue from.
+
+    Returns:
+        The selected fields of each job, and the cursor of the next page.
+    """
+    return await asyncio.to_thread(
+        list_jobs_sync,
+        page_id,
+        space_key,
+        status,
+        created_after,
+        created_before,
+        fields,
+        limit,
+        after,
+    )
+
+
+async def get_jobs_by_ids(
+    job_ids: Sequence[str], fields: Sequence[str] = DEFAULT_JOB_FIELDS
+) -> List[Dict[str, Any]]:
+    """Retrieve several jobs by ID asynchronously using asyncio.to_thread.
+
+    Args:
+        job_ids: The IDs of the jobs to retrieve.
+        fields: The job fields to return.
+
+    Returns:
+        The selected fields of the jobs that exist.
+    """
+    return await asyncio.to_thread(get_jobs_by_ids_sync, job_ids, fields)
+
+
+async def get_latest_completed_job_ids(space_key: str) -> List[str]:
+    """Find the most recent completed job of each page in a space asynchronously.
+
+    Args:
+        space_key: The space to look up.
+
+    Returns:
+        The job IDs, ordered by page ID.
+    """
+    return await asyncio.to_thread(get_latest_completed_job_ids_sync, space_key)
+
+
+async def delete_old_completed_jobs(keep_per_page: int, batch_size: int) -> int:
+    """Delete completed jobs beyond the most recent ones of each page asynchronously.
+
+    Args:
+        keep_per_page: Number of completed jobs to keep per page.
+        batch_size: Maximum number of jobs deleted per write.
+
+    Returns:
+        The number of jobs deleted.
+    """
+    batch_size = min(batch_size, _MAX_IN_PARAMS)
+    deleted = 0
+    after = 0
+    while rowids := await asyncio.to_thread(
+        find_old_completed_job_rowids_sync, keep_per_page, after, batch_size
+    ):
+        deleted += await _write_async("delete_jobs", _delete_completed_rowids(rowids))
+        after = rowids[-1]
+    return deleted
+
+
+async def delete_expired_jobs(older_than: datetime, limit: int) -> int:
+    """Delete old failed and cancelled jobs asynchronously.
+
+    Args:
+        older_than: Jobs last updated before this time are deleted.
+        limit: Maximum number of jobs to delete in this call.
+
+    Returns:
+        The number of jobs deleted.
+    """
+    return await _write_async("delete_jobs", _delete_expired(older_than, limit))
+
+
+async def delete_orphaned_blobs(batch_size: int) -> int:
+    """Delete unreferenced stored texts asynchronously.
+
+    Args:
+        batch_size: Maximum number of blobs deleted per write.
+
+    Returns:
+        The number of blobs deleted.
+    """
+    batch_size = min(batch_size, _MAX_IN_PARAMS)
+    deleted = 0
+    after = ""
+    while hashes := await asyncio.to_thread(
+        find_orphaned_blob_hashes_sync, after, batch_size
+    ):
+        deleted += await _write_async("delete_blobs", _delete_blob_hashes(hashes))
+        after = hashes[-1]
+    return deleted
+
+
+async def checkpoint_wal() -> None:
+    """Checkpoint and truncate the WAL asynchronously."""
+    manager = _get_manager()
+    with SQLITE_WRITE_SECONDS.labels("checkpoint").time():
+        await asyncio.wrap_future(manager.submit_unbatched(_checkpoint))
+
+
+async def vacuum(max_pages: int) -> int:
+    """Free up to ``max_pages`` pages asynchronously.
+
+    Args:
+        max_pages: Maximum number of pages to free in this call.
+
+    Returns:
+        The number of pages freed.
+    """
+    manager = _get_manager()
+    with SQLITE_WRITE_SECONDS.labels("vacuum").time():
+        return await asyncio.wrap_future(
+            manager.submit_unbatched(_incremental_vacuum(max_pages))
+        )
@@ -1,21 +1,36 @@
 import asyncio
+import hashlib
+import hmac
 import secrets
 from typing import Any
 
-from fastapi import HTTPException, Security, status
+from fastapi import HTTPException, Request, Security, status
 from fastapi.security import APIKeyHeader
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from src.config import settings
+from src.metrics import TrackedSemaphore
+from src.models.domain import RefinementJob
 
 # Concurrency limits for background tasks
-refinement_semaphore = asyncio.Semaphore(settings.REFINEMENT_CONCURRENCY)
-ingestion_semaphore = asyncio.Semaphore(settings.INGESTION_CONCURRENCY)
+refinement_semaphore = TrackedSemaphore(settings.REFINEMENT_CONCURRENCY, "refinement")
+ingestion_semaphore = TrackedSemaphore(settings.INGESTION_CONCURRENCY, "ingestion")
 
 # Store background tasks to prevent garbage collection
 background_tasks_set: set[asyncio.Task[Any]] = set()
 
+# In-flight refinement jobs keyed by (page_id, page_version, pipeline_hash) -> job_id
+inflight_jobs: dict[tuple[str, int | None, str], str] = {}
+
+# Refinement jobs scheduled in this process and their tasks, keyed by job_id
+running_jobs: dict[str, tuple[RefinementJob, asyncio.Task[Any]]] = {}
+
+# Cooperative cancellation requests and the shutdown signal
+cancelled_job_ids: set[str] = set()
+cancelled_spaces: set[str] = set()
+shutdown_event = asyncio.Event()
+
 limiter = Limiter(key_func=get_remote_address)
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -31,3 +46,25 @@ async def get_api_key(api_key_header: str | None = Security(api_key_header)) ->
             detail="Invalid or missing API Key",
         )
     return api_key_header
+
+
+async def verify_webhook(
+    request: Request, api_key_header: str | None = Security(api_key_header)
+) -> None:
+    """Authenticate a Confluence webhook.
+
+    With ``CONFLUENCE_WEBHOOK_SECRET`` set, the request body must carry a valid
+    ``X-Hub-Signature`` (HMAC-SHA256 of the body); otherwise the API key is
+    required as for every other endpoint.
+    """
+    secret = settings.CONFLUENCE_WEBHOOK_SECRET
+    if not secret:
+        await get_api_key(api_key_header)
+        return
+    digest = hmac.new(secret.encode(), await request.body(), hashlib.sha256)
+    signature = request.headers.get("X-Hub-Signature", "")
+    if not hmac.compare_digest(signature, f"sha256={digest.hexdigest()}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing webhook signature",
+        )
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Generator, List, Optional, Set
+
+import redis.asyncio as redis
+
+from src.config import settings
+from src.models.domain import JobEvent, RefinementJob
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "refinement-events"
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Identifies this process in Redis messages so that it skips its own events.
+_WORKER_ID = uuid.uuid4().hex
+
+_current_job: ContextVar[Optional[RefinementJob]] = ContextVar(
+    "current_event_job", default=None
+)
+
+
+class Subscription:
+    """Queue of the events matching a job ID or a space key."""
+
+    def __init__(
+        self, job_id: Optional[str] = None, space_key: Optional[str] = None
+    ) -> None:
+        self.job_id = job_id
+        self.space_key = space_key
+        self.queue: asyncio.Queue[JobEvent] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+    def matches(self, event: JobEvent) -> bool:
+        if self.job_id is not None and event.job_id != self.job_id:
+            return False
+        return self.space_key is None or event.space_key == self.space_key
+
+
+_subscriptions: Set[Subscription] = set()
+_outbox: Optional[asyncio.Queue[JobEvent]] = None
+_redis_client: Optional[redis.Redis] = None  # type: ignore
+_redis_tasks: List[asyncio.Task[Any]] = []
+
+
+@contextmanager
+def subscribe(
+    job_id: Optional[str] = None, space_key: Optional[str] = None
+) -> Generator[Subscription, None, None]:
+    """Receive the events of a job or of every job of a space.
+
+    Args:
+        job_id: Only receive events of this job.
+        space_key: Only receive events of jobs in this space.
+    """
+    subscription = Subscription(job_id, space_key)
+    _subscriptions.add(subscription)
+    try:
+        yield subscription
+    finally:
+        _subscriptions.discard(subscription)
+
+
+def _dispatch(event: JobEvent) -> None:
+    for subscription in list(_subscriptions):
+        if not subscription.matches(event):
+            continue
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(
+                f"Dropping event of job {event.job_id} for a slow subscriber"
+            )
+
+
+def publish(event: JobEvent) -> None:
+    """Deliver an event to local subscribers and, if configured, other workers.
+
+    Must be called from the event loop thread.
+    """
+    _dispatch(event)
+    if _outbox is not None:
+        try:
+            _outbox.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping Redis fan-out of job {event.job_id} event")
+
+
+def status_event(job: RefinementJob) -> JobEvent:
+    """Build the status event describing the current state of a job."""
+    return JobEvent(
+        type="status",
+        job_id=job.id,
+        page_id=job.page_id,
+        space_key=job.space_key,
+        status=job.status,
+        error=job.error,
+        timestamp=time.time(),
+    )
+
+
+def publish_job(job: RefinementJob) -> None:
+    """Publish the current status of a job."""
+    if _subscriptions or _outbox is not None:
+        publish(status_event(job))
+
+
+def publish_stage(stage: str) -> None:
+    """Publish that the job bound by ``job_context`` entered a pipeline stage."""
+    job = _current_job.get()
+    if job is None or (not _subscriptions and _outbox is None):
+        return
+    publish(
+        JobEvent(
+            type="stage",
+            job_id=job.id,
+            page_id=job.page_id,
+            space_key=job.space_key,
+            status=job.status,
+            stage=stage,
+            timestamp=time.time(),
+        )
+    )
+
+
+@contextmanager
+def job_context(job: RefinementJob) -> Generator[None, None, None]:
+    """Attribute the stage events published inside the block to a job."""
+    token = _current_job.set(job)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+async def _forward(client: redis.Redis, outbox: asyncio.Queue[JobEvent]) -> None:  # type: ignore
+    while True:
+        event = await outbox.get()
+        message = json.dumps(
+            {"origin": _WORKER_ID, "event": event.model_dump(mode="json")}
+        )
+        try:
+            await client.publish(REDIS_CHANNEL, message)  # type: ignore
+        except Exception as e:
+            logger.warning(f"Failed to publish event to Redis: {e}")
+
+
+def _on_redis_message(message: Dict[str, Any]) -> None:
+    if message.get("type") != "message":
+        return
+    data = json.loads(message["data"])
+    if data.get("origin") != _WORKER_ID:
+        _dispatch(JobEvent.model_validate(data["event"]))
+
+
+async def _listen(client: redis.Redis) -> None:  # type: ignore
+    while True:
+        try:
+            async with client.pubsub() as pubsub:  # type: ignore
+                await pubsub.subscribe(REDIS_CHANNEL)  # type: ignore
+                async for message in pubsub.listen():  # type: ignore
+                    _on_redis_message(message)  # type: ignore
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Redis event subscription failed, retrying: {e}")
+            await asyncio.sleep(1)
+
+
+async def start() -> None:
+    """Start fanning events out through Redis pub/sub when REDIS_URL is set."""
+    global _outbox, _redis_client
+    if not settings.REDIS_URL or _redis_client is not None:
+        return
+    _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    _outbox = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE * 4)
+    _redis_tasks.append(asyncio.create_task(_forward(_redis_client, _outbox)))
+    _redis_tasks.append(asyncio.create_task(_listen(_redis_client)))
+
+
+async def stop() -> None:
+    """Stop the Redis fan-out."""
+    global _outbox, _redis_client
+    for task in _redis_tasks:
+        task.cancel()
+    await asyncio.gather(*_redis_tasks, return_exceptions=True)
+    _redis_tasks.clear()
+    _outbox = None
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
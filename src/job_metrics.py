@@ -0,0 +1,110 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Generator, Iterable, List, Optional
+
+from src import events, tracing
+from src.models.domain import JobMetrics, StageStats
+
+QUEUE_WAIT = "queue_wait"
+
+_current_metrics: ContextVar[Optional[JobMetrics]] = ContextVar(
+    "current_job_metrics", default=None
+)
+
+
+@contextmanager
+def recording(metrics: JobMetrics) -> Generator[JobMetrics, None, None]:
+    """Route stage timings, token usage and cache hits to the given metrics.
+
+    The binding follows the current context, so it is inherited by tasks and
+    ``asyncio.to_thread`` calls started inside the block.
+
+    Args:
+        metrics: The metrics object of the job being processed.
+    """
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+def current_metrics() -> Optional[JobMetrics]:
+    """Return the metrics of the job being processed in this context, if any."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def stage(name: str) -> Generator[None, None, None]:
+    """Time a pipeline stage and add its wall time to the current job.
+
+    The stage is also recorded as a ``stage.<name>`` tracing span, and its start
+    is published as a job event.
+
+    Args:
+        name: The stage name, e.g. ``fetch`` or ``analyst``.
+    """
+    events.publish_stage(name)
+    start = time.perf_counter()
+    try:
+        with tracing.span(f"stage.{name}"):
+            yield
+    finally:
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            metrics.stage_ms[name] = round(
+                metrics.stage_ms.get(name, 0.0) + elapsed_ms, 3
+            )
+
+
+def record_tokens(prompt_tokens: int, completion_tokens: int) -> None:
+    """Add LLM token usage to the current job."""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.prompt_tokens += prompt_tokens
+        metrics.completion_tokens += completion_tokens
+
+
+def record_cache_hit() -> None:
+    """Count a cache hit against the current job."""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.cache_hits += 1
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile on pre-sorted values
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_stages(metrics: Iterable[JobMetrics]) -> Dict[str, StageStats]:
+    """Compute latency percentiles per stage across many jobs.
+
+    Args:
+        metrics: The job metrics to aggregate.
+
+    Returns:
+        A mapping of stage name (plus ``queue_wait``) to its statistics.
+    """
+    samples: Dict[str, List[float]] = {}
+    for item in metrics:
+        if item.queue_wait_ms is not None:
+            samples.setdefault(QUEUE_WAIT, []).append(item.queue_wait_ms)
+        for name, value in item.stage_ms.items():
+            samples.setdefault(name, []).append(value)
+
+    summary: Dict[str, StageStats] = {}
+    for name, values in sorted(samples.items()):
+        values.sort()
+        summary[name] = StageStats(
+            count=len(values),
+            p50_ms=_percentile(values, 50),
+            p95_ms=_percentile(values, 95),
+            p99_ms=_percentile(values, 99),
+            max_ms=values[-1],
+        )
+    return summary
@@ -7,11 +7,14 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
 
+from src import events, maintenance, webhooks
 from src.config import settings
-from src.database import init_db
-from src.deps import limiter
-from src.routes import router
-from src.services import confluence
+from src.database import close_db, init_db
+from src.deps import limiter, shutdown_event
+from src.routes import router, webhook_router
+from src.services import confluence, page_cache
+from src.tasks import drain_background_tasks, requeue_pending_jobs
+from src.tracing import JsonFileExporter, set_attribute, set_exporter, span
 
 load_dotenv("secrets/.env")
 
@@ -26,11 +29,26 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Initializing application...")
     init_db()
+    if settings.TRACE_EXPORT_PATH:
+        set_exporter(JsonFileExporter(settings.TRACE_EXPORT_PATH))
+    shutdown_event.clear()
     await confluence.init_client()
+    await events.start()
+    maintenance.start()
+    webhooks.start()
+    if settings.REQUEUE_PENDING_ON_STARTUP:
+        await requeue_pending_jobs()
     yield
-    # Shutdown
+    # Shutdown: let running jobs finish before closing the client they depend on
     logger.info("Shutting down application...")
+    await maintenance.stop()
+    await drain_background_tasks(settings.SHUTDOWN_DRAIN_TIMEOUT)
+    await webhooks.stop()
     await confluence.close_client()
+    await events.stop()
+    close_db()
+    page_cache.close()
+    set_exporter(None)
 
 
 app = FastAPI(
@@ -70,4 +88,15 @@ async def add_security_headers(
     return response
 
 
+@app.middleware("http")
+async def trace_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    with span("http.request", method=request.method, path=request.url.path):
+        response = await call_next(request)
+        set_attribute("status_code", response.status_code)
+        return response
+
+
 app.include_router(router)
+app.include_router(webhook_router)
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from src.config import settings
+from src.database import (
+    checkpoint_wal,
+    delete_expired_jobs,
+    delete_old_completed_jobs,
+    delete_orphaned_blobs,
+    vacuum,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pages freed per incremental vacuum step (4 MiB with the default page size).
+VACUUM_STEP_PAGES = 1024
+
+_task: Optional[asyncio.Task[None]] = None
+
+
+async def _in_batches(delete: Callable[[int], Awaitable[int]]) -> int:
+    """Repeat a bounded delete until it runs dry.
+
+    Each batch is its own short write, so regular job writes are interleaved
+    instead of waiting for the whole cleanup.
+    """
+    batch_size = max(1, settings.DB_MAINTENANCE_BATCH_SIZE)
+    total = 0
+    while True:
+        deleted = await delete(batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+async def run_maintenance() -> Dict[str, int]:
+    """Apply the retention policy, then compact the job store.
+
+    Returns:
+        The number of completed jobs, expired jobs and blobs deleted, and the
+        number of pages returned to the file system.
+    """
+    report = {
+        "completed_jobs_deleted": 0,
+        "expired_jobs_deleted": 0,
+        "blobs_deleted": 0,
+        "pages_freed": 0,
+    }
+    batch_size = max(1, settings.DB_MAINTENANCE_BATCH_SIZE)
+    keep = settings.RETENTION_COMPLETED_PER_PAGE
+    if keep > 0:
+        report["completed_jobs_deleted"] = await delete_old_completed_jobs(
+            keep, batch_size
+        )
+    if settings.RETENTION_FAILED_DAYS > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            days=settings.RETENTION_FAILED_DAYS
+        )
+        report["expired_jobs_deleted"] = await _in_batches(
+            lambda limit: delete_expired_jobs(cutoff, limit)
+        )
+    report["blobs_deleted"] = await delete_orphaned_blobs(batch_size)
+
+    await checkpoint_wal()
+    while True:
+        freed = await vacuum(VACUUM_STEP_PAGES)
+        report["pages_freed"] += freed
+        if freed < VACUUM_STEP_PAGES:
+            break
+    # Truncate the WAL again now that the vacuumed pages went through it.
+    await checkpoint_wal()
+
+    logger.info(f"Job store maintenance finished: {report}")
+    return report
+
+
+async def _maintenance_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_maintenance()
+        except Exception:
+            logger.exception("Job store maintenance failed")
+
+
+def start() -> None:
+    """Schedule maintenance every ``DB_MAINTENANCE_INTERVAL`` seconds, if enabled."""
+    global _task
+    if settings.DB_MAINTENANCE_INTERVAL > 0 and _task is None:
+        _task = asyncio.create_task(_maintenance_loop(settings.DB_MAINTENANCE_INTERVAL))
+
+
+async def stop() -> None:
+    """Cancel scheduled maintenance."""
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
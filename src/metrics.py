@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sqlite3
+from typing import Callable, Iterator, Literal, Mapping
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# Metric values are shared across uvicorn workers when PROMETHEUS_MULTIPROC_DIR
+# is set (it must point to an empty directory before the workers start).
+
+CONFLUENCE_REQUEST_SECONDS = Histogram(
+    "confluence_request_duration_seconds",
+    "Latency of Confluence API requests.",
+    ["method", "endpoint", "status_code"],
+)
+CONFLUENCE_RETRIES = Counter(
+    "confluence_retries",
+    "Confluence requests retried, by reason (status code or transport).",
+    ["reason"],
+)
+PAGE_CACHE_REQUESTS = Counter(
+    "confluence_page_cache_requests",
+    "Page cache lookups by result (hit, revalidated or miss).",
+    ["result"],
+)
+PUBLISHED_PAGES = Counter(
+    "published_pages",
+    "Refined pages handled by publishing, by result (published, skipped or failed).",
+    ["result"],
+)
+WEBHOOK_EVENTS = Counter(
+    "confluence_webhook_events",
+    "Confluence webhook events queued for the vector index, by operation.",
+    ["operation"],
+)
+WEBHOOK_PAGES_APPLIED = Counter(
+    "confluence_webhook_pages_applied",
+    "Pages written to or removed from the vector index after debouncing.",
+    ["operation"],
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of LLM chat completion calls.",
+    ["agent"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, float("inf")),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens",
+    "LLM tokens consumed.",
+    ["agent", "kind"],
+)
+RAG_EMBEDDING_BATCH_SECONDS = Histogram(
+    "rag_embedding_batch_duration_seconds",
+    "Time to embed and store one batch of chunks (usually one page) in ChromaDB.",
+)
+CHROMA_QUERY_SECONDS = Histogram(
+    "chroma_query_duration_seconds",
+    "Latency of ChromaDB similarity queries.",
+)
+RAG_CACHE_REQUESTS = Counter(
+    "rag_cache_requests",
+    "RAG query cache lookups by result (hit or miss).",
+    ["result"],
+)
+SEMAPHORE_IN_USE = Gauge(
+    "semaphore_in_use",
+    "Concurrency slots currently held, per semaphore.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+SEMAPHORE_CAPACITY = Gauge(
+    "semaphore_capacity",
+    "Configured concurrency slots, per semaphore.",
+    ["pool"],
+    multiprocess_mode="livemax",
+)
+SQLITE_WRITE_SECONDS = Histogram(
+    "sqlite_write_duration_seconds",
+    "Latency of job store writes.",
+    ["operation"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        1,
+        float("inf"),
+    ),
+)
+
+
+class TrackedSemaphore(asyncio.Semaphore):
+    """Semaphore that reports its occupancy to the ``semaphore_in_use`` gauge."""
+
+    def __init__(self, value: int, pool: str) -> None:
+        super().__init__(value)
+        self._in_use = SEMAPHORE_IN_USE.labels(pool)
+        SEMAPHORE_CAPACITY.labels(pool).set(value)
+
+    async def acquire(self) -> Literal[True]:
+        await super().acquire()
+        self._in_use.inc()
+        return True
+
+    def release(self) -> None:
+        super().release()
+        self._in_use.dec()
+
+
+class JobStatusCollector(Collector):
+    """Report job counts per status from the job store at scrape time."""
+
+    def __init__(self, count_jobs: Callable[[], Mapping[str, int]]) -> None:
+        self._count_jobs = count_jobs
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        family = GaugeMetricFamily(
+            "refinement_jobs", "Refinement jobs per status.", labels=["status"]
+        )
+        counts: Mapping[str, int]
+        try:
+            counts = self._count_jobs()
+        except sqlite3.Error:
+            counts = {}
+        for status, count in counts.items():
+            family.add_metric([status], count)
+        yield family
+
+
+def render_latest(count_jobs: Callable[[], Mapping[str, int]]) -> bytes:
+    """Render all metrics in the Prometheus text exposition format.
+
+    In multi-process mode the values of every worker are aggregated from
+    ``PROMETHEUS_MULTIPROC_DIR``; otherwise the in-process registry is used.
+
+    Args:
+        count_jobs: Returns the number of jobs per status, read from the job
+            store (``database.count_jobs_by_status_sync``, which cannot be
+            imported here as the database module reports to these metrics).
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    job_registry = CollectorRegistry()
+    job_registry.register(JobStatusCollector(count_jobs))
+    return generate_latest(registry) + generate_latest(job_registry)
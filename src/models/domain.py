@@ -1,7 +1,9 @@
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class RefinementStatus(str, Enum):
@@ -9,6 +11,7 @@ class RefinementStatus(str, Enum):
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class ConfluencePage(BaseModel):
@@ -20,6 +23,33 @@ class ConfluencePage(BaseModel):
     url: str = ""
 
 
+@dataclass(slots=True)
+class PageRecord:
+    """Lightweight page used on the fetch, chunk and embed path.
+
+    Building one costs a fraction of a validated ``ConfluencePage``, which
+    matters when a space has tens of thousands of pages. Convert it with
+    ``to_model`` where a page crosses the API boundary.
+    """
+
+    id: str
+    title: str
+    space_key: str
+    body: str
+    version: int = 1
+    url: str = ""
+
+    def to_model(self) -> ConfluencePage:
+        return ConfluencePage(
+            id=self.id,
+            title=self.title,
+            space_key=self.space_key,
+            body=self.body,
+            version=self.version,
+            url=self.url,
+        )
+
+
 class CritiqueSeverity(str, Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -42,6 +72,22 @@ class AnalysisResult(BaseModel):
     )
 
 
+class JobMetrics(BaseModel):
+    queue_wait_ms: Optional[float] = None
+    stage_ms: Dict[str, float] = Field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hits: int = 0
+
+
+class StageStats(BaseModel):
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
 class RefinementJob(BaseModel):
     id: str
     page_id: str
@@ -49,3 +95,81 @@ class RefinementJob(BaseModel):
     error: Optional[str] = None
     original_text: Optional[str] = None
     refined_text: Optional[str] = None
+    page_version: Optional[int] = None
+    pipeline_hash: Optional[str] = None
+    space_key: Optional[str] = None
+    metrics: Optional[JobMetrics] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class JobList(BaseModel):
+    jobs: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+class BatchStatusRequest(BaseModel):
+    job_ids: List[str] = Field(min_length=1, max_length=1000)
+    include_text: bool = False
+
+
+class BatchStatusResponse(BaseModel):
+    jobs: Dict[str, Dict[str, Any]]
+    missing: List[str]
+
+
+class JobEvent(BaseModel):
+    type: Literal["status", "stage"]
+    job_id: str
+    page_id: str
+    space_key: Optional[str] = None
+    status: RefinementStatus
+    stage: Optional[str] = None
+    error: Optional[str] = None
+    timestamp: float
+
+
+class PageChange(BaseModel):
+    page_id: str
+    title: str
+    version: int
+    refined_version: Optional[int] = None
+
+
+class SpaceChanges(BaseModel):
+    space_key: str
+    changed: List[PageChange]
+    unchanged: int
+
+
+class PublishBatchRequest(BaseModel):
+    job_ids: List[str] = Field(min_length=1, max_length=10000)
+
+
+class PublishResult(BaseModel):
+    job_id: str
+    page_id: Optional[str] = None
+    status: Literal["published", "skipped", "failed"]
+    version: Optional[int] = None
+    error: Optional[str] = None
+
+
+class PublishBatchResponse(BaseModel):
+    published: int
+    skipped: int
+    failed: int
+    results: List[PublishResult]
+
+
+class WebhookPage(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True, populate_by_name=True)
+
+    id: str
+    space_key: Optional[str] = Field(default=None, alias="spaceKey")
+    version: Optional[int] = None
+
+
+class WebhookEvent(BaseModel):
+    event: Optional[str] = None
+    page: Optional[WebhookPage] = None
+    timestamp: Optional[int] = None
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+import httpx
+
+from src.config import settings
+from src.database import get_job
+from src.metrics import PUBLISHED_PAGES
+from src.models.domain import PublishResult, RefinementJob, RefinementStatus
+from src.services import confluence, page_cache
+from src.storage_format import change_summary
+
+logger = logging.getLogger(__name__)
+
+
+def publish_error(job: RefinementJob) -> Optional[str]:
+    """Explain why a job cannot be published, or return None if it can."""
+    if job.status != RefinementStatus.COMPLETED or not job.refined_text:
+        return "Job must be completed and have refined text to publish"
+    return None
+
+
+def _stale_error(job: RefinementJob, current_version: int) -> Optional[str]:
+    """Explain why the page moved past the refined version, or return None."""
+    if job.page_version is None or job.page_version == current_version:
+        return None
+    return (
+        f"Page {job.page_id} changed since it was refined "
+        f"(refined version {job.page_version}, current version {current_version})"
+    )
+
+
+def _is_conflict(error: Exception) -> bool:
+    return (
+        isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 409
+    )
+
+
+async def publish_job(job: RefinementJob) -> PublishResult:
+    """Publish the refined text of a completed job as a new page version.
+
+    Nothing is published when the refined text only differs from the current
+    body in whitespace or attribute order. Otherwise the version comment
+    summarises the change. The version comes from the current page, revalidated
+    through the page cache. A job refined from an older version than the
+    current one fails instead of overwriting the newer edits. If someone else
+    saved the page in the meantime, only the version is fetched again before
+    retrying, up to ``PUBLISH_CONFLICT_RETRIES`` times.
+
+    Args:
+        job: The completed job to publish.
+
+    Returns:
+        The outcome, with the published version on success, or the current
+        version when nothing had to be published.
+    """
+    error = publish_error(job)
+    text = job.refined_text
+    if error is not None or text is None:
+        return PublishResult(
+            job_id=job.id, page_id=job.page_id, status="failed", error=error
+        )
+
+    try:
+        page = await page_cache.get_page(job.page_id, max_age=0)
+        stale = _stale_error(job, page.version)
+        if stale is not None:
+            PUBLISHED_PAGES.labels("failed").inc()
+            return PublishResult(
+                job_id=job.id, page_id=job.page_id, status="failed", error=stale
+            )
+        # Parsing a large page takes a while; keep it off the event loop
+        summary = await asyncio.to_thread(change_summary, page.body, text)
+        if summary is None:
+            PUBLISHED_PAGES.labels("skipped").inc()
+            return PublishResult(
+                job_id=job.id,
+                page_id=job.page_id,
+                status="skipped",
+                version=page.version,
+            )
+        message = f"Automated refinement: {summary}"
+        version = page.version + 1
+        conflicts = 0
+        while True:
+            try:
+                await confluence.update_page(
+                    page_id=job.page_id,
+                    title=page.title,
+                    body=text,
+                    version_number=version,
+                    message=message,
+                )
+                break
+            except Exception as e:
+                if (
+                    not _is_conflict(e)
+                    or conflicts >= settings.PUBLISH_CONFLICT_RETRIES
+                ):
+                    raise
+                conflicts += 1
+                current = await confluence.get_page_version(job.page_id)
+                stale = _stale_error(job, current)
+                if stale is not None:
+                    raise ValueError(stale) from e
+                version = current + 1
+                logger.info(
+                    f"Version conflict publishing page {job.page_id}, retrying as version {version}"
+                )
+    except Exception as e:
+        logger.exception(f"Failed to publish page for job {job.id}")
+        PUBLISHED_PAGES.labels("failed").inc()
+        return PublishResult(
+            job_id=job.id, page_id=job.page_id, status="failed", error=str(e)
+        )
+
+    PUBLISHED_PAGES.labels("published").inc()
+    return PublishResult(
+        job_id=job.id, page_id=job.page_id, status="published", version=version
+    )
+
+
+async def publish_jobs(job_ids: List[str]) -> List[PublishResult]:
+    """Publish several jobs concurrently, ``PUBLISH_CONCURRENCY`` at a time.
+
+    Jobs are loaded one by one as they are published, so that the refined
+    texts of a whole space are never held in memory together. Requests go
+    through the shared Confluence rate limiter.
+
+    Args:
+        job_ids: The jobs to publish.
+
+    Returns:
+        One result per job, in the order of ``job_ids``.
+    """
+    semaphore = asyncio.Semaphore(settings.PUBLISH_CONCURRENCY)
+
+    async def publish(job_id: str) -> PublishResult:
+        async with semaphore:
+            job = await get_job(job_id)
+            if job is None:
+                return PublishResult(
+                    job_id=job_id, status="failed", error="Job not found"
+                )
+            return await publish_job(job)
+
+    return list(await asyncio.gather(*(publish(job_id) for job_id in job_ids)))
@@ -1,22 +1,92 @@
+import asyncio
+import base64
+import binascii
+import hashlib
 import logging
 import uuid
-from typing import Any, Dict
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST
 
-from src.database import get_job, save_job
-from src.deps import get_api_key, limiter
-from src.models.domain import RefinementJob, RefinementStatus
+from src import events, webhooks
+from src.database import (
+    DEFAULT_JOB_FIELDS,
+    cancel_pending_jobs,
+    count_jobs_by_status_sync,
+    get_job,
+    get_jobs_by_ids,
+    get_latest_completed_job_ids,
+    get_recent_job_metrics,
+    get_refined_versions,
+    list_jobs,
+    save_job,
+)
+from src.deps import get_api_key, limiter, verify_webhook
+from src.job_metrics import summarize_stages
+from src.metrics import render_latest
+from src.models.domain import (
+    BatchStatusRequest,
+    BatchStatusResponse,
+    JobEvent,
+    JobList,
+    PageChange,
+    PublishBatchRequest,
+    PublishBatchResponse,
+    PublishResult,
+    RefinementJob,
+    RefinementStatus,
+    SpaceChanges,
+    StageStats,
+    WebhookEvent,
+)
+from src.publishing import publish_error, publish_job, publish_jobs
 from src.services import confluence
 from src.tasks import (
-    process_refinement_job,
+    clear_space_cancellation,
+    find_completed_job_id,
+    get_inflight_job_id,
     process_space_refinement,
+    register_inflight_job,
+    release_inflight_job,
+    request_job_cancellation,
+    request_space_cancellation,
+    resolve_page_version,
+    start_refinement_job,
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(dependencies=[Depends(get_api_key)])
 
+# Confluence cannot send the API key header, so webhooks may be signed instead.
+webhook_router = APIRouter(dependencies=[Depends(verify_webhook)])
+
+# Fields returned per job by POST /status/batch unless the texts are requested.
+_BATCH_STATUS_FIELDS = ("id", "status", "error", "page_version", "updated_at")
+
+_FINISHED_STATUSES = (
+    RefinementStatus.COMPLETED,
+    RefinementStatus.FAILED,
+    RefinementStatus.CANCELLED,
+)
+
+# Comment lines sent on idle event streams so that proxies keep them open.
+SSE_HEARTBEAT_SECONDS = 15.0
+
 
 @router.post("/refine/{page_id}", status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("5/minute")  # type: ignore
@@ -34,12 +104,40 @@ async def refine_page(
         api_key: The authenticated API key.
 
     Returns:
-        A dictionary with the acceptance message and job ID.
+        A dictionary with the acceptance message and job ID. If the current
+        version of the page is already being refined, or was refined with the
+        same pipeline configuration, that job's ID is returned instead.
     """
+    page_version = await resolve_page_version(page_id)
+    completed_id = await find_completed_job_id(page_id, page_version)
+    inflight_id = get_inflight_job_id(page_id, page_version)
+    if inflight_id is not None:
+        return {
+            "message": "Refinement job already in progress",
+            "job_id": inflight_id,
+            "page_id": page_id,
+        }
+    if completed_id is not None:
+        return {
+            "message": "Page version already refined",
+            "job_id": completed_id,
+            "page_id": page_id,
+        }
+
     job_id = str(uuid.uuid4())
-    job = RefinementJob(id=job_id, page_id=page_id, status=RefinementStatus.PENDING)
-    await save_job(job)
-    background_tasks.add_task(process_refinement_job, job)
+    job = RefinementJob(
+        id=job_id,
+        page_id=page_id,
+        status=RefinementStatus.PENDING,
+        page_version=page_version,
+    )
+    register_inflight_job(job)
+    try:
+        await save_job(job)
+    except Exception:
+        release_inflight_job(job)
+        raise
+    background_tasks.add_task(start_refinement_job, job)
 
     return {"message": "Refinement job accepted", "job_id": job_id, "page_id": page_id}
 
@@ -62,10 +160,116 @@ async def refine_space(
     Returns:
         A dictionary with the acceptance message and space key.
     """
+    clear_space_cancellation(space_key)
     background_tasks.add_task(process_space_refinement, space_key)
     return {"message": "Space refinement job accepted", "space_key": space_key}
 
 
+@webhook_router.post("/webhooks/confluence", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("600/minute")  # type: ignore
+async def receive_confluence_webhook(
+    request: Request, event: WebhookEvent
+) -> Dict[str, Any]:
+    """Queue a page event from Confluence for the vector index.
+
+    Created, updated and restored pages are re-ingested, removed and trashed
+    pages are deleted from the index. Events are debounced per page and
+    applied in batches in the background; other events are ignored.
+
+    Args:
+        request: The incoming request object.
+        event: The webhook payload.
+
+    Returns:
+        A dictionary with the queued page ID and operation.
+    """
+    operation = webhooks.operation_for(event, request.headers.get("X-Event-Key"))
+    if operation is None or event.page is None:
+        return {"message": "Event ignored", "event": event.event}
+    webhooks.enqueue(event.page.id, operation)
+    return {
+        "message": "Page event queued",
+        "page_id": event.page.id,
+        "operation": operation,
+    }
+
+
+@router.get("/spaces/{space_key}/changes", response_model=SpaceChanges)
+@limiter.limit("10/minute")  # type: ignore
+async def get_space_changes(request: Request, space_key: str) -> SpaceChanges:
+    """List the pages of a space changed since their last completed refinement.
+
+    Only page ids, titles and versions are listed from Confluence; no page
+    body is downloaded.
+
+    Args:
+        request: The incoming request object.
+        space_key: The key of the space to check.
+
+    Returns:
+        The pages whose current version was never refined, and how many
+        pages are unchanged.
+    """
+    try:
+        pages = await confluence.list_space_pages(space_key)
+    except Exception as e:
+        logger.exception(f"Failed to list pages of space {space_key}")
+        raise HTTPException(
+            status_code=502, detail=f"Could not list the space: {e}"
+        ) from e
+
+    refined = await get_refined_versions([page.id for page in pages])
+    changed = [
+        PageChange(
+            page_id=page.id,
+            title=page.title,
+            version=page.version,
+            refined_version=refined.get(page.id),
+        )
+        for page in pages
+        if refined.get(page.id) != page.version
+    ]
+    return SpaceChanges(
+        space_key=space_key, changed=changed, unchanged=len(pages) - len(changed)
+    )
+
+
+@router.post("/status/batch", response_model=BatchStatusResponse)
+@limiter.limit("60/minute")  # type: ignore
+async def get_batch_status(request: Request, batch: BatchStatusRequest) -> Response:
+    """Check the status of many refinement jobs in one request.
+
+    The response carries an ETag; sending it back in ``If-None-Match``
+    returns 304 Not Modified while none of the jobs has changed.
+
+    Args:
+        request: The incoming request object.
+        batch: The job IDs to look up and whether to include the texts.
+
+    Returns:
+        The compact status of each job found, and the IDs that were not found.
+    """
+    fields = _BATCH_STATUS_FIELDS
+    if batch.include_text:
+        fields += ("original_text", "refined_text")
+    found = await get_jobs_by_ids(batch.job_ids, fields)
+
+    by_id = {job["id"]: job for job in found}
+    # Keep the request order so that unchanged jobs always yield the same ETag.
+    jobs = {job_id: by_id[job_id] for job_id in batch.job_ids if job_id in by_id}
+    payload = jsonable_encoder(
+        BatchStatusResponse(
+            jobs=jobs,
+            missing=[job_id for job_id in batch.job_ids if job_id not in by_id],
+        )
+    )
+    body = JSONResponse(payload).body
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
 @router.get("/status/{job_id}", response_model=RefinementJob)
 @limiter.limit("60/minute")  # type: ignore
 async def get_job_status(request: Request, job_id: str) -> RefinementJob:
@@ -88,6 +292,290 @@ async def get_job_status(request: Request, job_id: str) -> RefinementJob:
     return job
 
 
+def _parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    if not fields:
+        return DEFAULT_JOB_FIELDS
+    return tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+
+
+def _encode_cursor(rowid: int) -> str:
+    return base64.urlsafe_b64encode(str(rowid).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+@router.get("/jobs", response_model=JobList)
+@limiter.limit("60/minute")  # type: ignore
+async def get_jobs(
+    request: Request,
+    page_id: Optional[str] = None,
+    space_key: Optional[str] = None,
+    job_status: Optional[RefinementStatus] = Query(default=None, alias="status"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated job fields; the text fields are excluded by default.",
+    ),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+) -> JobList:
+    """List refinement jobs, newest first.
+
+    Args:
+        request: The incoming request object.
+        page_id: Restrict to the jobs of a page.
+        space_key: Restrict to the jobs of a space.
+        job_status: Restrict to jobs with this status.
+        created_after: Only include jobs created at or after this time.
+        created_before: Only include jobs created before this time.
+        fields: Comma-separated list of job fields to return.
+        limit: Maximum number of jobs per page.
+        cursor: The ``next_cursor`` of the previous page.
+
+    Returns:
+        A page of jobs and the cursor of the next page, if any.
+
+    Raises:
+        HTTPException: If a field or the cursor is invalid.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    try:
+        jobs, next_rowid = await list_jobs(
+            page_id=page_id,
+            space_key=space_key,
+            status=job_status,
+            created_after=created_after,
+            created_before=created_before,
+            fields=_parse_fields(fields),
+            limit=limit,
+            after=after,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return JobList(
+        jobs=jobs,
+        next_cursor=_encode_cursor(next_rowid) if next_rowid is not None else None,
+    )
+
+
+def _format_sse(event: JobEvent) -> str:
+    return f"event: {event.type}\ndata: {event.model_dump_json()}\n\n"
+
+
+async def _event_stream(
+    request: Request, job_id: Optional[str] = None, space_key: Optional[str] = None
+) -> AsyncGenerator[str, None]:
+    """Yield server-sent events for a job or a space until the client leaves.
+
+    A job stream starts with the current status of the job and ends once the
+    job has finished.
+    """
+    with events.subscribe(job_id=job_id, space_key=space_key) as subscription:
+        if job_id is not None:
+            job = await get_job(job_id)
+            if job is not None:
+                yield _format_sse(events.status_event(job))
+                if job.status in _FINISHED_STATUSES:
+                    return
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), SSE_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_sse(event)
+            if (
+                job_id is not None
+                and event.type == "status"
+                and event.status in _FINISHED_STATUSES
+            ):
+                return
+
+
+@router.get("/events/jobs/{job_id}")
+@limiter.limit("30/minute")  # type: ignore
+async def stream_job_events(request: Request, job_id: str) -> StreamingResponse:
+    """Stream the status transitions and stage progress of a job.
+
+    Args:
+        request: The incoming request object.
+        job_id: The ID of the job to follow.
+
+    Returns:
+        A ``text/event-stream`` response of ``status`` and ``stage`` events.
+
+    Raises:
+        HTTPException: If the job is not found.
+    """
+    if not await get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        _event_stream(request, job_id=job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/events/spaces/{space_key}")
+@limiter.limit("30/minute")  # type: ignore
+async def stream_space_events(request: Request, space_key: str) -> StreamingResponse:
+    """Stream the status transitions and stage progress of a space run.
+
+    Args:
+        request: The incoming request object.
+        space_key: The key of the space to follow.
+
+    Returns:
+        A ``text/event-stream`` response of ``status`` and ``stage`` events.
+    """
+    return StreamingResponse(
+        _event_stream(request, space_key=space_key),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats/stages", response_model=Dict[str, StageStats])
+@limiter.limit("30/minute")  # type: ignore
+async def get_stage_stats(
+    request: Request,
+    limit: int = Query(default=1000, ge=1, le=100000),
+) -> Dict[str, StageStats]:
+    """Report latency percentiles per pipeline stage over recent jobs.
+
+    Args:
+        request: The incoming request object.
+        limit: Number of most recent jobs to aggregate.
+
+    Returns:
+        A mapping of stage name to count, p50, p95, p99 and max in milliseconds.
+    """
+    metrics = await get_recent_job_metrics(limit)
+    return summarize_stages(metrics)
+
+
+@router.get("/metrics")
+async def get_metrics() -> Response:
+    """Expose Prometheus metrics for the service.
+
+    Returns:
+        The metrics in the Prometheus text exposition format.
+    """
+    payload = await asyncio.to_thread(render_latest, count_jobs_by_status_sync)
+    return Response(content=payload, media_type=CONTENT_TYPE_LATEST)
+
+
+@router.post("/cancel/{job_id}", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("10/minute")  # type: ignore
+async def cancel_job(request: Request, job_id: str) -> Dict[str, Any]:
+    """Cancel a pending or running refinement job.
+
+    Running jobs are interrupted at their next await point; pending jobs are
+    marked as cancelled so that no worker picks them up. A job being processed
+    by another worker cannot be cancelled from this one.
+
+    Args:
+        request: The incoming request object.
+        job_id: The ID of the job to cancel.
+
+    Returns:
+        A dictionary with the acceptance message and job ID.
+
+    Raises:
+        HTTPException: If the job is not found, has already finished, or is
+            running in another worker.
+    """
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in _FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail="Job has already finished")
+
+    running = request_job_cancellation(job_id)
+    pending = await cancel_pending_jobs(job_id=job_id)
+    if not running and not pending:
+        raise HTTPException(
+            status_code=409, detail="Job is not pending or running in this worker"
+        )
+    return {"message": "Job cancellation requested", "job_id": job_id}
+
+
+@router.post("/cancel/space/{space_key}", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("5/minute")  # type: ignore
+async def cancel_space(request: Request, space_key: str) -> Dict[str, Any]:
+    """Cancel an ongoing space refinement and all of its unfinished jobs.
+
+    Args:
+        request: The incoming request object.
+        space_key: The key of the space to cancel.
+
+    Returns:
+        A dictionary with the number of running and pending jobs cancelled.
+    """
+    running = request_space_cancellation(space_key)
+    pending = await cancel_pending_jobs(space_key=space_key)
+    return {
+        "message": "Space cancellation requested",
+        "space_key": space_key,
+        "running_jobs_cancelled": running,
+        "pending_jobs_cancelled": pending,
+    }
+
+
+@router.post("/publish/batch", response_model=PublishBatchResponse)
+@limiter.limit("5/minute")  # type: ignore
+async def publish_batch(
+    request: Request, batch: PublishBatchRequest
+) -> PublishBatchResponse:
+    """Publish the refined pages of several jobs concurrently.
+
+    Args:
+        request: The incoming request object.
+        batch: The IDs of the jobs to publish.
+
+    Returns:
+        The result of each job, in request order, and the totals.
+    """
+    return _publish_response(await publish_jobs(batch.job_ids))
+
+
+@router.post("/publish/space/{space_key}", response_model=PublishBatchResponse)
+@limiter.limit("2/minute")  # type: ignore
+async def publish_space(request: Request, space_key: str) -> PublishBatchResponse:
+    """Publish the latest completed refinement of every page in a space.
+
+    Args:
+        request: The incoming request object.
+        space_key: The key of the space to publish.
+
+    Returns:
+        The result of each page's job, ordered by page ID, and the totals.
+    """
+    job_ids = await get_latest_completed_job_ids(space_key)
+    return _publish_response(await publish_jobs(job_ids))
+
+
+def _publish_response(results: List[PublishResult]) -> PublishBatchResponse:
+    counts = Counter(result.status for result in results)
+    return PublishBatchResponse(
+        published=counts["published"],
+        skipped=counts["skipped"],
+        failed=counts["failed"],
+        results=results,
+    )
+
+
 @router.post("/publish/{job_id}", status_code=status.HTTP_200_OK)
 @limiter.limit("5/minute")  # type: ignore
 async def publish_page(request: Request, job_id: str) -> Dict[str, Any]:
@@ -99,7 +587,7 @@ async def publish_page(request: Request, job_id: str) -> Dict[str, Any]:
         api_key: The authenticated API key.
 
     Returns:
-        A dictionary with a success message.
+        A dictionary with a success message and the published version.
 
     Raises:
         HTTPException: If the job is not found, not complete, or publishing fails.
@@ -108,28 +596,23 @@ async def publish_page(request: Request, job_id: str) -> Dict[str, Any]:
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    if job.status != RefinementStatus.COMPLETED or not job.refined_text:
-        raise HTTPException(
-            status_code=400,
-            detail="Job must be completed and have refined text to publish",
-        )
+    error = publish_error(job)
+    if error is not None:
+        raise HTTPException(status_code=400, detail=error)
 
-    try:
-        # We need the original page to get its current version to increment it
-        # However, for simplicity and since v2 API handles updates, we will fetch it
-        current_page = await confluence.get_page(job.page_id)
-
-        # Confluence v2 API doesn't strictly need the version passed this way for all updates,
-        # but the prompt implies we might want to version it. We use an arbitrary bump here or
-        # rely on the backend. For a real system we'd parse the version from get_page, but
-        # this suffices for the re-implementation requested.
-        await confluence.update_page(
-            page_id=job.page_id,
-            title=current_page.title,
-            body=job.refined_text,
-            version_number=2,  # Hardcoded bump for demonstration
+    result = await publish_job(job)
+    if result.status == "failed":
+        raise HTTPException(
+            status_code=500, detail=f"Publishing failed: {result.error}"
         )
-        return {"message": "Page published successfully", "page_id": job.page_id}
-    except Exception as e:
-        logger.exception(f"Failed to publish page for job {job_id}")
-        raise HTTPException(status_code=500, detail=f"Publishing failed: {e}") from e
+    if result.status == "skipped":
+        return {
+            "message": "Page is unchanged, nothing to publish",
+            "page_id": job.page_id,
+            "version": result.version,
+        }
+    return {
+        "message": "Page published successfully",
+        "page_id": job.page_id,
+        "version": result.version,
+    }
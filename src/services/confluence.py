@@ -1,21 +1,35 @@
+import asyncio
+import importlib.util
+import json
 import logging
+import re
+import time
 import urllib.parse
-from typing import Any, List, Optional
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
 
 import httpx
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
 
 from src.config import settings
-from src.models.domain import ConfluencePage
+from src.metrics import CONFLUENCE_REQUEST_SECONDS
+from src.models.domain import PageRecord
+from src.services.rate_limit import RateLimitedTransport
+from src.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 _client: Optional[httpx.AsyncClient] = None
+# The client created by _get_client outside the app lifespan, and its event loop
+_lazy_client: Optional[Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = None
+
+# Response bodies are decoded straight from bytes, with orjson when installed.
+_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+    _loads = json.loads
 
 
 def _get_auth() -> Optional[tuple[str, str]]:
@@ -25,37 +39,87 @@ def _get_auth() -> Optional[tuple[str, str]]:
     return (settings.CONFLUENCE_USERNAME, settings.CONFLUENCE_API_TOKEN)
 
 
+_ID_SEGMENT = re.compile(r"/\d+")
+
+
+async def _on_request(request: httpx.Request) -> None:
+    request.extensions["start_time"] = time.perf_counter()
+
+
+async def _on_response(response: httpx.Response) -> None:
+    request = response.request
+    start = request.extensions.get("start_time")
+    if start is None:
+        return
+    # Collapse numeric IDs so the metric label has bounded cardinality
+    endpoint = _ID_SEGMENT.sub("/{id}", request.url.path)
+    CONFLUENCE_REQUEST_SECONDS.labels(
+        request.method, endpoint, str(response.status_code)
+    ).observe(time.perf_counter() - start)
+
+
+def _build_transport() -> httpx.AsyncHTTPTransport:
+    limits = httpx.Limits(
+        max_connections=settings.CONFLUENCE_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.CONFLUENCE_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.CONFLUENCE_KEEPALIVE_EXPIRY,
+    )
+    http2 = settings.CONFLUENCE_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "CONFLUENCE_HTTP2 is set but the h2 package is not installed. Using HTTP/1.1."
+        )
+        http2 = False
+    return httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+
+
+def _build_client() -> httpx.AsyncClient:
+    auth = _get_auth()
+    return httpx.AsyncClient(
+        base_url=settings.CONFLUENCE_URL,
+        auth=auth if auth else None,
+        timeout=httpx.Timeout(30.0),
+        headers={"Accept": "application/json"},
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+        transport=RateLimitedTransport(_build_transport()),
+    )
+
+
 async def init_client() -> None:
     global _client
     if _client is None:
-        auth = _get_auth()
-        _client = httpx.AsyncClient(
-            base_url=settings.CONFLUENCE_URL,
-            auth=auth if auth else None,
-            timeout=httpx.Timeout(30.0),
-            headers={"Accept": "application/json"},
-        )
+        _client = _build_client()
 
 
 async def close_client() -> None:
-    global _client
+    global _client, _lazy_client
     if _client is not None:
         await _client.aclose()
         _client = None
+    _lazy_client = None
 
 
 def _get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use outside the app lifespan.
+
+    A client created here is shared like the one from ``init_client`` and must
+    be closed with ``close_client``. Its connections belong to the event loop
+    it was created on, so a new one is created when called from another loop,
+    e.g. by consecutive ``asyncio.run`` calls in a script.
+    """
+    global _client, _lazy_client
+    loop = asyncio.get_running_loop()
+    if _client is not None and _lazy_client is not None:
+        client, client_loop = _lazy_client
+        if client is _client and client_loop is not loop:
+            _client = None
     if _client is None:
         logger.warning(
-            "Confluence client is not initialized. Falling back to an unmanaged client."
-        )
-        auth = _get_auth()
-        return httpx.AsyncClient(
-            base_url=settings.CONFLUENCE_URL,
-            auth=auth if auth else None,
-            timeout=httpx.Timeout(30.0),
-            headers={"Accept": "application/json"},
+            "Confluence client is not initialized. Creating a shared client; "
+            "call close_client() when done."
         )
+        _client = _build_client()
+        _lazy_client = (_client, loop)
     return _client
 
 
@@ -64,102 +128,270 @@ def clean_html(html_content: str) -> str:
     return html_content
 
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
-)
-async def get_page(page_id: str) -> ConfluencePage:
+def _parse_page(item: Dict[str, Any], space_key: str) -> PageRecord:
+    """Build a page record from a content item of the v1 REST API."""
+    body = item.get("body")
+    storage = body.get("storage") if body else None
+    version = item.get("version")
+    links = item.get("_links")
+    webui = links.get("webui", "") if links else ""
+    return PageRecord(
+        id=str(item["id"]),
+        title=item["title"],
+        space_key=space_key,
+        body=clean_html(storage.get("value", "")) if storage else "",
+        version=version.get("number", 1) if version else 1,
+        url=f"{settings.CONFLUENCE_URL}{webui}" if webui else "",
+    )
+
+
+@dataclass(slots=True)
+class _Listing:
+    pages: List[PageRecord]
+    next_link: Optional[str]
+    limit: Optional[int]
+    total: Optional[int]
+
+
+def _parse_listing(content: bytes, space_key: str) -> _Listing:
+    """Extract the pages and paging details from a content listing response.
+
+    Only the fields kept on ``PageRecord`` survive; the decoded document,
+    with its ``_expandable`` blocks and links, is dropped on return.
+
+    Args:
+        content: The raw JSON response body.
+        space_key: The space the listing belongs to.
+
+    Returns:
+        The pages, the relative link to the next listing page, the page size
+        the server applied and, when reported, the total number of pages.
+    """
+    data = _loads(content)
+    pages = [_parse_page(item, space_key) for item in data.get("results", [])]
+    links = data.get("_links")
+    return _Listing(
+        pages=pages,
+        next_link=links.get("next") if links else None,
+        limit=data.get("limit"),
+        total=data.get("totalSize"),
+    )
+
+
+@traced("confluence.get_page")
+async def get_page(page_id: str) -> PageRecord:
     client = _get_client()
     # Confluence API v1 to ensure space_key is available as expected
     safe_page_id = urllib.parse.quote(page_id)
     response = await client.get(
-        f"/wiki/rest/api/content/{safe_page_id}?expand=body.storage,space"
+        f"/wiki/rest/api/content/{safe_page_id}?expand=body.storage,space,version"
     )
     response.raise_for_status()
     data = response.json()
 
-    body = ""
-    if "body" in data and "storage" in data["body"]:
-        body = clean_html(data["body"]["storage"].get("value", ""))
-
-    space_key = "unknown"
-    if "space" in data and "key" in data["space"]:
-        space_key = data["space"]["key"]
+    space = data.get("space")
+    space_key = space.get("key", "unknown") if space else "unknown"
+    return _parse_page(data, space_key)
 
-    version = data.get("version", {}).get("number", 1)
-    webui = data.get("_links", {}).get("webui", "")
-    page_url = f"{settings.CONFLUENCE_URL}{webui}" if webui else ""
 
-    return ConfluencePage(
-        id=str(data["id"]),
-        title=data["title"],
-        space_key=space_key,
-        body=body,
-        version=version,
-        url=page_url,
-    )
+@traced("confluence.get_page_version")
+async def get_page_version(page_id: str) -> int:
+    """Return the current version number of a page without downloading its body.
 
+    Args:
+        page_id: The ID of the page.
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
-)
-async def get_pages_from_space(
-    space_key: str, limit: Optional[int] = None, page_size: int = 50
-) -> List[ConfluencePage]:
+    Returns:
+        The version number.
+    """
     client = _get_client()
-    pages: List[ConfluencePage] = []
+    safe_page_id = urllib.parse.quote(page_id)
+    response = await client.get(f"/wiki/rest/api/content/{safe_page_id}?expand=version")
+    response.raise_for_status()
+    version = _loads(response.content).get("version")
+    return version.get("number", 1) if version else 1
+
+
+async def _fetch_listing(
+    client: httpx.AsyncClient, url: str, space_key: str
+) -> _Listing:
+    response = await client.get(url)
+    response.raise_for_status()
+    return _parse_listing(response.content, space_key)
 
-    safe_space_key = urllib.parse.quote(space_key)
-    url = f"/wiki/rest/api/content?spaceKey={safe_space_key}&expand=body.storage,version&limit={page_size}"
 
-    while url:
-        response = await client.get(url)
+def _wiki_path(link: str) -> str:
+    # The next link might be a relative path without /wiki
+    return link if link.startswith("/wiki") else f"/wiki{link}"
+
+
+async def _count_space_pages(
+    client: httpx.AsyncClient, space_key: str
+) -> Optional[int]:
+    """Ask the CQL search for the number of pages in a space.
+
+    Returns:
+        The page count, or None when the search is unavailable.
+    """
+    cql = urllib.parse.quote(f'space="{space_key}" and type=page')
+    try:
+        response = await client.get(f"/wiki/rest/api/search?cql={cql}&limit=1")
         response.raise_for_status()
-        data = response.json()
-
-        for item in data.get("results", []):
-            body = ""
-            if "body" in item and "storage" in item["body"]:
-                body = clean_html(item["body"]["storage"].get("value", ""))
-
-            version = item.get("version", {}).get("number", 1)
-            webui = item.get("_links", {}).get("webui", "")
-            page_url = f"{settings.CONFLUENCE_URL}{webui}" if webui else ""
-
-            pages.append(
-                ConfluencePage(
-                    id=str(item["id"]),
-                    title=item["title"],
-                    space_key=space_key,
-                    body=body,
-                    version=version,
-                    url=page_url,
-                )
-            )
+        total = _loads(response.content).get("totalSize")
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"Could not count the pages of space {space_key}: {e}")
+        return None
+    return total if isinstance(total, int) else None
+
+
+async def iter_space_pages(
+    space_key: str,
+    page_size: int = 50,
+    concurrency: Optional[int] = None,
+    ordered: bool = True,
+    expand_body: bool = True,
+) -> AsyncGenerator[List[PageRecord], None]:
+    """Yield the pages of a space, one listing page at a time.
+
+    The first listing page is fetched alone. If the space has more pages, its
+    size is learned from ``totalSize`` or a CQL count, and the remaining
+    listing pages are requested by offset, ``concurrency`` at a time, through
+    the shared rate limiter. Without a known size, ``_links.next`` is
+    followed one request at a time.
+
+    Args:
+        space_key: The space to list.
+        page_size: The number of pages requested per listing page.
+        concurrency: Listing requests in flight at once, defaults to
+            ``CONFLUENCE_LISTING_CONCURRENCY``.
+        ordered: Yield listing pages in offset order rather than as they arrive.
+        expand_body: Include page bodies; without them the records only carry
+            ids, titles, versions and links, and responses are far smaller.
+
+    Yields:
+        The pages of each listing page.
+    """
+    client = _get_client()
+    if concurrency is None:
+        concurrency = settings.CONFLUENCE_LISTING_CONCURRENCY
 
+    safe_space_key = urllib.parse.quote(space_key)
+    expand = "body.storage,version" if expand_body else "version"
+    base_url = f"/wiki/rest/api/content?spaceKey={safe_space_key}&expand={expand}"
+    listing = await _fetch_listing(client, f"{base_url}&limit={page_size}", space_key)
+    yield listing.pages
+
+    # The server may apply a lower limit than requested, e.g. with expanded bodies
+    step = listing.limit or page_size
+    if concurrency > 1 and listing.next_link and len(listing.pages) >= step:
+        total = listing.total
+        if total is None:
+            total = await _count_space_pages(client, space_key)
+        if total is not None:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def fetch(start: int) -> _Listing:
+                async with semaphore:
+                    return await _fetch_listing(
+                        client, f"{base_url}&limit={step}&start={start}", space_key
+                    )
+
+            tasks = [
+                asyncio.create_task(fetch(start)) for start in range(step, total, step)
+            ]
+            try:
+                if ordered:
+                    for task in tasks:
+                        listing = await task
+                        yield listing.pages
+                else:
+                    for next_done in asyncio.as_completed(tasks):
+                        yield (await next_done).pages
+                    listing = tasks[-1].result() if tasks else listing
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Pages added since the count (or an unknown size) are listed by following next links
+    while listing.next_link:
+        listing = await _fetch_listing(client, _wiki_path(listing.next_link), space_key)
+        yield listing.pages
+
+
+@traced("confluence.get_pages_from_space")
+async def get_pages_from_space(
+    space_key: str, limit: Optional[int] = None, page_size: int = 50
+) -> List[PageRecord]:
+    pages: List[PageRecord] = []
+    listings = iter_space_pages(space_key, page_size)
+    try:
+        async for batch in listings:
+            pages.extend(batch)
             if limit and len(pages) >= limit:
                 return pages[:limit]
+    finally:
+        await listings.aclose()
+    return pages
 
-        links = data.get("_links", {})
-        if "next" in links:
-            # The next link might be a relative path without /wiki
-            next_link = links["next"]
-            url = next_link if next_link.startswith("/wiki") else f"/wiki{next_link}"
-        else:
-            url = ""
 
+@traced("confluence.list_space_pages")
+async def list_space_pages(space_key: str, page_size: int = 200) -> List[PageRecord]:
+    """List the ids, titles and versions of every page in a space, without bodies.
+
+    Meant for working out which pages changed before fetching the bodies of
+    those with ``get_pages``.
+
+    Args:
+        space_key: The space to list.
+        page_size: The number of pages requested per listing page.
+
+    Returns:
+        Page records whose ``body`` is empty.
+    """
+    pages: List[PageRecord] = []
+    async for batch in iter_space_pages(space_key, page_size, expand_body=False):
+        pages.extend(batch)
+    return pages
+
+
+@traced("confluence.get_pages")
+async def get_pages(
+    page_ids: List[str], concurrency: Optional[int] = None
+) -> List[PageRecord]:
+    """Fetch the given pages with their bodies, a bounded number at a time.
+
+    Args:
+        page_ids: The pages to fetch.
+        concurrency: Requests in flight at once, defaults to
+            ``CONFLUENCE_FETCH_CONCURRENCY``.
+
+    Returns:
+        The pages that could be fetched, in the order of ``page_ids``. Failures
+        are logged and left out.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.CONFLUENCE_FETCH_CONCURRENCY)
+
+    async def fetch(page_id: str) -> PageRecord:
+        async with semaphore:
+            return await get_page(page_id)
+
+    results = await asyncio.gather(
+        *(fetch(page_id) for page_id in page_ids), return_exceptions=True
+    )
+    pages: List[PageRecord] = []
+    for page_id, result in zip(page_ids, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Failed to fetch page {page_id}: {result}")
+        else:
+            pages.append(result)
     return pages
 
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
-)
-async def update_page(page_id: str, title: str, body: str, version_number: int) -> Any:
+@traced("confluence.update_page")
+async def update_page(
+    page_id: str, title: str, body: str, version_number: int, message: str = ""
+) -> Any:
     """Publish a new version of the page back to Confluence.
 
     Args:
@@ -167,17 +399,21 @@ async def update_page(page_id: str, title: str, body: str, version_number: int)
         title (str): The new title of the page.
         body (str): The new body content.
         version_number (int): The next version number for the update.
+        message (str): The version comment shown in the page history.
 
     Returns:
         Any: The JSON response from the Confluence API.
     """
     client = _get_client()
+    version: Dict[str, Any] = {"number": version_number}
+    if message:
+        version["message"] = message
     payload = {
         "id": page_id,
         "status": "current",
         "title": title,
         "body": {"representation": "storage", "value": body},
-        "version": {"number": version_number},
+        "version": version,
     }
     # Using v2 API for updates
     safe_page_id = urllib.parse.quote(page_id)
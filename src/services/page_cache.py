@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+from src.config import settings
+from src.metrics import PAGE_CACHE_REQUESTS
+from src.models.domain import PageRecord
+from src.services import confluence
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    space_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    validated_at REAL NOT NULL,
+    PRIMARY KEY (page_id, version)
+) WITHOUT ROWID
+"""
+
+_Row = Tuple[str, int, str, str, str, bytes, float]
+
+
+class _PageStore:
+    """Compressed page bodies in a local SQLite file, keyed by (page_id, version)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+
+    def load(self, page_id: str) -> Optional[Tuple[PageRecord, float]]:
+        with self._lock:
+            row: Optional[_Row] = self._conn.execute(
+                """
+                SELECT page_id, version, title, space_key, url, body, validated_at
+                FROM pages WHERE page_id = ? ORDER BY version DESC LIMIT 1
+                """,
+                (page_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        page_id, version, title, space_key, url, body, validated_at = row
+        page = PageRecord(
+            id=page_id,
+            title=title,
+            space_key=space_key,
+            body=zlib.decompress(body).decode("utf-8"),
+            version=version,
+            url=url,
+        )
+        return page, validated_at
+
+    def store(self, pages: List[PageRecord]) -> None:
+        now = time.time()
+        rows = [
+            (
+                page.id,
+                page.version,
+                page.title,
+                page.space_key,
+                page.url,
+                zlib.compress(page.body.encode("utf-8")),
+                now,
+            )
+            for page in pages
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            # Only the latest version of a page is ever served
+            self._conn.executemany(
+                "DELETE FROM pages WHERE page_id = ? AND version < ?",
+                [(page.id, page.version) for page in pages],
+            )
+
+    def touch(self, page_id: str, version: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET validated_at = ? WHERE page_id = ? AND version = ?",
+                (time.time(), page_id, version),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[_PageStore] = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> Optional[_PageStore]:
+    global _store
+    with _store_lock:
+        path = settings.PAGE_CACHE_PATH
+        if not path:
+            return None
+        if _store is None or _store.path != path:
+            if _store is not None:
+                _store.close()
+            _store = _PageStore(path)
+        return _store
+
+
+def close() -> None:
+    """Close the page cache file."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+async def store(pages: List[PageRecord]) -> None:
+    """Cache pages fetched elsewhere, e.g. by a space listing with bodies."""
+    page_store = _get_store()
+    if page_store is not None and pages:
+        await asyncio.to_thread(page_store.store, pages)
+
+
+async def get_page(page_id: str, max_age: Optional[float] = None) -> PageRecord:
+    """Return a page from the local cache, downloading it only when it changed.
+
+    A cached page validated less than ``max_age`` seconds ago is served as is.
+    Older entries are revalidated with a version-only request, and the body is
+    downloaded only when Confluence has a newer version.
+
+    Args:
+        page_id: The ID of the page.
+        max_age: Freshness window in seconds, defaults to
+            ``PAGE_CACHE_MAX_AGE``; ``0`` always revalidates.
+
+    Returns:
+        The current page.
+    """
+    page_store = _get_store()
+    if page_store is None:
+        return await confluence.get_page(page_id)
+    if max_age is None:
+        max_age = settings.PAGE_CACHE_MAX_AGE
+
+    cached = await asyncio.to_thread(page_store.load, page_id)
+    if cached is not None:
+        page, validated_at = cached
+        if time.time() - validated_at < max_age:
+            PAGE_CACHE_REQUESTS.labels("hit").inc()
+            return page
+        if await confluence.get_page_version(page_id) == page.version:
+            PAGE_CACHE_REQUESTS.labels("revalidated").inc()
+            await asyncio.to_thread(page_store.touch, page_id, page.version)
+            return page
+
+    PAGE_CACHE_REQUESTS.labels("miss").inc()
+    page = await confluence.get_page(page_id)
+    await asyncio.to_thread(page_store.store, [page])
+    return page
@@ -2,15 +2,22 @@ import asyncio
 import hashlib
 import json
 import logging
-from typing import Any, List, Optional, cast
+from typing import Any, Collection, List, Optional, Tuple, cast
 
 import chromadb
 import redis.asyncio as redis
 from chromadb.api.types import Metadata
 from chromadb.config import Settings as ChromaSettings
 
+from src import job_metrics
 from src.config import settings
-from src.models.domain import ConfluencePage
+from src.metrics import (
+    CHROMA_QUERY_SECONDS,
+    RAG_CACHE_REQUESTS,
+    RAG_EMBEDDING_BATCH_SECONDS,
+)
+from src.models.domain import PageRecord
+from src.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,9 @@ _chroma_client = None
 _collection = None
 _redis_client: Optional[redis.Redis] = None  # type: ignore
 
+# Chunks written per ChromaDB add call, below its SQLite-bound maximum batch size.
+CHROMA_ADD_BATCH_SIZE = 5000
+
 
 def _get_redis() -> Optional[redis.Redis]:  # type: ignore
     global _redis_client
@@ -76,7 +86,23 @@ def chunk_text(text: str, max_chunk_size: int = 1000, overlap: int = 100) -> Lis
     return [c for c in chunks if c]
 
 
-def _ingest_page(page: ConfluencePage) -> None:
+def _page_chunks(page: PageRecord) -> Tuple[List[str], List[str], List[Metadata]]:
+    """Split a page into the ids, documents and metadatas of its chunks."""
+    chunks = chunk_text(page.body)
+    ids = [f"{page.id}_chunk_{i}" for i in range(len(chunks))]
+    metadatas: List[Metadata] = [
+        {
+            "page_id": str(page.id),
+            "title": str(page.title),
+            "space_key": str(page.space_key),
+            "chunk_index": i,
+        }
+        for i in range(len(chunks))
+    ]
+    return ids, chunks, metadatas
+
+
+def _ingest_page(page: PageRecord) -> None:
     """Synchronous function to ingest a single page into ChromaDB.
 
     Args:
@@ -89,26 +115,50 @@ def _ingest_page(page: ConfluencePage) -> None:
     except Exception as e:
         logger.warning(f"Failed to delete existing chunks for page {page.id}: {e}")
 
-    chunks = chunk_text(page.body)
+    ids, chunks, metadatas = _page_chunks(page)
     if not chunks:
         return
 
-    ids = [f"{page.id}_chunk_{i}" for i in range(len(chunks))]
-    metadatas: List[Metadata] = [
-        {
-            "page_id": str(page.id),
-            "title": str(page.title),
-            "space_key": str(page.space_key),
-            "chunk_index": i,
-        }
-        for i in range(len(chunks))
-    ]
-
     # Type hinting workaround for ChromaDB metadatas
-    col.add(documents=chunks, metadatas=metadatas, ids=ids)
+    with span("chroma.add", chunks=len(chunks)), RAG_EMBEDDING_BATCH_SECONDS.time():
+        col.add(documents=chunks, metadatas=metadatas, ids=ids)
+
 
+def _apply_changes(pages: List[PageRecord], deleted_page_ids: Collection[str]) -> None:
+    """Synchronous function to replace and delete many pages in ChromaDB.
 
-async def ingest_page(page: ConfluencePage) -> None:
+    Args:
+        pages: Pages whose chunks are replaced by their current body.
+        deleted_page_ids: Pages whose chunks are removed.
+    """
+    col = _get_collection()
+    page_ids = [page.id for page in pages] + list(deleted_page_ids)
+    if not page_ids:
+        return
+    col.delete(where={"page_id": {"$in": page_ids}})
+
+    ids: List[str] = []
+    documents: List[str] = []
+    metadatas: List[Metadata] = []
+    for page in pages:
+        chunk_ids, chunks, chunk_metadatas = _page_chunks(page)
+        ids.extend(chunk_ids)
+        documents.extend(chunks)
+        metadatas.extend(chunk_metadatas)
+
+    with span("chroma.add", chunks=len(documents), pages=len(pages)):
+        for start in range(0, len(documents), CHROMA_ADD_BATCH_SIZE):
+            end = start + CHROMA_ADD_BATCH_SIZE
+            with RAG_EMBEDDING_BATCH_SECONDS.time():
+                col.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end],
+                )
+
+
+@traced("rag.ingest_page")
+async def ingest_page(page: PageRecord) -> None:
     """Asynchronously ingest a page into ChromaDB using a thread pool.
 
     Args:
@@ -117,6 +167,19 @@ async def ingest_page(page: ConfluencePage) -> None:
     await asyncio.to_thread(_ingest_page, page)
 
 
+@traced("rag.apply_changes")
+async def apply_changes(
+    pages: List[PageRecord], deleted_page_ids: Collection[str] = ()
+) -> None:
+    """Asynchronously re-index and remove many pages with batched ChromaDB writes.
+
+    Args:
+        pages: Pages whose chunks are replaced by their current body.
+        deleted_page_ids: Pages whose chunks are removed.
+    """
+    await asyncio.to_thread(_apply_changes, pages, deleted_page_ids)
+
+
 def _query_context(query_text: str, n_results: int = 5) -> List[str]:
     """Synchronous function to query ChromaDB for context.
 
@@ -128,7 +191,8 @@ def _query_context(query_text: str, n_results: int = 5) -> List[str]:
         A list of matching documents.
     """
     col = _get_collection()
-    results = col.query(query_texts=[query_text], n_results=n_results)
+    with span("chroma.query"), CHROMA_QUERY_SECONDS.time():
+        results = col.query(query_texts=[query_text], n_results=n_results)
 
     documents = results.get("documents", [])
     if documents and len(documents) > 0:
@@ -138,6 +202,7 @@ def _query_context(query_text: str, n_results: int = 5) -> List[str]:
     return []
 
 
+@traced("rag.query_context")
 async def query_context(query_text: str, n_results: int = 5) -> List[str]:
     """Asynchronously query context from ChromaDB using a thread pool, with Redis caching.
 
@@ -158,7 +223,10 @@ async def query_context(query_text: str, n_results: int = 5) -> List[str]:
             cached_result = await redis_client.get(cache_key)
             if cached_result:
                 logger.info(f"RAG cache hit for query hash {query_hash}")
+                job_metrics.record_cache_hit()
+                RAG_CACHE_REQUESTS.labels("hit").inc()
                 return cast(List[str], json.loads(cached_result))
+            RAG_CACHE_REQUESTS.labels("miss").inc()
         except Exception as e:
             logger.warning(f"Redis cache read error: {e}")
 
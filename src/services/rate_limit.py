@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from src.config import settings
+from src.metrics import CONFLUENCE_RETRIES
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Methods that can be repeated after any failure without changing the outcome.
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Failures that happen before the request reaches the server.
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _seconds_until(value: str) -> Optional[float]:
+    """Parse a delay in seconds, an HTTP date or an ISO 8601 timestamp."""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def _reset_delay(response: httpx.Response) -> Optional[float]:
+    """Seconds until ``X-RateLimit-Reset``, an ISO timestamp or epoch seconds."""
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset is None:
+        return None
+    try:
+        epoch = float(reset)
+    except ValueError:
+        return _seconds_until(reset)
+    return max(0.0, epoch - time.time())
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Return how long the server asked us to wait before the next request.
+
+    Reads ``Retry-After`` (seconds or an HTTP date) and falls back to the
+    Atlassian ``X-RateLimit-Reset`` header.
+    """
+    header = response.headers.get("Retry-After")
+    delay = _seconds_until(header) if header is not None else None
+    if delay is None:
+        delay = _reset_delay(response)
+    return delay
+
+
+class RateLimiter:
+    """Pacing shared by every Confluence request of the process.
+
+    A rate-limited response pauses all callers until the server's reset time,
+    and while Atlassian reports that we are close to the limit, requests are
+    spaced ``CONFLUENCE_NEAR_LIMIT_INTERVAL`` seconds apart.
+    """
+
+    def __init__(self) -> None:
+        self._resume_at = 0.0
+        self._interval = 0.0
+        self._next_slot = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for the next ``seconds``."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def wait(self) -> None:
+        """Wait until the caller may send its next request."""
+        while True:
+            now = time.monotonic()
+            start = max(now, self._resume_at)
+            if self._interval > 0:
+                start = max(start, self._next_slot)
+            if start <= now:
+                self._next_slot = now + self._interval
+                return
+            await asyncio.sleep(start - now)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Adjust the pacing to the rate-limit headers of a response."""
+        headers = response.headers
+        near_limit = headers.get("X-RateLimit-NearLimit", "").lower() == "true"
+        self._interval = settings.CONFLUENCE_NEAR_LIMIT_INTERVAL if near_limit else 0.0
+        if headers.get("X-RateLimit-Remaining") == "0":
+            delay = _reset_delay(response)
+            if delay:
+                self.pause(min(delay, settings.CONFLUENCE_MAX_RETRY_WAIT))
+
+
+limiter = RateLimiter()
+
+
+def _may_resend(request: httpx.Request, error: httpx.TransportError) -> bool:
+    """Whether a request that failed without a response is safe to send again.
+
+    Reads always are. Other requests, such as the versioned page ``PUT``, only
+    when the connection was never established: if the response was lost
+    instead, a replay could save a second version.
+    """
+    return request.method in SAFE_METHODS or isinstance(error, NOT_SENT_ERRORS)
+
+
+def _may_retry(request: httpx.Request, status: int) -> bool:
+    """Whether a request answered with a retryable status is safe to send again.
+
+    A ``429`` means the server did not process the request; after a ``5xx``
+    only reads are repeated.
+    """
+    return status == 429 or request.method in SAFE_METHODS
+
+
+def _backoff(attempt: int) -> float:
+    delay = settings.CONFLUENCE_RETRY_BACKOFF * 2**attempt
+    return min(delay, settings.CONFLUENCE_MAX_RETRY_WAIT) * random.uniform(0.5, 1.0)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Send requests through the shared limiter and retry them one by one.
+
+    Rate-limited (429) responses, transient server errors and connection
+    failures are retried up to ``CONFLUENCE_MAX_RETRIES`` times; writes only
+    when the server cannot have processed them. Only the failed request is
+    repeated, so a paginated fetch keeps its progress.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        rate_limiter: RateLimiter = limiter,
+    ) -> None:
+        self._transport = transport
+        self._limiter = rate_limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self._limiter.wait()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if attempt >= settings.CONFLUENCE_MAX_RETRIES or not _may_resend(
+                    request, e
+                ):
+                    raise
+                delay = _backoff(attempt)
+                reason = "transport"
+                logger.warning(
+                    f"Confluence request failed ({e!r}), retrying in {delay:.1f}s"
+                )
+            else:
+                self._limiter.observe(response)
+                status = response.status_code
+                if (
+                    status not in RETRY_STATUS_CODES
+                    or attempt >= settings.CONFLUENCE_MAX_RETRIES
+                    or not _may_retry(request, status)
+                ):
+                    return response
+                await response.aclose()
+                requested = retry_after(response)
+                delay = min(
+                    requested if requested is not None else _backoff(attempt),
+                    settings.CONFLUENCE_MAX_RETRY_WAIT,
+                )
+                reason = str(status)
+                logger.warning(
+                    f"Confluence returned {status} for {request.url.path}, retrying in {delay:.1f}s"
+                )
+
+            CONFLUENCE_RETRIES.labels(reason).inc()
+            attempt += 1
+            if reason == "429":
+                # The limit applies to the whole account, so every caller waits
+                self._limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
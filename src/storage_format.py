@@ -0,0 +1,131 @@
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Elements whose text keeps its whitespace, like code macro bodies.
+_PRESERVE_WHITESPACE = frozenset({"pre", "ac:plain-text-body"})
+
+
+class _Tokenizer(HTMLParser):
+    """Split Confluence storage format into canonical tokens.
+
+    Tags keep their name and their attributes sorted by name, and text is
+    collapsed to single spaces, so that markup differing only in whitespace
+    or attribute order produces the same tokens.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tokens: List[str] = []
+        self._preserve = 0
+
+    def _tag(self, tag: str, attrs: List[Tuple[str, Optional[str]]], end: str) -> str:
+        rendered = "".join(
+            f' {name}="{value}"' if value is not None else f" {name}"
+            for name, value in sorted(attrs)
+        )
+        return f"<{tag}{rendered}{end}>"
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.tokens.append(self._tag(tag, attrs, ""))
+        if tag in _PRESERVE_WHITESPACE:
+            self._preserve += 1
+
+    def handle_startendtag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        self.tokens.append(self._tag(tag, attrs, "/"))
+
+    def handle_endtag(self, tag: str) -> None:
+        self.tokens.append(f"</{tag}>")
+        if tag in _PRESERVE_WHITESPACE and self._preserve:
+            self._preserve -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._preserve:
+            data = _WHITESPACE.sub(" ", data).strip()
+        if data:
+            self.tokens.append(data)
+
+    def unknown_decl(self, data: str) -> None:
+        # CDATA sections, e.g. code macro bodies, are kept verbatim
+        self.tokens.append(f"<![{data}]>")
+
+
+def normalize(html: str) -> List[str]:
+    """Return the canonical tokens of a storage format document.
+
+    Args:
+        html: The page body in Confluence storage format.
+
+    Returns:
+        Tags with sorted attributes and whitespace-collapsed text, in order.
+    """
+    tokenizer = _Tokenizer()
+    tokenizer.feed(html)
+    tokenizer.close()
+    return tokenizer.tokens
+
+
+def _summarize(old_tokens: List[str], new_tokens: List[str]) -> str:
+    """Count the tokens changed, added and removed, in linear time.
+
+    The unchanged head and tail are skipped, and the remaining tokens are
+    compared as multisets: a token missing from one side and a token new on
+    the other count as one change. Tokens that only moved are reported as
+    reordered. This is coarser than an edit script, whose cost grows with the
+    square of the page size on markup made of the same few tags.
+    """
+    start = 0
+    end_old, end_new = len(old_tokens), len(new_tokens)
+    while start < min(end_old, end_new) and old_tokens[start] == new_tokens[start]:
+        start += 1
+    while (
+        end_old > start
+        and end_new > start
+        and old_tokens[end_old - 1] == new_tokens[end_new - 1]
+    ):
+        end_old -= 1
+        end_new -= 1
+    old_counts = Counter(old_tokens[start:end_old])
+    new_counts = Counter(new_tokens[start:end_new])
+    added = (new_counts - old_counts).total()
+    removed = (old_counts - new_counts).total()
+    changed = min(added, removed)
+    reordered = end_old - start if not added and not removed else 0
+
+    parts = [
+        f"{count} {label}"
+        for count, label in (
+            (changed, "changed"),
+            (added - changed, "added"),
+            (removed - changed, "removed"),
+            (reordered, "reordered"),
+        )
+        if count
+    ]
+    return f"{', '.join(parts)} of {len(old_tokens)} elements"
+
+
+def change_summary(old: str, new: str) -> Optional[str]:
+    """Summarise how the text of a storage format document changed.
+
+    Args:
+        old: The current page body.
+        new: The body about to be published.
+
+    Returns:
+        A one-line summary of the tags and text runs changed, added and
+        removed, such as ``"4 changed, 1 added of 120 elements"``, or None if
+        the documents only differ in whitespace or attribute order.
+    """
+    if old == new:
+        return None
+    old_tokens = normalize(old)
+    new_tokens = normalize(new)
+    if old_tokens == new_tokens:
+        return None
+    return _summarize(old_tokens, new_tokens)
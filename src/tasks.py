@@ -1,131 +1,466 @@
 import asyncio
+import functools
+import hashlib
+import json
 import logging
+import time
 import uuid
-
-from src.agents import analyst, reviewer, writer
-from src.database import save_job, save_jobs_bulk
+from typing import Any, Coroutine, Optional
+
+from src import events, job_metrics, tracing
+from src.agents import analyst, common, reviewer, writer
+from src.database import (
+    claim_job,
+    find_completed_job,
+    find_completed_job_ids,
+    get_jobs_by_status,
+    save_job,
+    save_jobs_bulk,
+)
 from src.deps import (
     background_tasks_set,
+    cancelled_job_ids,
+    cancelled_spaces,
+    inflight_jobs,
     ingestion_semaphore,
     refinement_semaphore,
+    running_jobs,
+    shutdown_event,
 )
 from src.models.domain import (
-    ConfluencePage,
+    AnalysisResult,
+    JobMetrics,
+    PageRecord,
     RefinementJob,
     RefinementStatus,
 )
-from src.services import confluence, rag
+from src.services import confluence, page_cache, rag
 
 logger = logging.getLogger(__name__)
 
+RAG_CONTEXT_RESULTS = 5
 
-async def _perform_refinement(job: RefinementJob, page: ConfluencePage):
-    """Core logic to refine a single Confluence page.
+# Bump when refinement output changes in ways the prompts and schemas hashed
+# by pipeline_fingerprint do not capture, e.g. response parsing or pipeline steps.
+PIPELINE_VERSION = 1
 
-    Args:
-        job (RefinementJob): The refinement job to process.
-        page (ConfluencePage): The original Confluence page to refine.
+
+@functools.cache
+def _prompts_digest() -> str:
+    """Hash of the agent prompts and the response schemas they are parsed into."""
+    parts = [
+        analyst.SYSTEM_PROMPT,
+        analyst.PROMPT_TEMPLATE,
+        writer.SYSTEM_PROMPT,
+        writer.PROMPT_TEMPLATE,
+        reviewer.SYSTEM_PROMPT,
+        reviewer.PROMPT_TEMPLATE,
+        json.dumps(AnalysisResult.model_json_schema(), sort_keys=True),
+        json.dumps(reviewer.ReviewResult.model_json_schema(), sort_keys=True),
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def pipeline_fingerprint() -> str:
+    """Return a short hash of the settings that influence refinement output.
+
+    Jobs with the same page version and fingerprint produce interchangeable results.
     """
-    try:
-        # Step 1: Query Context
-        logger.info(f"Querying context for job {job.id}")
-        context = await rag.query_context(page.body, n_results=5)
+    config = {
+        "version": PIPELINE_VERSION,
+        "model": common.DEFAULT_MODEL,
+        "temperature": common.DEFAULT_TEMPERATURE,
+        "rag_n_results": RAG_CONTEXT_RESULTS,
+        "prompts": _prompts_digest(),
+    }
+    encoded = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
 
-        # Step 2: Analyst Agent
-        logger.info(f"Analyzing content for job {job.id}")
-        analysis = await analyst.analyze_content(page.body, context)
 
-        if not analysis.critiques:
-            logger.info(f"No critiques found for job {job.id}. Marking as completed.")
-            job.status = RefinementStatus.COMPLETED
-            job.refined_text = page.body
-            await save_job(job)
-            return
+def get_inflight_job_id(page_id: str, page_version: Optional[int]) -> Optional[str]:
+    """Return the ID of a refinement job already running for this page version, if any."""
+    return inflight_jobs.get((page_id, page_version, pipeline_fingerprint()))
 
-        # Step 3: Writer Agent
-        logger.info(f"Rewriting content for job {job.id}")
-        rewritten_text = await writer.rewrite_content(page.body, analysis, context)
 
-        # Step 4: Reviewer Agent
-        logger.info(f"Reviewing content for job {job.id}")
-        review = await reviewer.review_content(page.body, rewritten_text, analysis)
+def register_inflight_job(job: RefinementJob) -> None:
+    """Mark a job as the in-flight refinement for its page version."""
+    if job.pipeline_hash is None:
+        job.pipeline_hash = pipeline_fingerprint()
+    inflight_jobs[(job.page_id, job.page_version, job.pipeline_hash)] = job.id
 
-        if review.status == RefinementStatus.COMPLETED:
-            job.status = RefinementStatus.COMPLETED
-            job.refined_text = rewritten_text
-        else:
-            job.status = RefinementStatus.FAILED
-            job.error = f"Reviewer rejected changes. Reason: {review.feedback}"
 
+def release_inflight_job(job: RefinementJob) -> None:
+    """Clear the in-flight marker for a job once it has finished."""
+    key = (job.page_id, job.page_version, job.pipeline_hash or pipeline_fingerprint())
+    if inflight_jobs.get(key) == job.id:
+        del inflight_jobs[key]
+
+
+async def resolve_page_version(page_id: str) -> Optional[int]:
+    """Return the current version of a page, or None if it cannot be looked up.
+
+    Only the version is requested, so submissions can be deduplicated against
+    existing jobs before a new one is created.
+    """
+    try:
+        return await confluence.get_page_version(page_id)
     except Exception as e:
-        logger.exception(f"Error processing job {job.id}")
-        job.status = RefinementStatus.FAILED
-        job.error = str(e)
+        logger.warning(f"Could not look up the version of page {page_id}: {e}")
+        return None
+
+
+async def find_completed_job_id(
+    page_id: str, page_version: Optional[int]
+) -> Optional[str]:
+    """Return the ID of a job that completed this page version with the current pipeline."""
+    if page_version is None:
+        return None
+    completed = await find_completed_job_ids(
+        [(page_id, page_version)], pipeline_fingerprint()
+    )
+    return completed.get((page_id, page_version))
+
+
+def request_job_cancellation(job_id: str) -> bool:
+    """Cancel a refinement job running in this process.
+
+    Args:
+        job_id: The ID of the job to cancel.
+
+    Returns:
+        True if a local task was cancelled, False if the job is not running here.
+    """
+    entry = running_jobs.get(job_id)
+    if entry is None:
+        return False
+    cancelled_job_ids.add(job_id)
+    entry[1].cancel()
+    return True
+
+
+def request_space_cancellation(space_key: str) -> int:
+    """Cancel all refinement jobs of a space running in this process.
+
+    The space is also flagged so that an ongoing or scheduled space run stops
+    before scheduling further jobs; the run clears the flag when it ends.
+
+    Args:
+        space_key: The key of the space to cancel.
+
+    Returns:
+        The number of local tasks cancelled.
+    """
+    cancelled_spaces.add(space_key)
+    count = 0
+    for job, task in list(running_jobs.values()):
+        if job.space_key == space_key:
+            cancelled_job_ids.add(job.id)
+            task.cancel()
+            count += 1
+    return count
+
+
+def clear_space_cancellation(space_key: str) -> None:
+    """Allow a previously cancelled space to be refined again."""
+    cancelled_spaces.discard(space_key)
+
+
+async def _claim_for_processing(job: RefinementJob) -> bool:
+    if shutdown_event.is_set():
+        logger.info(f"Shutdown in progress; leaving job {job.id} pending")
+        return False
+    if not await claim_job(job.id):
+        logger.info(f"Job {job.id} is no longer pending; skipping")
+        return False
+    job.status = RefinementStatus.PROCESSING
+    return True
+
+
+async def _stop_job(job: RefinementJob, claimed: bool) -> None:
+    """Persist the state of a job whose task was cancelled."""
+    if job.id in cancelled_job_ids:
+        logger.info(f"Job {job.id} cancelled")
+        job.status = RefinementStatus.CANCELLED
+        job.error = "Cancelled by request"
+    elif claimed:
+        # Interrupted by shutdown: keep the fetched content and release the job
+        logger.info(f"Releasing job {job.id} back to the queue")
+        job.status = RefinementStatus.PENDING
+    else:
+        return
+    await save_job(job)
+
+
+def _finish_job(job: RefinementJob) -> None:
+    release_inflight_job(job)
+    cancelled_job_ids.discard(job.id)
+
+
+async def _perform_refinement(job: RefinementJob, page: PageRecord):
+    """Core logic to refine a single Confluence page.
+
+    Args:
+        job (RefinementJob): The refinement job to process.
+        page (PageRecord): The original Confluence page to refine.
+    """
+    if job.metrics is None:
+        job.metrics = JobMetrics()
+
+    with job_metrics.recording(job.metrics), events.job_context(job):
+        try:
+            # Step 1: Query Context
+            logger.info(f"Querying context for job {job.id}")
+            with job_metrics.stage("rag_context"):
+                context = await rag.query_context(
+                    page.body, n_results=RAG_CONTEXT_RESULTS
+                )
+
+            # Step 2: Analyst Agent
+            logger.info(f"Analyzing content for job {job.id}")
+            with job_metrics.stage("analyst"):
+                analysis = await analyst.analyze_content(page.body, context)
+
+            if not analysis.critiques:
+                logger.info(
+                    f"No critiques found for job {job.id}. Marking as completed."
+                )
+                job.status = RefinementStatus.COMPLETED
+                job.refined_text = page.body
+                await save_job(job)
+                return
+
+            # Step 3: Writer Agent
+            logger.info(f"Rewriting content for job {job.id}")
+            with job_metrics.stage("writer"):
+                rewritten_text = await writer.rewrite_content(
+                    page.body, analysis, context
+                )
+
+            # Step 4: Reviewer Agent
+            logger.info(f"Reviewing content for job {job.id}")
+            with job_metrics.stage("reviewer"):
+                review = await reviewer.review_content(
+                    page.body, rewritten_text, analysis
+                )
+
+            if review.status == RefinementStatus.COMPLETED:
+                job.status = RefinementStatus.COMPLETED
+                job.refined_text = rewritten_text
+            else:
+                job.status = RefinementStatus.FAILED
+                job.error = f"Reviewer rejected changes. Reason: {review.feedback}"
+
+        except Exception as e:
+            logger.exception(f"Error processing job {job.id}")
+            job.status = RefinementStatus.FAILED
+            job.error = str(e)
 
     await save_job(job)
 
 
+def _start_metrics(job: RefinementJob, queued_at: float) -> JobMetrics:
+    job.metrics = JobMetrics(
+        queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 3)
+    )
+    tracing.set_attribute("queue_wait_ms", job.metrics.queue_wait_ms)
+    return job.metrics
+
+
 async def process_refinement_job(job: RefinementJob):
     """Background task to run a single refinement job with semaphore.
 
     Args:
         job: The refinement job to process.
     """
-    async with refinement_semaphore:
-        try:
+    claimed = False
+    queued_at = time.perf_counter()
+    try:
+        with tracing.span("refinement.job", job_id=job.id, page_id=job.page_id):
+            async with refinement_semaphore:
+                metrics = _start_metrics(job, queued_at)
+                claimed = await _claim_for_processing(job)
+                if not claimed:
+                    return
+                with job_metrics.recording(metrics), events.job_context(job):
+                    await _fetch_and_refine(job)
+    except asyncio.CancelledError:
+        await _stop_job(job, claimed)
+        raise
+    finally:
+        _finish_job(job)
+
+
+async def _fetch_and_refine(job: RefinementJob) -> None:
+    """Fetch the page for a claimed job and run the refinement pipeline."""
+    try:
+        logger.info(
+            f"Starting background processing for job {job.id} (Page: {job.page_id})"
+        )
+        with job_metrics.stage("fetch"):
+            page = await page_cache.get_page(job.page_id)
+        job.original_text = page.body
+        job.space_key = page.space_key
+        if job.pipeline_hash is None:
+            job.pipeline_hash = pipeline_fingerprint()
+        # A result is only reused for a version both lookups agree on, so a
+        # version that could not be resolved never matches an older job
+        version_known = job.page_version == page.version
+        if not version_known:
+            # The page changed since submission, or its version was unknown then:
+            # the job now refines the version just fetched
+            release_inflight_job(job)
+            job.page_version = page.version
+            register_inflight_job(job)
+
+        previous = (
+            await find_completed_job(job.page_id, page.version, job.pipeline_hash)
+            if version_known
+            else None
+        )
+        if previous is not None and previous.id != job.id:
             logger.info(
-                f"Starting background processing for job {job.id} (Page: {job.page_id})"
+                f"Reusing result of job {previous.id} for job {job.id} "
+                f"(Page: {job.page_id}, version {page.version})"
             )
-            page = await confluence.get_page(job.page_id)
-            job.original_text = page.body
+            job.status = RefinementStatus.COMPLETED
+            job.refined_text = previous.refined_text
+            job_metrics.record_cache_hit()
             await save_job(job)
+            return
 
-            await _perform_refinement(job, page)
+        await save_job(job)
 
-        except Exception as e:
-            logger.exception(f"Failed to start refinement for job {job.id}")
-            job.status = RefinementStatus.FAILED
-            job.error = str(e)
-            await save_job(job)
+        await _perform_refinement(job, page)
+
+    except Exception as e:
+        logger.exception(f"Failed to start refinement for job {job.id}")
+        job.status = RefinementStatus.FAILED
+        job.error = str(e)
+        await save_job(job)
 
 
-async def _ingest_with_sem(page: ConfluencePage):
+async def _ingest_with_sem(page: PageRecord):
     async with ingestion_semaphore:
         await rag.ingest_page(page)
 
 
-async def _process_with_page(j: RefinementJob, p: ConfluencePage):
-    async with refinement_semaphore:
-        try:
-            logger.info(
-                f"Starting background processing for job {j.id} (Page: {j.page_id})"
-            )
-            await _perform_refinement(j, p)
-        except Exception as e:
-            logger.exception(f"Failed to start refinement for job {j.id}")
-            # Fix the loop variable capture issue
-            j.status = RefinementStatus.FAILED
-            j.error = str(e)
-            await save_job(j)
+async def _process_with_page(j: RefinementJob, p: PageRecord):
+    claimed = False
+    queued_at = time.perf_counter()
+    try:
+        with tracing.span("refinement.job", job_id=j.id, page_id=j.page_id):
+            async with refinement_semaphore:
+                _start_metrics(j, queued_at)
+                claimed = await _claim_for_processing(j)
+                if not claimed:
+                    return
+                try:
+                    logger.info(
+                        f"Starting background processing for job {j.id} (Page: {j.page_id})"
+                    )
+                    await _perform_refinement(j, p)
+                except Exception as e:
+                    logger.exception(f"Failed to start refinement for job {j.id}")
+                    # Fix the loop variable capture issue
+                    j.status = RefinementStatus.FAILED
+                    j.error = str(e)
+                    await save_job(j)
+    except asyncio.CancelledError:
+        await _stop_job(j, claimed)
+        raise
+    finally:
+        _finish_job(j)
+
+
+def _start_job_task(job: RefinementJob, coro: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.create_task(coro)
+    background_tasks_set.add(task)
+    running_jobs[job.id] = (job, task)
+    task.add_done_callback(background_tasks_set.discard)
+    task.add_done_callback(lambda _: running_jobs.pop(job.id, None))
 
 
-def _start_background_refinement(job: RefinementJob, page: ConfluencePage) -> None:
+def _start_background_refinement(job: RefinementJob, page: PageRecord) -> None:
     """Helper function to manage task lifecycle for refinement."""
-    task = asyncio.create_task(_process_with_page(job, page))
-    background_tasks_set.add(task)
-    task.add_done_callback(background_tasks_set.discard)
+    _start_job_task(job, _process_with_page(job, page))
+
+
+async def start_refinement_job(job: RefinementJob) -> None:
+    """Schedule a single-page refinement job as a tracked background task.
 
+    Args:
+        job: The refinement job to schedule.
+    """
+    _start_job_task(job, process_refinement_job(job))
+
+
+async def requeue_pending_jobs() -> int:
+    """Schedule every pending job in the database, e.g. those released at shutdown.
+
+    Returns:
+        The number of jobs scheduled.
+    """
+    jobs = await get_jobs_by_status(RefinementStatus.PENDING)
+    scheduled = 0
+    for job in jobs:
+        if job.id in running_jobs:
+            continue
+        register_inflight_job(job)
+        _start_job_task(job, process_refinement_job(job))
+        scheduled += 1
+    if scheduled:
+        logger.info(f"Requeued {scheduled} pending refinement jobs")
+    return scheduled
+
+
+async def drain_background_tasks(timeout: float) -> None:
+    """Stop starting new jobs and wait for running background tasks.
+
+    Tasks still running after the deadline are cancelled; their jobs are
+    released back to pending so that they are picked up on the next start.
+
+    Args:
+        timeout: Seconds to wait before cancelling the remaining tasks.
+    """
+    shutdown_event.set()
+    tasks = set(background_tasks_set)
+    if not tasks:
+        return
+
+    logger.info(f"Draining {len(tasks)} background tasks (timeout {timeout}s)")
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    if pending:
+        logger.warning(f"Cancelling {len(pending)} background tasks after {timeout}s")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
+
+def _space_run_stopped(space_key: str) -> bool:
+    if space_key in cancelled_spaces or shutdown_event.is_set():
+        logger.info(f"Stopping space processing for space {space_key}")
+        return True
+    return False
+
+
+@tracing.traced("refinement.space")
 async def process_space_refinement(space_key: str):
     """Background task to process an entire Confluence space.
 
     Args:
         space_key: The space key to process.
     """
+    tracing.set_attribute("space_key", space_key)
     try:
         logger.info(f"Starting space processing for space: {space_key}")
         pages = await confluence.get_pages_from_space(space_key)
         logger.info(f"Fetched {len(pages)} pages from space {space_key}")
+        try:
+            await page_cache.store(pages)
+        except Exception as e:
+            logger.warning(f"Could not cache the pages of space {space_key}: {e}")
+        if _space_run_stopped(space_key):
+            return
 
         ingestion_tasks = [_ingest_with_sem(page) for page in pages]
         results = await asyncio.gather(*ingestion_tasks, return_exceptions=True)
@@ -135,14 +470,43 @@ async def process_space_refinement(space_key: str):
                 logger.error(f"Ingestion failed for page {pages[i].id}: {result}")
 
         logger.info(f"Completed ingestion for space {space_key}")
+        if _space_run_stopped(space_key):
+            return
 
-        jobs_to_save: list[tuple[RefinementJob, ConfluencePage]] = []
+        fingerprint = pipeline_fingerprint()
+        try:
+            completed = await find_completed_job_ids(
+                [(page.id, page.version) for page in pages], fingerprint
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not look up completed jobs for space {space_key}: {e}"
+            )
+            completed = {}
+
+        jobs_to_save: list[tuple[RefinementJob, PageRecord]] = []
         for page in pages:
+            inflight_id = get_inflight_job_id(page.id, page.version)
+            if inflight_id is not None:
+                logger.info(
+                    f"Page {page.id} already being refined by job {inflight_id}"
+                )
+                continue
+            completed_id = completed.get((page.id, page.version))
+            if completed_id is not None:
+                logger.info(
+                    f"Page {page.id} version {page.version} already refined by job {completed_id}"
+                )
+                continue
+
             job = RefinementJob(
                 id=str(uuid.uuid4()),
                 page_id=page.id,
                 status=RefinementStatus.PENDING,
                 original_text=page.body,
+                page_version=page.version,
+                pipeline_hash=fingerprint,
+                space_key=page.space_key,
             )
             jobs_to_save.append((job, page))
 
@@ -151,7 +515,10 @@ async def process_space_refinement(space_key: str):
 
         # Start tasks properly
         for job, page in jobs_to_save:
+            register_inflight_job(job)
             _start_background_refinement(job, page)
 
     except Exception:
         logger.exception(f"Error processing space {space_key}")
+    finally:
+        clear_space_cancellation(space_key)
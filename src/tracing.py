@@ -0,0 +1,172 @@
+import functools
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    ParamSpec,
+    Protocol,
+    TypeVar,
+)
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start_time: float
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=lambda: {})
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonFileExporter:
+    """Append finished spans to a file as JSON lines."""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(asdict(span), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class InMemoryExporter:
+    """Keep finished spans in memory, mainly for tests."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def close(self) -> None:
+        pass
+
+
+_exporter: Optional[SpanExporter] = None
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def set_exporter(exporter: Optional[SpanExporter]) -> None:
+    """Install the exporter for finished spans; None disables tracing.
+
+    Args:
+        exporter: The exporter to use, replacing (and closing) any previous one.
+    """
+    global _exporter
+    if _exporter is not None and _exporter is not exporter:
+        _exporter.close()
+    _exporter = exporter
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost active span in this context, if any."""
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach an attribute to the current span, if tracing is active."""
+    active = _current_span.get()
+    if active is not None:
+        active.attributes[key] = value
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Generator[Optional[Span], None, None]:
+    """Record a span around the enclosed block.
+
+    The span becomes the parent of spans opened inside the block, including
+    those in tasks and ``asyncio.to_thread`` calls started from it, since both
+    copy the current context. Nothing is recorded while no exporter is set.
+
+    Args:
+        name: The span name, e.g. ``confluence.get_page``.
+        **attributes: Initial span attributes.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        start_time=time.time(),
+        attributes=dict(attributes),
+    )
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        _current_span.reset(token)
+        try:
+            exporter.export(current)
+        except Exception as e:
+            logger.warning(f"Failed to export span {name}: {e}")
+
+
+def traced(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Coroutine[Any, Any, R]]]:
+    """Decorate an async function so that each call is recorded as a span.
+
+    Args:
+        name: The span name.
+    """
+
+    def decorator(
+        func: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Coroutine[Any, Any, R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
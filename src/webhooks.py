@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Literal, Optional
+
+from src.config import settings
+from src.metrics import WEBHOOK_EVENTS, WEBHOOK_PAGES_APPLIED
+from src.models.domain import WebhookEvent
+from src.services import confluence, page_cache, rag
+
+logger = logging.getLogger(__name__)
+
+Operation = Literal["upsert", "delete"]
+
+# Confluence webhook events and what they do to the vector index.
+EVENT_OPERATIONS: Dict[str, Operation] = {
+    "page_created": "upsert",
+    "page_updated": "upsert",
+    "page_restored": "upsert",
+    "page_removed": "delete",
+    "page_trashed": "delete",
+}
+
+
+@dataclass(slots=True)
+class _Pending:
+    operation: Operation
+    first_seen: float
+    due: float
+
+
+def operation_for(
+    event: WebhookEvent, event_type: Optional[str] = None
+) -> Optional[Operation]:
+    """Return the index operation of a webhook event, or None if it is ignored.
+
+    Args:
+        event: The webhook payload.
+        event_type: The event name from the request headers, used when the
+            payload does not carry one.
+    """
+    if event.page is None:
+        return None
+    return EVENT_OPERATIONS.get(event.event or event_type or "")
+
+
+class IngestQueue:
+    """Debounce page events and apply them to the vector index in batches.
+
+    Every event for a page restarts its debounce timer and replaces the
+    pending operation, so a burst of edits becomes a single re-ingestion of
+    the latest version. A page that keeps changing is still applied
+    ``max_delay`` seconds after its first event.
+    """
+
+    def __init__(
+        self,
+        debounce: float,
+        max_delay: float,
+        batch_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.batch_size = max(1, batch_size)
+        self._clock = clock
+        self._pending: Dict[str, _Pending] = {}
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, page_id: str, operation: Operation) -> None:
+        """Schedule an operation on a page, replacing any pending one."""
+        now = self._clock()
+        pending = self._pending.get(page_id)
+        first_seen = pending.first_seen if pending is not None else now
+        due = min(now + self.debounce, first_seen + self.max_delay)
+        self._pending[page_id] = _Pending(operation, first_seen, due)
+        WEBHOOK_EVENTS.labels(operation).inc()
+        self._changed.set()
+
+    def _take(self, now: Optional[float] = None) -> Dict[str, Operation]:
+        """Remove up to a batch of operations, only those due when ``now`` is given."""
+        page_ids: List[str] = []
+        for page_id, pending in self._pending.items():
+            if now is None or pending.due <= now:
+                page_ids.append(page_id)
+                if len(page_ids) == self.batch_size:
+                    break
+        return {page_id: self._pending.pop(page_id).operation for page_id in page_ids}
+
+    async def _apply(self, batch: Dict[str, Operation]) -> None:
+        upserts = [page_id for page_id, op in batch.items() if op == "upsert"]
+        deletes = [page_id for page_id, op in batch.items() if op == "delete"]
+        # Fetch failures are logged and skipped by get_pages
+        pages = await confluence.get_pages(upserts)
+        try:
+            await page_cache.store(pages)
+        except Exception as e:
+            logger.warning(f"Failed to cache pages from webhook events: {e}")
+        try:
+            await rag.apply_changes(pages, deletes)
+        except Exception:
+            logger.exception(
+                f"Failed to apply {len(pages)} updates and {len(deletes)} deletions to the index"
+            )
+            return
+        WEBHOOK_PAGES_APPLIED.labels("upsert").inc(len(pages))
+        WEBHOOK_PAGES_APPLIED.labels("delete").inc(len(deletes))
+        logger.info(
+            f"Applied webhook changes: {len(pages)} pages indexed, {len(deletes)} removed"
+        )
+
+    async def flush(self) -> None:
+        """Apply every pending operation now, without waiting for its timer."""
+        while batch := self._take():
+            await self._apply(batch)
+
+    async def apply_due(self) -> None:
+        """Apply the operations that are due now, a batch at a time."""
+        while batch := self._take(self._clock()):
+            await self._apply(batch)
+
+    async def run(self) -> None:
+        """Apply operations as they fall due, until cancelled."""
+        while True:
+            await self.apply_due()
+            self._changed.clear()
+            now = self._clock()
+            timeout = (
+                min(pending.due for pending in self._pending.values()) - now
+                if self._pending
+                else None
+            )
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+_queue: Optional[IngestQueue] = None
+_task: Optional[asyncio.Task[None]] = None
+
+
+def get_queue() -> IngestQueue:
+    """Return the queue of webhook operations, creating it on first use."""
+    global _queue
+    if _queue is None:
+        _queue = IngestQueue(
+            settings.WEBHOOK_DEBOUNCE_SECONDS,
+            settings.WEBHOOK_MAX_DELAY_SECONDS,
+            settings.WEBHOOK_BATCH_SIZE,
+        )
+    return _queue
+
+
+def enqueue(page_id: str, operation: Operation) -> None:
+    """Queue an index operation for a page; ``start`` applies it once due."""
+    get_queue().enqueue(page_id, operation)
+
+
+def start() -> None:
+    """Start applying queued webhook operations in the background."""
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(get_queue().run())
+
+
+async def stop() -> None:
+    """Stop the background worker and apply what is still pending."""
+    global _queue, _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+    if _queue is not None:
+        try:
+            await _queue.flush()
+        except Exception:
+            logger.exception("Failed to apply pending webhook operations")
+        _queue = None
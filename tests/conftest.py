@@ -9,6 +9,7 @@ os.environ["CONFLUENCE_USERNAME"] = "dummy-user"
 os.environ["CONFLUENCE_API_TOKEN"] = "dummy-token"
 os.environ["CHROMA_DB_PATH"] = "./test_chroma_db"
 os.environ["DB_PATH"] = ":memory:"
+os.environ["PAGE_CACHE_PATH"] = ""
 
 
 @pytest.fixture(scope="session", autouse=True)
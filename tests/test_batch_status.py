@@ -0,0 +1,80 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config
+from src.database import close_db, init_db, save_job_sync
+from src.main import app
+from src.models.domain import RefinementJob, RefinementStatus
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+    for job_id in ("a", "b"):
+        save_job_sync(
+            RefinementJob(
+                id=job_id,
+                page_id=f"page-{job_id}",
+                status=RefinementStatus.PENDING,
+                original_text="Body",
+            )
+        )
+    yield
+    close_db()
+
+
+def test_batch_status_returns_compact_jobs_and_missing_ids():
+    response = client.post(
+        "/status/batch", json={"job_ids": ["b", "a", "nope"]}, headers=HEADERS
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["jobs"]) == ["b", "a"]
+    assert body["jobs"]["a"]["status"] == "pending"
+    assert "original_text" not in body["jobs"]["a"]
+    assert body["missing"] == ["nope"]
+
+
+def test_batch_status_includes_text_on_request():
+    response = client.post(
+        "/status/batch",
+        json={"job_ids": ["a"], "include_text": True},
+        headers=HEADERS,
+    )
+
+    assert response.json()["jobs"]["a"]["original_text"] == "Body"
+
+
+def test_batch_status_etag_returns_not_modified_until_a_job_changes():
+    first = client.post("/status/batch", json={"job_ids": ["a", "b"]}, headers=HEADERS)
+    etag = first.headers["ETag"]
+
+    cached = client.post(
+        "/status/batch",
+        json={"job_ids": ["a", "b"]},
+        headers={**HEADERS, "If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+
+    save_job_sync(
+        RefinementJob(id="a", page_id="page-a", status=RefinementStatus.FAILED)
+    )
+    changed = client.post(
+        "/status/batch",
+        json={"job_ids": ["a", "b"]},
+        headers={**HEADERS, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.json()["jobs"]["a"]["status"] == "failed"
+
+
+def test_batch_status_validates_ids():
+    response = client.post("/status/batch", json={"job_ids": []}, headers=HEADERS)
+    assert response.status_code == 422
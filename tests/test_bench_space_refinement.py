@@ -0,0 +1,35 @@
+import json
+import subprocess
+import sys
+
+
+def test_benchmark_reports_each_size(tmp_path):
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_space_refinement",
+            "--sizes",
+            "3",
+            "--body-size",
+            "500",
+            "--ttft",
+            "0",
+            "--token-latency",
+            "0",
+            "--output",
+            str(output),
+        ],
+        check=True,
+        capture_output=True,
+        timeout=300,
+    )
+
+    (result,) = json.loads(output.read_text())["results"]
+    assert result["pages"] == 3
+    assert result["jobs"] == {"completed": 3}
+    assert set(result["pages_per_sec"]) == {"space_refinement", "webhook_ingest"}
+    assert result["job_latency_ms"]["count"] == 3
+    assert result["embedding_batches"] > 0
+    assert result["sqlite_writes_total"] > 0
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+
+from src import config
+from src.database import close_db, get_job_sync, init_db, save_job_sync
+from src.models.domain import RefinementJob, RefinementStatus
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "test_jobs.db")
+    config.settings.DB_PATH = path
+    yield path
+    close_db()
+
+
+def _count(path: str, sql: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(sql).fetchone()[0]
+
+
+def test_texts_are_stored_once_and_compressed(db_path):
+    init_db()
+    body = "<p>Some page body</p>" * 500
+    for job_id in ("a", "b"):
+        save_job_sync(
+            RefinementJob(
+                id=job_id,
+                page_id="page1",
+                status=RefinementStatus.COMPLETED,
+                original_text=body,
+                refined_text=body.upper(),
+            )
+        )
+    close_db()
+
+    assert _count(db_path, "SELECT COUNT(*) FROM blobs") == 2
+    assert _count(db_path, "SELECT MAX(LENGTH(data)) FROM blobs") < len(body) // 10
+    assert _count(db_path, "SELECT COUNT(original_text) FROM jobs") == 0
+
+    saved = get_job_sync("b")
+    assert saved is not None
+    assert saved.original_text == body
+    assert saved.refined_text == body.upper()
+
+
+def test_init_db_moves_inline_texts_to_blobs(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE jobs (
+                id TEXT PRIMARY KEY,
+                page_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                original_text TEXT,
+                refined_text TEXT
+            )
+            """)
+        conn.execute(
+            "INSERT INTO jobs VALUES ('old', 'page1', 'completed', NULL, 'Body', NULL)"
+        )
+
+    init_db()
+
+    saved = get_job_sync("old")
+    assert saved is not None
+    assert saved.original_text == "Body"
+    assert saved.refined_text is None
+    close_db()
+    assert _count(db_path, "SELECT COUNT(original_text) FROM jobs") == 0
@@ -0,0 +1,198 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config, events
+from src.database import (
+    cancel_pending_jobs,
+    claim_job_sync,
+    get_job_sync,
+    init_db,
+    save_job_sync,
+)
+from src.deps import background_tasks_set, cancelled_spaces, shutdown_event
+from src.main import app
+from src.models.domain import ConfluencePage, RefinementJob, RefinementStatus
+from src.tasks import (
+    drain_background_tasks,
+    process_refinement_job,
+    process_space_refinement,
+    request_job_cancellation,
+    requeue_pending_jobs,
+    start_refinement_job,
+)
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+    yield
+    shutdown_event.clear()
+    cancelled_spaces.clear()
+
+
+async def _hang(job: RefinementJob, page: ConfluencePage) -> None:
+    await asyncio.sleep(3600)
+
+
+def _page() -> ConfluencePage:
+    return ConfluencePage(
+        id="page1", title="T", space_key="SPACE", body="Body", version=4
+    )
+
+
+def test_cancel_job_not_found():
+    response = client.post("/cancel/missing", headers=HEADERS)
+    assert response.status_code == 404
+
+
+def test_cancel_job_already_finished():
+    save_job_sync(
+        RefinementJob(id="done", page_id="page1", status=RefinementStatus.COMPLETED)
+    )
+    response = client.post("/cancel/done", headers=HEADERS)
+    assert response.status_code == 409
+
+
+def test_cancel_pending_job_marks_cancelled():
+    save_job_sync(
+        RefinementJob(id="queued", page_id="page1", status=RefinementStatus.PENDING)
+    )
+    response = client.post("/cancel/queued", headers=HEADERS)
+    assert response.status_code == 202
+
+    job = get_job_sync("queued")
+    assert job is not None
+    assert job.status == RefinementStatus.CANCELLED
+
+
+def test_cancel_job_running_in_another_worker_conflicts():
+    save_job_sync(
+        RefinementJob(id="elsewhere", page_id="page1", status=RefinementStatus.PENDING)
+    )
+    assert claim_job_sync("elsewhere")
+
+    response = client.post("/cancel/elsewhere", headers=HEADERS)
+    assert response.status_code == 409
+
+    job = get_job_sync("elsewhere")
+    assert job is not None
+    assert job.status == RefinementStatus.PROCESSING
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_jobs_publishes_status_events():
+    save_job_sync(
+        RefinementJob(
+            id="queued", page_id="page1", status=RefinementStatus.PENDING, space_key="S"
+        )
+    )
+
+    with events.subscribe(space_key="S") as subscription:
+        assert await cancel_pending_jobs(space_key="S") == 1
+        event = subscription.queue.get_nowait()
+
+    assert (event.job_id, event.status) == ("queued", RefinementStatus.CANCELLED)
+
+
+def test_cancel_space_marks_pending_jobs_cancelled():
+    for job_id, space_key in (("a", "SPACE"), ("b", "SPACE"), ("c", "OTHER")):
+        save_job_sync(
+            RefinementJob(
+                id=job_id,
+                page_id=job_id,
+                status=RefinementStatus.PENDING,
+                space_key=space_key,
+            )
+        )
+
+    response = client.post("/cancel/space/SPACE", headers=HEADERS)
+    assert response.status_code == 202
+    assert response.json()["pending_jobs_cancelled"] == 2
+    assert get_job_sync("c").status == RefinementStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_space_run_clears_the_cancellation_it_applied():
+    cancelled_spaces.add("SPACE")
+
+    with (
+        patch(
+            "src.services.confluence.get_pages_from_space", new_callable=AsyncMock
+        ) as m_pages,
+        patch("src.services.rag.ingest_page", new_callable=AsyncMock) as m_ingest,
+    ):
+        m_pages.return_value = [_page()]
+        await process_space_refinement("SPACE")
+
+    assert not m_ingest.called
+    assert "SPACE" not in cancelled_spaces
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_skips_cancelled_job():
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    save_job_sync(job.model_copy(update={"status": RefinementStatus.CANCELLED}))
+
+    with patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get:
+        await process_refinement_job(job)
+
+    assert not m_get.called
+
+
+@pytest.mark.asyncio
+async def test_request_job_cancellation_interrupts_running_job():
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    save_job_sync(job)
+
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.tasks._perform_refinement", side_effect=_hang),
+    ):
+        m_get.return_value = _page()
+        await start_refinement_job(job)
+        await asyncio.sleep(0.05)
+
+        assert request_job_cancellation("job1")
+        await asyncio.gather(*list(background_tasks_set), return_exceptions=True)
+
+    saved = get_job_sync("job1")
+    assert saved is not None
+    assert saved.status == RefinementStatus.CANCELLED
+    assert not request_job_cancellation("job1")
+
+
+@pytest.mark.asyncio
+async def test_drain_releases_unfinished_jobs_and_requeue_picks_them_up():
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    save_job_sync(job)
+
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.tasks._perform_refinement", side_effect=_hang),
+    ):
+        m_get.return_value = _page()
+        await start_refinement_job(job)
+        await asyncio.sleep(0.05)
+        await drain_background_tasks(timeout=0.05)
+
+    saved = get_job_sync("job1")
+    assert saved is not None
+    assert saved.status == RefinementStatus.PENDING
+    assert saved.original_text == "Body"
+    assert saved.page_version == 4
+
+    shutdown_event.clear()
+    with patch("src.tasks.process_refinement_job", new_callable=AsyncMock) as m_process:
+        assert await requeue_pending_jobs() == 1
+        await asyncio.gather(*list(background_tasks_set), return_exceptions=True)
+
+    assert m_process.await_args[0][0].id == "job1"
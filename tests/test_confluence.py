@@ -3,7 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 import pytest
 
-from src.models.domain import ConfluencePage
+from src.models.domain import PageRecord
 from src.services import confluence
 
 
@@ -28,7 +28,7 @@ async def test_get_page_success():
     with patch("src.services.confluence._get_client", return_value=mock_client):
         page = await confluence.get_page("12345")
 
-        assert isinstance(page, ConfluencePage)
+        assert isinstance(page, PageRecord)
         assert page.id == "12345"
         assert page.title == "Test Page"
         assert page.space_key == "TEST"
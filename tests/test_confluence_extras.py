@@ -1,7 +1,12 @@
+import asyncio
+import json
+import sys
+
 import httpx
 import pytest
 
 from src.config import settings
+from src.models.domain import ConfluencePage, PageRecord
 from src.services import confluence
 
 
@@ -74,9 +79,141 @@ async def test_get_pages_from_space_with_limit(respx_mock):
 async def test_update_page(respx_mock):
     confluence._client = None
 
-    respx_mock.put(f"{settings.CONFLUENCE_URL}/wiki/api/v2/pages/123").mock(
+    route = respx_mock.put(f"{settings.CONFLUENCE_URL}/wiki/api/v2/pages/123").mock(
         return_value=httpx.Response(200, json={"success": True})
     )
 
     response = await confluence.update_page("123", "Title", "Body", 2)
     assert response == {"success": True}
+    assert json.loads(route.calls.last.request.content)["version"] == {"number": 2}
+
+
+@pytest.mark.asyncio
+async def test_update_page_sends_version_message(respx_mock):
+    confluence._client = None
+    route = respx_mock.put(f"{settings.CONFLUENCE_URL}/wiki/api/v2/pages/123").mock(
+        return_value=httpx.Response(200, json={"success": True})
+    )
+
+    await confluence.update_page("123", "Title", "Body", 2, message="1 changed")
+
+    version = json.loads(route.calls.last.request.content)["version"]
+    assert version == {"number": 2, "message": "1 changed"}
+
+
+def test_parse_page_defaults_missing_fields():
+    page = confluence._parse_page({"id": 7, "title": "T"}, "S")
+
+    assert page == PageRecord(id="7", title="T", space_key="S", body="")
+    assert not hasattr(page, "__dict__")
+
+
+def test_page_record_to_model():
+    item = {
+        "id": "1",
+        "title": "T",
+        "body": {"storage": {"value": "<p>x</p>"}},
+        "version": {"number": 4},
+        "_links": {"webui": "/pages/1"},
+    }
+
+    model = confluence._parse_page(item, "S").to_model()
+
+    assert isinstance(model, ConfluencePage)
+    assert model.body == "<p>x</p>"
+    assert model.version == 4
+    assert model.url == f"{settings.CONFLUENCE_URL}/pages/1"
+
+
+def test_parse_listing_returns_pages_and_next_link():
+    content = json.dumps(
+        {
+            "results": [
+                {
+                    "id": "1",
+                    "title": "A",
+                    "body": {"storage": {"value": "x"}, "_expandable": {"view": ""}},
+                    "_expandable": {"children": "/rest/api/content/1/child"},
+                }
+            ],
+            "_links": {"next": "/rest/api/content?start=25"},
+        }
+    ).encode()
+
+    listing = confluence._parse_listing(content, "S")
+
+    assert listing.pages == [PageRecord(id="1", title="A", space_key="S", body="x")]
+    assert listing.next_link == "/rest/api/content?start=25"
+    empty = confluence._parse_listing(b'{"results": []}', "S")
+    assert (empty.pages, empty.next_link, empty.total) == ([], None, None)
+
+
+@pytest.mark.asyncio
+async def test_get_pages_from_space_follows_next_link(respx_mock):
+    base = f"{settings.CONFLUENCE_URL}/wiki/rest/api/content"
+    respx_mock.get(f"{base}?spaceKey=TEST&expand=body.storage,version&limit=50").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "results": [{"id": "1", "title": "A"}],
+                "_links": {"next": "/rest/api/content?spaceKey=TEST&start=1"},
+            },
+        )
+    )
+    respx_mock.get(f"{base}?spaceKey=TEST&start=1").mock(
+        return_value=httpx.Response(200, json={"results": [{"id": "2", "title": "B"}]})
+    )
+    confluence._client = None
+
+    pages = await confluence.get_pages_from_space("TEST")
+
+    assert [page.id for page in pages] == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_lazy_client_is_shared_until_closed():
+    confluence._client = None
+
+    client = confluence._get_client()
+
+    assert confluence._get_client() is client
+    await confluence.close_client()
+    assert client.is_closed
+    assert confluence._client is None
+
+
+def test_lazy_client_is_recreated_for_a_new_event_loop():
+    confluence._client = None
+
+    async def get_client():
+        return confluence._get_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert first is not second
+    asyncio.run(confluence.close_client())
+
+
+def test_transport_uses_configured_pool_limits(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_MAX_CONNECTIONS", 7)
+    monkeypatch.setattr(settings, "CONFLUENCE_MAX_KEEPALIVE_CONNECTIONS", 3)
+    monkeypatch.setattr(settings, "CONFLUENCE_KEEPALIVE_EXPIRY", 12.0)
+    monkeypatch.setattr(settings, "CONFLUENCE_HTTP2", True)
+
+    pool = confluence._build_transport()._pool
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 12.0
+    assert pool._http2
+
+
+def test_transport_falls_back_to_http1_without_h2(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "CONFLUENCE_HTTP2", True)
+    monkeypatch.setitem(sys.modules, "h2", None)
+
+    pool = confluence._build_transport()._pool
+
+    assert not pool._http2
+    assert "h2 package is not installed" in caplog.text
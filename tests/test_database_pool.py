@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src import config, database
+from src.database import (
+    close_db,
+    get_job_sync,
+    init_db,
+    save_job,
+    save_job_sync,
+    save_jobs_bulk_sync,
+)
+from src.models.domain import RefinementJob, RefinementStatus
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+    yield
+    close_db()
+
+
+def _job(job_id: str, page_id: str = "page") -> RefinementJob:
+    return RefinementJob(id=job_id, page_id=page_id, status=RefinementStatus.PENDING)
+
+
+def test_queued_writes_are_group_committed():
+    manager = database._get_manager()
+    gate = threading.Event()
+    blocker = manager.submit(lambda _, conn: gate.wait(5))
+    futures = [manager.submit_job(_job(f"job{i}")) for i in range(20)]
+    commits: list[int] = []
+    manager._writer.set_trace_callback(
+        lambda sql: commits.append(1) if sql == "COMMIT" else None
+    )
+
+    gate.set()
+    blocker.result()
+    for future in futures:
+        future.result()
+
+    # The blocked commit plus at most one more for everything queued behind it.
+    assert len(commits) <= 2
+    assert all(get_job_sync(f"job{i}") is not None for i in range(20))
+
+
+def test_failed_write_does_not_roll_back_its_batch():
+    manager = database._get_manager()
+    gate = threading.Event()
+    manager.submit(lambda _, conn: gate.wait(5))
+    good = manager.submit_job(_job("good"))
+    bad = manager.submit(lambda _, conn: conn.execute("INSERT INTO missing VALUES (1)"))
+    gate.set()
+
+    good.result()
+    with pytest.raises(sqlite3.OperationalError):
+        bad.result()
+    assert get_job_sync("good") is not None
+
+
+def test_readers_are_read_only():
+    manager = database._get_manager()
+    with manager.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM jobs")
+
+
+def test_switching_db_path_reopens_connections(tmp_path):
+    save_job_sync(_job("first"))
+    config.settings.DB_PATH = str(tmp_path / "other.db")
+    init_db()
+
+    assert get_job_sync("first") is None
+    save_jobs_bulk_sync([_job("a"), _job("b")])
+    assert get_job_sync("b") is not None
+
+
+@pytest.mark.asyncio
+async def test_async_save_job_validates_and_writes():
+    await save_job(_job("async-job"))
+    assert get_job_sync("async-job") is not None
+
+    with pytest.raises(ValueError, match="Job id is required"):
+        await save_job(_job(""))
+
+
+def _traced_statements(manager) -> list[str]:
+    statements: list[str] = []
+    manager._writer.set_trace_callback(statements.append)
+    return statements
+
+
+def test_processing_saves_are_written_behind(monkeypatch):
+    monkeypatch.setattr(config.settings, "DB_WRITE_BEHIND_SECONDS", 60.0)
+    config.settings.DB_PATH = config.settings.DB_PATH + ".behind"
+    init_db()
+    job = _job("job1")
+    save_job_sync(job)
+
+    job.status = RefinementStatus.PROCESSING
+    job.original_text = "Body " * 1000
+    save_job_sync(job)
+    saved = get_job_sync("job1")
+    assert saved is not None and saved.original_text is None
+
+    manager = database._get_manager()
+    statements = _traced_statements(manager)
+    job.status = RefinementStatus.COMPLETED
+    job.refined_text = "Refined"
+    save_job_sync(job)
+
+    saved = get_job_sync("job1")
+    assert saved is not None
+    assert saved.status == RefinementStatus.COMPLETED
+    assert saved.original_text == job.original_text
+    updates = [sql for sql in statements if sql.startswith("UPDATE jobs")]
+    assert len(updates) == 1
+    assert "page_id" not in updates[0] and "page_version" not in updates[0]
+    assert manager._committed == {} and manager._latest == {}
+
+
+def test_unchanged_save_writes_nothing():
+    job = _job("job1")
+    save_job_sync(job)
+    statements = _traced_statements(database._get_manager())
+
+    save_job_sync(job)
+
+    assert not [sql for sql in statements if "jobs" in sql]
+
+
+def test_close_flushes_held_back_saves(monkeypatch):
+    monkeypatch.setattr(config.settings, "DB_WRITE_BEHIND_SECONDS", 60.0)
+    config.settings.DB_PATH = config.settings.DB_PATH + ".behind"
+    init_db()
+    job = _job("job1")
+    job.status = RefinementStatus.PROCESSING
+    save_job_sync(job)
+
+    close_db()
+
+    saved = get_job_sync("job1")
+    assert saved is not None and saved.status == RefinementStatus.PROCESSING
@@ -0,0 +1,281 @@
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.stub_confluence import StubConfig, StubConfluence
+from src import config
+from src.agents import writer
+from src.database import (
+    get_job_sync,
+    get_jobs_by_status_sync,
+    init_db,
+    save_job_sync,
+)
+from src.deps import inflight_jobs
+from src.main import app
+from src.models.domain import ConfluencePage, RefinementJob, RefinementStatus
+from src.services import confluence
+from src.tasks import (
+    _prompts_digest,
+    pipeline_fingerprint,
+    process_refinement_job,
+    process_space_refinement,
+    register_inflight_job,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+    inflight_jobs.clear()
+    yield
+    inflight_jobs.clear()
+
+
+@pytest.fixture
+def page_version():
+    with patch(
+        "src.services.confluence.get_page_version", new_callable=AsyncMock
+    ) as m_version:
+        m_version.return_value = 4
+        yield m_version
+
+
+def test_refine_page_returns_inflight_job_id(page_version):
+    with patch("src.routes.BackgroundTasks.add_task") as mock_add_task:
+        first = client.post("/refine/dup-page", headers={"X-API-Key": "dummy-api-key"})
+        second = client.post("/refine/dup-page", headers={"X-API-Key": "dummy-api-key"})
+
+    assert first.status_code == 202
+    assert second.status_code == 202
+    assert second.json()["job_id"] == first.json()["job_id"]
+    assert second.json()["message"] == "Refinement job already in progress"
+    assert mock_add_task.call_count == 1
+    assert inflight_jobs == {
+        ("dup-page", 4, pipeline_fingerprint()): first.json()["job_id"]
+    }
+
+
+def test_refine_page_starts_a_new_job_for_a_new_version(page_version):
+    with patch("src.routes.BackgroundTasks.add_task") as mock_add_task:
+        first = client.post("/refine/dup-page", headers={"X-API-Key": "dummy-api-key"})
+        page_version.return_value = 5
+        second = client.post("/refine/dup-page", headers={"X-API-Key": "dummy-api-key"})
+
+    assert second.json()["job_id"] != first.json()["job_id"]
+    assert second.json()["message"] == "Refinement job accepted"
+    assert mock_add_task.call_count == 2
+
+
+def test_refine_page_returns_completed_job_id(page_version):
+    save_job_sync(
+        RefinementJob(
+            id="done-job",
+            page_id="done-page",
+            status=RefinementStatus.COMPLETED,
+            refined_text="Refined",
+            page_version=4,
+            pipeline_hash=pipeline_fingerprint(),
+        )
+    )
+
+    with patch("src.routes.BackgroundTasks.add_task") as mock_add_task:
+        response = client.post(
+            "/refine/done-page", headers={"X-API-Key": "dummy-api-key"}
+        )
+
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "done-job"
+    assert response.json()["message"] == "Page version already refined"
+    assert not mock_add_task.called
+    assert get_jobs_by_status_sync(RefinementStatus.PENDING) == []
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_reuses_completed_result():
+    fingerprint = pipeline_fingerprint()
+    save_job_sync(
+        RefinementJob(
+            id="old-job",
+            page_id="page1",
+            status=RefinementStatus.COMPLETED,
+            refined_text="Refined",
+            page_version=3,
+            pipeline_hash=fingerprint,
+        )
+    )
+    job = RefinementJob(
+        id="new-job", page_id="page1", status=RefinementStatus.PENDING, page_version=3
+    )
+    register_inflight_job(job)
+    page = ConfluencePage(id="page1", title="T", space_key="S", body="Text", version=3)
+
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.tasks._perform_refinement", new_callable=AsyncMock) as m_perform,
+    ):
+        m_get.return_value = page
+        await process_refinement_job(job)
+
+    assert not m_perform.called
+    saved = get_job_sync("new-job")
+    assert saved is not None
+    assert saved.status == RefinementStatus.COMPLETED
+    assert saved.refined_text == "Refined"
+    assert inflight_jobs == {}
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_ignores_other_versions():
+    save_job_sync(
+        RefinementJob(
+            id="old-job",
+            page_id="page1",
+            status=RefinementStatus.COMPLETED,
+            refined_text="Refined",
+            page_version=2,
+            pipeline_hash=pipeline_fingerprint(),
+        )
+    )
+    job = RefinementJob(id="new-job", page_id="page1", status=RefinementStatus.PENDING)
+    page = ConfluencePage(id="page1", title="T", space_key="S", body="Text", version=3)
+
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.tasks._perform_refinement", new_callable=AsyncMock) as m_perform,
+    ):
+        m_get.return_value = page
+        await process_refinement_job(job)
+
+    assert m_perform.called
+    assert job.page_version == 3
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_needs_a_known_version_to_reuse():
+    save_job_sync(
+        RefinementJob(
+            id="old-job",
+            page_id="page1",
+            status=RefinementStatus.COMPLETED,
+            refined_text="Refined",
+            page_version=3,
+            pipeline_hash=pipeline_fingerprint(),
+        )
+    )
+    job = RefinementJob(id="new-job", page_id="page1", status=RefinementStatus.PENDING)
+    page = ConfluencePage(id="page1", title="T", space_key="S", body="Text", version=3)
+
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.tasks._perform_refinement", new_callable=AsyncMock) as m_perform,
+    ):
+        m_get.return_value = page
+        await process_refinement_job(job)
+
+    assert m_perform.called
+    assert job.page_version == 3
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_fetches_the_current_version():
+    stub = StubConfluence(StubConfig(spaces={"S": 1}))
+    confluence._client = httpx.AsyncClient(
+        base_url="https://stub.local", transport=httpx.ASGITransport(app=stub.app)
+    )
+    try:
+        page_id = (await confluence.list_space_pages("S"))[0].id
+        await confluence.update_page(page_id, "New", "<p>New</p>", 2)
+        save_job_sync(
+            RefinementJob(
+                id="old-job",
+                page_id=page_id,
+                status=RefinementStatus.COMPLETED,
+                refined_text="Refined",
+                page_version=1,
+                pipeline_hash=pipeline_fingerprint(),
+            )
+        )
+        job = RefinementJob(
+            id="new-job",
+            page_id=page_id,
+            status=RefinementStatus.PENDING,
+            page_version=await confluence.get_page_version(page_id),
+        )
+
+        with patch(
+            "src.tasks._perform_refinement", new_callable=AsyncMock
+        ) as m_perform:
+            await process_refinement_job(job)
+    finally:
+        await confluence._client.aclose()
+        confluence._client = None
+
+    assert m_perform.called
+    assert m_perform.call_args[0][1].version == 2
+    assert job.page_version == 2
+
+
+@pytest.mark.asyncio
+async def test_process_space_refinement_skips_duplicates():
+    fingerprint = pipeline_fingerprint()
+    save_job_sync(
+        RefinementJob(
+            id="done-job",
+            page_id="done",
+            status=RefinementStatus.COMPLETED,
+            refined_text="Refined",
+            page_version=1,
+            pipeline_hash=fingerprint,
+        )
+    )
+    register_inflight_job(
+        RefinementJob(
+            id="running-job",
+            page_id="running",
+            status=RefinementStatus.PENDING,
+            page_version=1,
+        )
+    )
+    pages = [
+        ConfluencePage(id="done", title="A", space_key="S", body="a"),
+        ConfluencePage(id="running", title="B", space_key="S", body="b"),
+        ConfluencePage(id="fresh", title="C", space_key="S", body="c"),
+    ]
+
+    with (
+        patch(
+            "src.services.confluence.get_pages_from_space", new_callable=AsyncMock
+        ) as m_pages,
+        patch("src.services.rag.ingest_page", new_callable=AsyncMock),
+        patch("src.tasks.save_jobs_bulk", new_callable=AsyncMock) as m_bulk,
+        patch("src.tasks._start_background_refinement") as m_start,
+    ):
+        m_pages.return_value = pages
+        await process_space_refinement("S")
+
+    saved_jobs = m_bulk.call_args[0][0]
+    assert [job.page_id for job in saved_jobs] == ["fresh"]
+    assert m_start.call_count == 1
+    assert inflight_jobs[("fresh", 1, fingerprint)] == saved_jobs[0].id
+
+
+def test_pipeline_fingerprint_covers_the_prompts():
+    before = pipeline_fingerprint()
+    original = writer.SYSTEM_PROMPT
+    writer.SYSTEM_PROMPT = original + " Keep it short."
+    _prompts_digest.cache_clear()
+    try:
+        changed = pipeline_fingerprint()
+    finally:
+        writer.SYSTEM_PROMPT = original
+        _prompts_digest.cache_clear()
+
+    assert changed != before
+    assert pipeline_fingerprint() == before
@@ -0,0 +1,141 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config, events
+from src.database import close_db, init_db, save_job, save_job_sync
+from src.main import app
+from src.models.domain import (
+    AnalysisResult,
+    ConfluencePage,
+    JobEvent,
+    RefinementJob,
+    RefinementStatus,
+)
+from src.routes import _event_stream
+from src.tasks import process_refinement_job
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+    yield
+    close_db()
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+@pytest.mark.asyncio
+async def test_save_job_publishes_to_matching_subscribers():
+    job = RefinementJob(
+        id="job1", page_id="page1", space_key="S", status=RefinementStatus.PENDING
+    )
+    with (
+        events.subscribe(job_id="job1") as by_job,
+        events.subscribe(space_key="S") as by_space,
+        events.subscribe(space_key="OTHER") as other,
+    ):
+        await save_job(job)
+
+    assert [e.status for e in _drain(by_job.queue)] == [RefinementStatus.PENDING]
+    assert len(_drain(by_space.queue)) == 1
+    assert other.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_publishes_stages_and_transitions():
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    save_job_sync(job)
+    page = ConfluencePage(id="page1", title="T", space_key="S", body="Text")
+
+    with (
+        events.subscribe(job_id="job1") as subscription,
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.services.rag.query_context", new_callable=AsyncMock) as m_query,
+        patch("src.agents.analyst.analyze_content", new_callable=AsyncMock) as m_an,
+    ):
+        m_get.return_value = page
+        m_query.return_value = []
+        m_an.return_value = AnalysisResult(critiques=[])
+        await process_refinement_job(job)
+
+    received = [(e.type, e.stage or e.status.value) for e in _drain(subscription.queue)]
+    assert received == [
+        ("stage", "fetch"),
+        ("status", "processing"),
+        ("stage", "rag_context"),
+        ("stage", "analyst"),
+        ("status", "completed"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_job_event_stream_starts_with_snapshot_and_ends_when_finished():
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    save_job_sync(job)
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+
+    stream = _event_stream(request, job_id="job1")
+    first = await anext(stream)
+    assert first.startswith("event: status\n")
+    assert '"status":"pending"' in first
+
+    job.status = RefinementStatus.COMPLETED
+    events.publish_job(job)
+    last = await anext(stream)
+    assert '"status":"completed"' in last
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+
+
+def test_job_events_endpoint_for_finished_job():
+    save_job_sync(
+        RefinementJob(id="done", page_id="page1", status=RefinementStatus.FAILED)
+    )
+
+    with client.stream("GET", "/events/jobs/done", headers=HEADERS) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    assert body.startswith("event: status\ndata: ")
+    assert '"status":"failed"' in body
+
+
+def test_job_events_endpoint_unknown_job():
+    response = client.get("/events/jobs/missing", headers=HEADERS)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_redis_messages_from_other_workers_are_dispatched():
+    event = JobEvent(
+        type="status",
+        job_id="job1",
+        page_id="page1",
+        status=RefinementStatus.PROCESSING,
+        timestamp=0.0,
+    )
+    with events.subscribe(job_id="job1") as subscription:
+        own = {"origin": events._WORKER_ID, "event": event.model_dump()}
+        events._on_redis_message({"type": "message", "data": json.dumps(own)})
+        assert subscription.queue.empty()
+
+        remote = {"origin": "other-worker", "event": event.model_dump(mode="json")}
+        events._on_redis_message({"type": "message", "data": json.dumps(remote)})
+        assert subscription.queue.get_nowait() == event
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from benchmarks.fake_llm import FakeLLM, FakeLLMConfig, install
+from src import job_metrics
+from src.agents import analyst, common, reviewer, writer
+from src.models.domain import JobMetrics, RefinementStatus
+
+
+@pytest.fixture
+def fake_llm():
+    def install_fake(**config) -> FakeLLM:
+        fake = FakeLLM(FakeLLMConfig(**config))
+        install(fake)
+        return fake
+
+    yield install_fake
+    common.set_client(None)
+
+
+@pytest.mark.asyncio
+async def test_agents_parse_the_fake_outputs(fake_llm):
+    fake_llm()
+    original = "<p>Restart the worker with the deploy script.</p>"
+
+    analysis = await analyst.analyze_content(original, ["context"])
+    rewritten = await writer.rewrite_content(original, analysis, ["context"])
+    review = await reviewer.review_content(original, rewritten, analysis)
+
+    assert 1 <= len(analysis.critiques) <= 3
+    assert rewritten.startswith(original)
+    assert review.status == RefinementStatus.COMPLETED
+    # Same prompt, same answer
+    assert await analyst.analyze_content(original, ["context"]) == analysis
+
+
+@pytest.mark.asyncio
+async def test_latency_follows_completion_tokens(fake_llm):
+    fake = fake_llm(ttft=0.05, token_latency=0.002)
+    metrics = JobMetrics()
+
+    start = time.monotonic()
+    with job_metrics.recording(metrics):
+        response = await common.generate_response("x" * 400, "You are a Writer Agent.")
+    elapsed = time.monotonic() - start
+
+    completion_tokens = len(response) // 4
+    assert elapsed >= 0.05 + (completion_tokens - 1) * 0.002
+    assert (
+        metrics.completion_tokens == completion_tokens == fake.stats.completion_tokens
+    )
+    assert metrics.prompt_tokens == fake.stats.prompt_tokens > 100
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_errors_are_retried_by_the_client(fake_llm):
+    fake = fake_llm(error_rate=0.5, retry_after=0.01, seed=3)
+
+    for _ in range(5):
+        assert await common.generate_response("p", "s") == "OK"
+
+    assert fake.stats.rate_limited > 0
+    assert fake.stats.requests == 5 + fake.stats.rate_limited
+
+
+@pytest.mark.asyncio
+async def test_streamed_completions(fake_llm):
+    fake_llm(ttft=0.01)
+    client = common._get_client()
+    assert client is not None
+
+    stream = await client.chat.completions.create(
+        model="fake",
+        messages=[{"role": "system", "content": "s"}, {"role": "user", "content": "p"}],
+        stream=True,
+    )
+    text = "".join([chunk.choices[0].delta.content or "" async for chunk in stream])
+
+    assert text == "OK"
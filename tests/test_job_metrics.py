@@ -0,0 +1,116 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config, job_metrics
+from src.agents import common
+from src.database import get_job_sync, init_db, save_job_sync
+from src.main import app
+from src.models.domain import (
+    AnalysisResult,
+    ConfluencePage,
+    JobMetrics,
+    RefinementJob,
+    RefinementStatus,
+)
+from src.tasks import process_refinement_job
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+
+
+def test_stage_without_recording_is_noop():
+    with job_metrics.stage("fetch"):
+        job_metrics.record_tokens(10, 5)
+        job_metrics.record_cache_hit()
+    assert job_metrics.current_metrics() is None
+
+
+def test_stage_accumulates_into_bound_metrics():
+    metrics = JobMetrics()
+    with job_metrics.recording(metrics):
+        with job_metrics.stage("analyst"):
+            job_metrics.record_tokens(10, 5)
+        with job_metrics.stage("analyst"):
+            job_metrics.record_tokens(1, 2)
+        job_metrics.record_cache_hit()
+
+    assert "analyst" in metrics.stage_ms
+    assert metrics.prompt_tokens == 11
+    assert metrics.completion_tokens == 7
+    assert metrics.cache_hits == 1
+
+
+def test_summarize_stages_percentiles():
+    metrics = [
+        JobMetrics(queue_wait_ms=float(i), stage_ms={"fetch": float(i * 10)})
+        for i in range(1, 101)
+    ]
+    summary = job_metrics.summarize_stages(metrics)
+
+    assert summary["fetch"].count == 100
+    assert summary["fetch"].p50_ms == 500.0
+    assert summary["fetch"].p95_ms == 950.0
+    assert summary["fetch"].p99_ms == 990.0
+    assert summary["fetch"].max_ms == 1000.0
+    assert summary["queue_wait"].p50_ms == 50.0
+
+
+@pytest.mark.asyncio
+async def test_generate_response_records_token_usage():
+    response = MagicMock()
+    response.choices[0].message.content = "ok"
+    response.usage.prompt_tokens = 120
+    response.usage.completion_tokens = 30
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=response)
+
+    metrics = JobMetrics()
+    with patch("src.agents.common._get_client", return_value=mock_client):
+        with job_metrics.recording(metrics):
+            assert await common.generate_response("prompt", "system") == "ok"
+
+    assert metrics.prompt_tokens == 120
+    assert metrics.completion_tokens == 30
+
+
+@pytest.mark.asyncio
+async def test_process_refinement_job_persists_stage_timings():
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    save_job_sync(job)
+    page = ConfluencePage(id="page1", title="T", space_key="S", body="Text")
+
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as m_get,
+        patch("src.services.rag.query_context", new_callable=AsyncMock) as m_query,
+        patch("src.agents.analyst.analyze_content", new_callable=AsyncMock) as m_an,
+    ):
+        m_get.return_value = page
+        m_query.return_value = []
+        m_an.return_value = AnalysisResult(critiques=[])
+        await process_refinement_job(job)
+
+    saved = get_job_sync("job1")
+    assert saved is not None and saved.metrics is not None
+    assert saved.metrics.queue_wait_ms is not None
+    assert set(saved.metrics.stage_ms) == {"fetch", "rag_context", "analyst"}
+
+    response = client.get("/status/job1", headers=HEADERS)
+    assert set(response.json()["metrics"]["stage_ms"]) == {
+        "fetch",
+        "rag_context",
+        "analyst",
+    }
+
+    response = client.get("/stats/stages", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json()["analyst"]["count"] == 1
@@ -0,0 +1,148 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config
+from src.database import (
+    DEFAULT_JOB_FIELDS,
+    _list_jobs_query,
+    _read,
+    close_db,
+    init_db,
+    save_jobs_bulk_sync,
+)
+from src.main import app
+from src.models.domain import RefinementJob, RefinementStatus
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+    save_jobs_bulk_sync(
+        [
+            RefinementJob(
+                id=f"job{i}",
+                page_id=f"page{i}",
+                space_key="A" if i % 2 else "B",
+                status=RefinementStatus.FAILED if i % 3 else RefinementStatus.COMPLETED,
+                original_text="Body",
+                refined_text="Refined",
+            )
+            for i in range(10)
+        ]
+    )
+    yield
+    close_db()
+
+
+def test_list_jobs_filters_and_excludes_text_by_default():
+    response = client.get(
+        "/jobs", params={"space_key": "A", "status": "failed"}, headers=HEADERS
+    )
+
+    assert response.status_code == 200
+    jobs = response.json()["jobs"]
+    assert [job["id"] for job in jobs] == ["job7", "job5", "job1"]
+    assert "original_text" not in jobs[0]
+    assert jobs[0]["created_at"] is not None
+    assert response.json()["next_cursor"] is None
+
+
+def test_list_jobs_field_projection():
+    response = client.get(
+        "/jobs",
+        params={"page_id": "page3", "fields": "id,refined_text"},
+        headers=HEADERS,
+    )
+
+    assert response.json()["jobs"] == [{"id": "job3", "refined_text": "Refined"}]
+
+
+def test_list_jobs_keyset_pagination():
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 4, "fields": "id"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/jobs", params=params, headers=HEADERS).json()
+        seen.extend(job["id"] for job in body["jobs"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"job{i}" for i in reversed(range(10))]
+
+
+def test_list_jobs_time_range():
+    now = datetime.now(timezone.utc)
+    params = {"created_after": (now + timedelta(hours=1)).isoformat()}
+    response = client.get("/jobs", params=params, headers=HEADERS)
+    assert response.json()["jobs"] == []
+
+    params = {"created_before": (now + timedelta(hours=1)).isoformat(), "limit": 1}
+    assert len(client.get("/jobs", params=params, headers=HEADERS).json()["jobs"]) == 1
+
+
+def test_list_jobs_reads_naive_timestamps_as_utc(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        naive = datetime.now(timezone.utc).replace(tzinfo=None)
+        params = {"created_after": (naive - timedelta(minutes=5)).isoformat()}
+        response = client.get("/jobs", params=params, headers=HEADERS)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert len(response.json()["jobs"]) == 10
+
+
+def test_list_jobs_rejects_bad_fields_and_cursor():
+    response = client.get("/jobs", params={"fields": "id,secret"}, headers=HEADERS)
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+    response = client.get("/jobs", params={"cursor": "!!"}, headers=HEADERS)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"status": RefinementStatus.FAILED},
+        {"space_key": "A"},
+        {"space_key": "A", "status": RefinementStatus.FAILED},
+        {"page_id": "page1"},
+        {"page_id": "page1", "status": RefinementStatus.FAILED},
+        {"space_key": "A", "created_after": datetime.now(timezone.utc)},
+    ],
+)
+def test_list_jobs_pages_in_index_order(filters):
+    query, params = _list_jobs_query(
+        filters.get("page_id"),
+        filters.get("space_key"),
+        filters.get("status"),
+        filters.get("created_after"),
+        None,
+        DEFAULT_JOB_FIELDS,
+        after=5,
+    )
+    plan = _read(
+        lambda conn: [
+            row[3]
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", (*params, 100))
+        ]
+    )
+
+    # Sorting the matches would read every one of them for each page
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -23,12 +23,24 @@ async def test_lifespan():
             "src.services.confluence.close_client",
             new_callable=AsyncMock,
         ) as mock_close_client,
+        patch(
+            "src.main.requeue_pending_jobs",
+            new_callable=AsyncMock,
+        ) as mock_requeue,
+        patch(
+            "src.main.drain_background_tasks",
+            new_callable=AsyncMock,
+        ) as mock_drain,
+        patch("src.main.close_db") as mock_close_db,
     ):
         async with lifespan(app):
             mock_init_db.assert_called_once()
             mock_init_client.assert_awaited_once()
+            mock_requeue.assert_awaited_once()
 
+        mock_drain.assert_awaited_once()
         mock_close_client.assert_awaited_once()
+        mock_close_db.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -35,7 +35,10 @@ def mock_confluence_client():
 @pytest.mark.asyncio
 async def test_refine_page_endpoint(mock_confluence_client):
     # Mocking background tasks to not actually run for the endpoint test
-    with patch("src.routes.BackgroundTasks.add_task") as mock_add_task:
+    with (
+        patch("src.routes.BackgroundTasks.add_task") as mock_add_task,
+        patch("src.services.confluence.get_page_version", return_value=1),
+    ):
         response = client.post(
             "/refine/test-page-id", headers={"X-API-Key": "dummy-api-key"}
         )
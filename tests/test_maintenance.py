@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from src import config
+from src.database import (
+    _delete_blob_hashes,
+    _write,
+    close_db,
+    delete_old_completed_jobs_sync,
+    delete_orphaned_blobs_sync,
+    find_orphaned_blob_hashes_sync,
+    get_job_sync,
+    init_db,
+    save_job_sync,
+    save_jobs_bulk_sync,
+)
+from src.maintenance import run_maintenance
+from src.models.domain import RefinementJob, RefinementStatus
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "test_jobs.db")
+    config.settings.DB_PATH = path
+    monkeypatch.setattr(config.settings, "RETENTION_COMPLETED_PER_PAGE", 2)
+    monkeypatch.setattr(config.settings, "RETENTION_FAILED_DAYS", 7.0)
+    monkeypatch.setattr(config.settings, "DB_MAINTENANCE_BATCH_SIZE", 2)
+    init_db()
+    yield path
+    close_db()
+
+
+def _save(job_id: str, status: RefinementStatus, text: str) -> None:
+    save_job_sync(
+        RefinementJob(
+            id=job_id, page_id="page1", status=status, original_text=text * 2000
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_maintenance_applies_retention_policy(db_path):
+    for i in range(5):
+        _save(f"done{i}", RefinementStatus.COMPLETED, f"version {i}")
+    _save("old-failure", RefinementStatus.FAILED, "old")
+    _save("new-failure", RefinementStatus.FAILED, "new")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "UPDATE jobs SET updated_at = ? WHERE id = 'old-failure'",
+            (time.time() - 8 * 86400,),
+        )
+
+    report = await run_maintenance()
+
+    assert report["completed_jobs_deleted"] == 3
+    assert report["expired_jobs_deleted"] == 1
+    assert report["blobs_deleted"] == 4
+    remaining = [f"done{i}" for i in range(5) if get_job_sync(f"done{i}")]
+    assert remaining == ["done3", "done4"]
+    assert get_job_sync("old-failure") is None
+    assert get_job_sync("new-failure") is not None
+    assert get_job_sync("done4").original_text == "version 4" * 2000
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 3
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert os.path.getsize(db_path + "-wal") == 0
+
+
+@pytest.mark.asyncio
+async def test_run_maintenance_can_keep_everything(db_path, monkeypatch):
+    monkeypatch.setattr(config.settings, "RETENTION_COMPLETED_PER_PAGE", 0)
+    monkeypatch.setattr(config.settings, "RETENTION_FAILED_DAYS", 0)
+    for i in range(3):
+        _save(f"done{i}", RefinementStatus.COMPLETED, f"version {i}")
+
+    report = await run_maintenance()
+
+    assert report["completed_jobs_deleted"] == 0
+    assert report["blobs_deleted"] == 0
+
+
+def test_delete_old_completed_jobs_keeps_the_newest_per_page(db_path):
+    statuses = [RefinementStatus.COMPLETED] * 4 + [RefinementStatus.FAILED]
+    save_jobs_bulk_sync(
+        [
+            RefinementJob(id=f"{page}-{i}", page_id=page, status=status)
+            for i, status in enumerate(statuses)
+            for page in ("a", "b", "c")
+        ]
+    )
+
+    assert delete_old_completed_jobs_sync(keep_per_page=2, batch_size=4) == 6
+
+    for page in ("a", "b", "c"):
+        remaining = [i for i in range(5) if get_job_sync(f"{page}-{i}")]
+        assert remaining == [2, 3, 4]
+
+
+def test_orphaned_blobs_are_rechecked_when_deleted(db_path):
+    for i in range(5):
+        _save(f"job{i}", RefinementStatus.FAILED, f"text {i}")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM jobs")
+
+    hashes = find_orphaned_blob_hashes_sync("", 10)
+    assert len(hashes) == 5
+    _save("again", RefinementStatus.FAILED, "text 0")
+
+    assert _write("delete_blobs", _delete_blob_hashes(hashes)) == 4
+    assert delete_orphaned_blobs_sync(batch_size=2) == 0
+    assert get_job_sync("again").original_text == "text 0" * 2000
+
+
+def test_new_databases_use_incremental_auto_vacuum(db_path):
+    close_db()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
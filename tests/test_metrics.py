@@ -0,0 +1,93 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src import config
+from src.database import count_jobs_by_status_sync, init_db, save_job_sync
+from src.main import app
+from src.metrics import TrackedSemaphore, render_latest
+from src.models.domain import RefinementJob, RefinementStatus
+from src.services import confluence
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    db_path = tmp_path / "test_jobs.db"
+    config.settings.DB_PATH = str(db_path)
+    init_db()
+
+
+def test_metrics_endpoint_reports_job_status_counts():
+    save_job_sync(RefinementJob(id="a", page_id="1", status=RefinementStatus.PENDING))
+    save_job_sync(RefinementJob(id="b", page_id="2", status=RefinementStatus.PENDING))
+
+    response = client.get("/metrics", headers={"X-API-Key": "dummy-api-key"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'refinement_jobs{status="pending"} 2.0' in response.text
+    assert "sqlite_write_duration_seconds_count" in response.text
+
+
+def test_metrics_endpoint_requires_api_key():
+    response = client.get("/metrics")
+    assert response.status_code == 401
+
+
+def test_render_latest_multiprocess_mode(tmp_path, monkeypatch):
+    metrics_dir = tmp_path / "prometheus"
+    metrics_dir.mkdir()
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(metrics_dir))
+    save_job_sync(RefinementJob(id="a", page_id="1", status=RefinementStatus.FAILED))
+
+    payload = render_latest(count_jobs_by_status_sync).decode()
+    assert 'refinement_jobs{status="failed"} 1.0' in payload
+
+
+@pytest.mark.asyncio
+async def test_tracked_semaphore_reports_occupancy():
+    semaphore = TrackedSemaphore(2, "test-pool")
+
+    def in_use() -> float:
+        value = REGISTRY.get_sample_value("semaphore_in_use", {"pool": "test-pool"})
+        return value or 0.0
+
+    async with semaphore:
+        assert in_use() == 1.0
+    assert in_use() == 0.0
+    assert REGISTRY.get_sample_value("semaphore_capacity", {"pool": "test-pool"}) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_confluence_requests_are_timed(respx_mock):
+    labels = {
+        "method": "GET",
+        "endpoint": "/wiki/rest/api/content/{id}",
+        "status_code": "200",
+    }
+    before = (
+        REGISTRY.get_sample_value("confluence_request_duration_seconds_count", labels)
+        or 0.0
+    )
+    respx_mock.get(
+        f"{config.settings.CONFLUENCE_URL}/wiki/rest/api/content/42?expand=body.storage,space,version"
+    ).mock(
+        return_value=httpx.Response(
+            200, json={"id": "42", "title": "T", "space": {"key": "S"}}
+        )
+    )
+
+    confluence._client = None
+    await confluence.init_client()
+    try:
+        await confluence.get_page("42")
+    finally:
+        await confluence.close_client()
+
+    after = REGISTRY.get_sample_value(
+        "confluence_request_duration_seconds_count", labels
+    )
+    assert after == before + 1
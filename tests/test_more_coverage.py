@@ -110,9 +110,7 @@ async def test_update_page_failure(mock_chroma):
         )
         m_client.put.return_value = m_response
 
-        from tenacity import RetryError
-
-        with pytest.raises(RetryError):
+        with pytest.raises(httpx.HTTPStatusError):
             await confluence.update_page("1", "T", "B", 2)
 
 
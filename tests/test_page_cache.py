@@ -0,0 +1,128 @@
+import sqlite3
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src import config
+from src.models.domain import PageRecord
+from src.services import confluence, page_cache
+
+
+def _page(version: int, body: str = "<p>Body</p>") -> PageRecord:
+    return PageRecord(id="p1", title="T", space_key="S", body=body, version=version)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    path = str(tmp_path / "page_cache.db")
+    config.settings.PAGE_CACHE_PATH = path
+    yield path
+    page_cache.close()
+    config.settings.PAGE_CACHE_PATH = ""
+
+
+@pytest.fixture
+def remote():
+    with (
+        patch("src.services.confluence.get_page", new_callable=AsyncMock) as get_page,
+        patch(
+            "src.services.confluence.get_page_version", new_callable=AsyncMock
+        ) as get_version,
+    ):
+        yield get_page, get_version
+
+
+@pytest.mark.asyncio
+async def test_fresh_page_is_served_without_requests(cache_path, remote):
+    get_page, get_version = remote
+    get_page.return_value = _page(1)
+
+    first = await page_cache.get_page("p1")
+    second = await page_cache.get_page("p1")
+
+    assert first == second == _page(1)
+    assert get_page.await_count == 1
+    get_version.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_page_is_revalidated_by_version(cache_path, remote):
+    get_page, get_version = remote
+    await page_cache.store([_page(1)])
+    get_version.return_value = 1
+
+    page = await page_cache.get_page("p1", max_age=0)
+
+    assert page == _page(1)
+    get_page.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_changed_page_is_downloaded_again(cache_path, remote):
+    get_page, get_version = remote
+    await page_cache.store([_page(1)])
+    get_version.return_value = 2
+    get_page.return_value = _page(2, "<p>New</p>")
+
+    page = await page_cache.get_page("p1", max_age=0)
+
+    assert page.body == "<p>New</p>"
+    with sqlite3.connect(cache_path) as conn:
+        versions = conn.execute("SELECT version FROM pages").fetchall()
+    assert versions == [(2,)]
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_downloads(remote):
+    get_page, _ = remote
+    get_page.return_value = _page(1)
+    config.settings.PAGE_CACHE_PATH = ""
+
+    await page_cache.store([_page(1)])
+    await page_cache.get_page("p1")
+    await page_cache.get_page("p1")
+
+    assert get_page.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_page_version_skips_the_body(respx_mock):
+    route = respx_mock.get(
+        f"{config.settings.CONFLUENCE_URL}/wiki/rest/api/content/42?expand=version"
+    ).mock(
+        return_value=httpx.Response(200, json={"id": "42", "version": {"number": 7}})
+    )
+    confluence._client = None
+
+    assert await confluence.get_page_version("42") == 7
+    assert route.called
+
+
+@pytest.mark.asyncio
+async def test_downloaded_page_is_revalidated_by_version(cache_path, respx_mock):
+    content = f"{config.settings.CONFLUENCE_URL}/wiki/rest/api/content/42"
+    page_route = respx_mock.get(f"{content}?expand=body.storage,space,version").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "id": "42",
+                "title": "T",
+                "space": {"key": "S"},
+                "body": {"storage": {"value": "<p>Body</p>"}},
+                "version": {"number": 3},
+            },
+        )
+    )
+    version_route = respx_mock.get(f"{content}?expand=version").mock(
+        return_value=httpx.Response(200, json={"id": "42", "version": {"number": 3}})
+    )
+    confluence._client = None
+
+    first = await page_cache.get_page("42", max_age=0)
+    second = await page_cache.get_page("42", max_age=0)
+
+    assert first == second
+    assert second.version == 3
+    assert page_route.call_count == 1
+    assert version_route.call_count == 1
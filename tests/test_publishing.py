@@ -0,0 +1,220 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config
+from src.database import close_db, init_db, save_jobs_bulk_sync
+from src.main import app
+from src.models.domain import PageRecord, RefinementJob, RefinementStatus
+from src.publishing import publish_job, publish_jobs
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+def _completed(job_id: str, page_id: str, space_key: str = "S") -> RefinementJob:
+    return RefinementJob(
+        id=job_id,
+        page_id=page_id,
+        space_key=space_key,
+        status=RefinementStatus.COMPLETED,
+        refined_text=f"Refined {page_id}",
+    )
+
+
+def _conflict() -> httpx.HTTPStatusError:
+    request = httpx.Request("PUT", "https://dummy.local/wiki/api/v2/pages/p1")
+    return httpx.HTTPStatusError(
+        "Conflict", request=request, response=httpx.Response(409, request=request)
+    )
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    config.settings.DB_PATH = str(tmp_path / "test_jobs.db")
+    init_db()
+    yield
+    close_db()
+
+
+@pytest.fixture
+def remote():
+    async def get_page(page_id):
+        return PageRecord(
+            id=page_id, title=f"T{page_id}", space_key="S", body="", version=7
+        )
+
+    with (
+        patch("src.services.confluence.get_page", side_effect=get_page),
+        patch(
+            "src.services.confluence.get_page_version", new_callable=AsyncMock
+        ) as get_version,
+        patch(
+            "src.services.confluence.update_page", new_callable=AsyncMock
+        ) as update_page,
+    ):
+        yield update_page, get_version
+
+
+@pytest.mark.asyncio
+async def test_publish_job_bumps_the_current_version(remote):
+    update_page, _ = remote
+
+    result = await publish_job(_completed("j1", "p1"))
+
+    assert result.status == "published"
+    assert result.version == 8
+    update_page.assert_awaited_once_with(
+        page_id="p1",
+        title="Tp1",
+        body="Refined p1",
+        version_number=8,
+        message="Automated refinement: 1 added of 0 elements",
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_job_skips_equivalent_markup(remote):
+    update_page, _ = remote
+    job = _completed("j1", "p1")
+    job.refined_text = '<p>Refined   p1</p>\n<ac:image ac:width="2" ac:height="1"/>'
+
+    async def get_page(page_id):
+        return PageRecord(
+            id=page_id,
+            title="T",
+            space_key="S",
+            body='<p>Refined p1</p><ac:image ac:height="1" ac:width="2"/>',
+            version=7,
+        )
+
+    with patch("src.services.confluence.get_page", side_effect=get_page):
+        result = await publish_job(job)
+
+    assert (result.status, result.version) == ("skipped", 7)
+    update_page.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish_job_retries_conflicts_with_the_latest_version(remote):
+    update_page, get_version = remote
+    update_page.side_effect = [_conflict(), None]
+    get_version.return_value = 9
+
+    result = await publish_job(_completed("j1", "p1"))
+
+    assert result.status == "published"
+    assert result.version == 10
+    assert update_page.await_args.kwargs["version_number"] == 10
+
+
+@pytest.mark.asyncio
+async def test_publish_job_gives_up_after_repeated_conflicts(remote, monkeypatch):
+    monkeypatch.setattr(config.settings, "PUBLISH_CONFLICT_RETRIES", 2)
+    update_page, get_version = remote
+    update_page.side_effect = _conflict()
+    get_version.return_value = 9
+
+    result = await publish_job(_completed("j1", "p1"))
+
+    assert result.status == "failed"
+    assert update_page.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_publish_job_refuses_to_overwrite_a_newer_version(remote):
+    update_page, _ = remote
+    job = _completed("j1", "p1")
+    job.page_version = 6
+
+    result = await publish_job(job)
+
+    assert result.status == "failed"
+    assert "refined version 6, current version 7" in result.error
+    update_page.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish_job_stops_when_a_conflict_saved_newer_content(remote):
+    update_page, get_version = remote
+    update_page.side_effect = _conflict()
+    get_version.return_value = 8
+    job = _completed("j1", "p1")
+    job.page_version = 7
+
+    result = await publish_job(job)
+
+    assert result.status == "failed"
+    assert "current version 8" in result.error
+    assert update_page.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_jobs_bounds_concurrency(remote, monkeypatch):
+    monkeypatch.setattr(config.settings, "PUBLISH_CONCURRENCY", 2)
+    update_page, _ = remote
+    save_jobs_bulk_sync([_completed(f"j{i}", f"p{i}") for i in range(6)])
+    in_flight = 0
+    max_in_flight = 0
+
+    async def update(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    update_page.side_effect = update
+
+    results = await publish_jobs([f"j{i}" for i in range(6)])
+
+    assert [result.job_id for result in results] == [f"j{i}" for i in range(6)]
+    assert all(result.status == "published" for result in results)
+    assert max_in_flight == 2
+
+
+def test_publish_batch_reports_each_job(remote):
+    save_jobs_bulk_sync(
+        [
+            _completed("ok", "p1"),
+            RefinementJob(id="pending", page_id="p2", status=RefinementStatus.PENDING),
+        ]
+    )
+
+    response = client.post(
+        "/publish/batch",
+        json={"job_ids": ["ok", "missing", "pending"]},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["published"], body["skipped"], body["failed"]) == (1, 0, 2)
+    assert [(r["job_id"], r["status"]) for r in body["results"]] == [
+        ("ok", "published"),
+        ("missing", "failed"),
+        ("pending", "failed"),
+    ]
+    assert body["results"][1]["error"] == "Job not found"
+
+
+def test_publish_space_uses_latest_completed_job_per_page(remote):
+    update_page, _ = remote
+    save_jobs_bulk_sync(
+        [
+            _completed("old", "p1"),
+            _completed("new", "p1"),
+            _completed("other", "p2"),
+            _completed("elsewhere", "p3", space_key="X"),
+        ]
+    )
+
+    response = client.post("/publish/space/S", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert [r["job_id"] for r in response.json()["results"]] == ["new", "other"]
+    assert update_page.await_count == 2
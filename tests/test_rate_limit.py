@@ -0,0 +1,214 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.services import confluence
+from src.services.rate_limit import RateLimitedTransport, RateLimiter, retry_after
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_RETRY_BACKOFF", 0.0)
+    monkeypatch.setattr(settings, "CONFLUENCE_MAX_RETRIES", 3)
+
+
+def _client(handler, limiter=None):
+    transport = RateLimitedTransport(
+        httpx.MockTransport(handler), limiter or RateLimiter()
+    )
+    return httpx.AsyncClient(base_url="https://dummy.local", transport=transport)
+
+
+@pytest.mark.asyncio
+async def test_retries_rate_limited_request_after_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    async with _client(handler) as client:
+        response = await client.get("/page")
+
+    assert response.status_code == 200
+    assert calls == ["/page", "/page"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_response_pauses_every_caller():
+    limiter = RateLimiter()
+    responses = iter(
+        [httpx.Response(429, headers={"Retry-After": "0.2"}), httpx.Response(200)]
+    )
+
+    async with _client(lambda request: next(responses), limiter) as client:
+        start = time.monotonic()
+        await client.get("/page")
+
+    assert time.monotonic() - start >= 0.2
+    # Another caller sharing the limiter is held back by the same pause
+    limiter.pause(0.1)
+    start = time.monotonic()
+    await limiter.wait()
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async with _client(handler) as client:
+        response = await client.get("/page")
+
+    assert response.status_code == 503
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    async with _client(handler) as client:
+        response = await client.get("/page")
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_connection_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    async with _client(handler) as client:
+        response = await client.get("/page")
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "failure, sent",
+    [
+        (httpx.Response(503), 1),
+        (httpx.ReadTimeout("lost"), 1),
+        (httpx.Response(429, headers={"Retry-After": "0"}), 2),
+        (httpx.ConnectError("refused"), 2),
+    ],
+)
+async def test_writes_are_only_retried_if_not_processed(failure, sent):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) > 1:
+            return httpx.Response(200)
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+    async with _client(handler) as client:
+        try:
+            await client.put("/wiki/api/v2/pages/1", json={"version": {"number": 2}})
+        except httpx.ReadTimeout:
+            pass
+
+    assert len(calls) == sent
+
+
+def test_retry_after_parses_dates_and_reset_header():
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    http_date = httpx.Response(429, headers={"Retry-After": format_datetime(later)})
+    reset = httpx.Response(429, headers={"X-RateLimit-Reset": later.isoformat()})
+    missing = httpx.Response(429)
+
+    assert 28 <= (retry_after(http_date) or 0) <= 30
+    assert 28 <= (retry_after(reset) or 0) <= 30
+    assert retry_after(missing) is None
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_pauses_until_reset():
+    limiter = RateLimiter()
+    reset = datetime.now(timezone.utc) + timedelta(seconds=0.2)
+    limiter.observe(
+        httpx.Response(
+            200,
+            headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": reset.isoformat(),
+            },
+        )
+    )
+
+    start = time.monotonic()
+    await limiter.wait()
+    assert time.monotonic() - start >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_near_limit_spaces_requests(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_NEAR_LIMIT_INTERVAL", 0.05)
+    limiter = RateLimiter()
+    limiter.observe(httpx.Response(200, headers={"X-RateLimit-NearLimit": "true"}))
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.wait()
+    assert time.monotonic() - start >= 0.1
+
+    limiter.observe(httpx.Response(200))
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.wait()
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_space_fetch_resumes_pagination_after_rate_limit(respx_mock):
+    base = f"{settings.CONFLUENCE_URL}/wiki/rest/api/content"
+    first = respx_mock.get(
+        f"{base}?spaceKey=TEST&expand=body.storage,version&limit=50"
+    ).mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "results": [{"id": "1", "title": "A"}],
+                "_links": {"next": "/rest/api/content?spaceKey=TEST&start=1"},
+            },
+        )
+    )
+    second = respx_mock.get(f"{base}?spaceKey=TEST&start=1").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"results": [{"id": "2", "title": "B"}]}),
+        ]
+    )
+    confluence._client = None
+
+    pages = await confluence.get_pages_from_space("TEST")
+
+    assert [page.id for page in pages] == ["1", "2"]
+    assert first.call_count == 1
+    assert second.call_count == 2
@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import config
+from src.database import (
+    close_db,
+    get_refined_versions_sync,
+    init_db,
+    save_jobs_bulk_sync,
+)
+from src.main import app
+from src.models.domain import PageRecord, RefinementJob, RefinementStatus
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key"}
+
+
+@pytest.fixture(autouse=True)
+def setup_db(tmp_path):
+    config.settings.DB_PATH = str(tmp_path / "test_jobs.db")
+    init_db()
+    save_jobs_bulk_sync(
+        [
+            RefinementJob(
+                id="old",
+                page_id="p1",
+                status=RefinementStatus.COMPLETED,
+                page_version=1,
+            ),
+            RefinementJob(
+                id="new",
+                page_id="p1",
+                status=RefinementStatus.COMPLETED,
+                page_version=2,
+            ),
+            RefinementJob(
+                id="failed",
+                page_id="p2",
+                status=RefinementStatus.FAILED,
+                page_version=5,
+            ),
+            RefinementJob(
+                id="done",
+                page_id="p3",
+                status=RefinementStatus.COMPLETED,
+                page_version=3,
+            ),
+        ]
+    )
+    yield
+    close_db()
+
+
+def test_get_refined_versions_uses_latest_completed_job():
+    assert get_refined_versions_sync(["p1", "p2", "p3", "p4"]) == {"p1": 2, "p3": 3}
+
+
+def test_space_changes_lists_pages_with_unrefined_versions():
+    pages = [
+        PageRecord(id="p1", title="Changed", space_key="S", body="", version=3),
+        PageRecord(id="p2", title="Failed", space_key="S", body="", version=5),
+        PageRecord(id="p3", title="Same", space_key="S", body="", version=3),
+    ]
+    with patch(
+        "src.services.confluence.list_space_pages",
+        new_callable=AsyncMock,
+        return_value=pages,
+    ):
+        response = client.get("/spaces/S/changes", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "space_key": "S",
+        "changed": [
+            {"page_id": "p1", "title": "Changed", "version": 3, "refined_version": 2},
+            {"page_id": "p2", "title": "Failed", "version": 5, "refined_version": None},
+        ],
+        "unchanged": 1,
+    }
+
+
+def test_space_changes_reports_listing_failures():
+    with patch(
+        "src.services.confluence.list_space_pages",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("boom"),
+    ):
+        response = client.get("/spaces/S/changes", headers=HEADERS)
+
+    assert response.status_code == 502
@@ -0,0 +1,170 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.models.domain import PageRecord
+from src.services import confluence
+
+SPACE_SIZE = 230
+
+
+class FakeSpace:
+    """Serve a space of numbered pages, capping listing pages at 50 results."""
+
+    def __init__(self, count_endpoint: bool = True, total_in_listing: bool = False):
+        self.count_endpoint = count_endpoint
+        self.total_in_listing = total_in_listing
+        self.starts: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/wiki/rest/api/search":
+            if not self.count_endpoint:
+                return httpx.Response(404)
+            return httpx.Response(200, json={"results": [], "totalSize": SPACE_SIZE})
+
+        start = int(request.url.params.get("start", 0))
+        limit = min(int(request.url.params["limit"]), 50)
+        self.starts.append(start)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Later offsets answer first, so arrival order differs from offset order
+        await asyncio.sleep(0.01 * (SPACE_SIZE - start) / 50)
+        self.in_flight -= 1
+
+        end = min(start + limit, SPACE_SIZE)
+        data = {
+            "results": [{"id": str(i), "title": f"P{i}"} for i in range(start, end)],
+            "start": start,
+            "limit": limit,
+            "size": end - start,
+            "_links": {},
+        }
+        if end < SPACE_SIZE:
+            data["_links"][
+                "next"
+            ] = f"/rest/api/content?spaceKey=S&limit={limit}&start={end}"
+        if self.total_in_listing:
+            data["totalSize"] = SPACE_SIZE
+        return httpx.Response(200, json=data)
+
+
+@pytest.fixture
+def fake_space():
+    def install(space: FakeSpace) -> FakeSpace:
+        confluence._client = httpx.AsyncClient(
+            base_url="https://dummy.local", transport=httpx.MockTransport(space)
+        )
+        return space
+
+    yield install
+    confluence._client = None
+
+
+def _ids(pages):
+    return [page.id for page in pages]
+
+
+@pytest.mark.asyncio
+async def test_parallel_listing_fetches_offsets_concurrently(fake_space):
+    space = fake_space(FakeSpace())
+
+    pages = await confluence.get_pages_from_space("S", page_size=100)
+
+    assert _ids(pages) == [str(i) for i in range(SPACE_SIZE)]
+    # The server capped the page size at 50, so offsets step by 50
+    assert sorted(space.starts) == [0, 50, 100, 150, 200]
+    assert 1 < space.max_in_flight <= 4
+
+
+@pytest.mark.asyncio
+async def test_parallel_listing_yields_as_pages_arrive(fake_space):
+    fake_space(FakeSpace(total_in_listing=True))
+
+    batches = [
+        batch async for batch in confluence.iter_space_pages("S", 50, ordered=False)
+    ]
+
+    assert _ids(batches[1]) == [str(i) for i in range(200, SPACE_SIZE)]
+    assert sorted(int(i) for batch in batches for i in _ids(batch)) == list(
+        range(SPACE_SIZE)
+    )
+
+
+@pytest.mark.asyncio
+async def test_listing_follows_next_links_without_a_count(fake_space):
+    space = fake_space(FakeSpace(count_endpoint=False))
+
+    pages = await confluence.get_pages_from_space("S")
+
+    assert len(pages) == SPACE_SIZE
+    assert space.starts == [0, 50, 100, 150, 200]
+    assert space.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_listing_limit_stops_outstanding_requests(fake_space):
+    fake_space(FakeSpace(total_in_listing=True))
+
+    pages = await confluence.get_pages_from_space("S", limit=60, page_size=50)
+
+    assert _ids(pages) == [str(i) for i in range(60)]
+
+
+@pytest.mark.asyncio
+async def test_sequential_listing_with_concurrency_one(fake_space):
+    space = fake_space(FakeSpace(total_in_listing=True))
+
+    batches = [
+        batch async for batch in confluence.iter_space_pages("S", 50, concurrency=1)
+    ]
+
+    assert len(batches) == 5
+    assert space.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_lightweight_listing_skips_bodies(fake_space):
+    space = fake_space(FakeSpace(total_in_listing=True))
+    expands = []
+    original = space.__call__
+
+    async def record(request):
+        expands.append(request.url.params.get("expand"))
+        return await original(request)
+
+    confluence._client = httpx.AsyncClient(
+        base_url="https://dummy.local", transport=httpx.MockTransport(record)
+    )
+
+    pages = await confluence.list_space_pages("S")
+
+    assert len(pages) == SPACE_SIZE
+    assert set(expands) == {"version"}
+    assert all(page.body == "" for page in pages)
+
+
+@pytest.mark.asyncio
+async def test_get_pages_bounds_concurrency_and_skips_failures():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_page(page_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if page_id == "bad":
+            raise httpx.ConnectError("refused")
+        return PageRecord(id=page_id, title=page_id, space_key="S", body="x")
+
+    ids = ["a", "bad", "b", "c", "d", "e"]
+    with patch("src.services.confluence.get_page", side_effect=get_page):
+        pages = await confluence.get_pages(ids, concurrency=2)
+
+    assert [page.id for page in pages] == ["a", "b", "c", "d", "e"]
+    assert max_in_flight == 2
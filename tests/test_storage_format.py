@@ -0,0 +1,67 @@
+import time
+
+from src.storage_format import change_summary, normalize
+
+
+def test_normalize_sorts_attributes_and_collapses_whitespace():
+    assert normalize('<p  class="a"\n id="b">Hello \n  world</p>') == [
+        '<p class="a" id="b">',
+        "Hello world",
+        "</p>",
+    ]
+
+
+def test_change_summary_ignores_formatting_only_changes():
+    old = '<h1>Title</h1><p>Some text</p><ac:image ac:width="20" ac:height="10"/>'
+    new = (
+        "<h1>Title</h1>\n"
+        "<p>\n  Some   text\n</p>\n"
+        '<ac:image ac:height="10" ac:width="20"/>'
+    )
+
+    assert change_summary(old, new) is None
+    assert change_summary(old, new.replace("Some", "More")) == "1 changed of 7 elements"
+
+
+def test_code_blocks_keep_their_whitespace():
+    old = (
+        '<ac:structured-macro ac:name="code"><ac:plain-text-body>'
+        "<![CDATA[if x:\n    y()]]></ac:plain-text-body></ac:structured-macro>"
+    )
+
+    assert change_summary(old, old.replace("    y()", " y()")) is not None
+    assert change_summary("<pre>a  b</pre>", "<pre>a b</pre>") is not None
+
+
+def test_change_summary_counts_changed_added_and_removed_elements():
+    old = "<p>One</p><p>Two</p><p>Three</p>"
+    new = "<p>One</p><p>2</p><p>Three</p><p>Four</p>"
+
+    assert change_summary(old, new) == "1 changed, 3 added of 9 elements"
+    assert change_summary(new, old) == "1 changed, 3 removed of 12 elements"
+
+
+def test_change_summary_reports_moved_elements():
+    old = "<p>One</p><p>Two</p>"
+
+    assert change_summary(old, "<p>Two</p><p>One</p>") == "4 reordered of 6 elements"
+
+
+def test_change_summary_of_a_large_page_is_fast():
+    paragraphs = [
+        f'<p>Step {i}: run <code>deploy</code>, see <a href="/x/{i}">logs</a>.</p>'
+        for i in range(6000)
+    ]
+    old = "".join(paragraphs)
+    new = "".join(
+        p.replace("Step", "Stage") if i % 7 == 0 else p
+        for i, p in enumerate(paragraphs)
+    )
+    assert len(old) > 400_000
+
+    start = time.perf_counter()
+    summary = change_summary(old, new)
+
+    # An edit script over these repeated tags took minutes
+    assert time.perf_counter() - start < 5
+    assert summary == f"858 changed of {len(normalize(old))} elements"
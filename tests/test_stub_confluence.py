@@ -0,0 +1,114 @@
+import json
+
+import httpx
+import pytest
+
+from benchmarks.stub_confluence import Recorder, StubConfig, StubConfluence
+from src.config import settings
+from src.models.domain import RefinementJob, RefinementStatus
+from src.publishing import publish_job
+from src.services import confluence
+from src.services.rate_limit import RateLimitedTransport, RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_RETRY_BACKOFF", 0.0)
+    monkeypatch.setattr(settings, "CONFLUENCE_MAX_RETRIES", 20)
+
+
+@pytest.fixture
+def stub():
+    def install(**config) -> StubConfluence:
+        stub = StubConfluence(StubConfig(**config))
+        transport = RateLimitedTransport(
+            httpx.ASGITransport(app=stub.app), RateLimiter()
+        )
+        confluence._client = httpx.AsyncClient(
+            base_url="https://stub.local", transport=transport
+        )
+        return stub
+
+    yield install
+    confluence._client = None
+
+
+@pytest.mark.asyncio
+async def test_space_listing_pages_through_the_stub(stub):
+    server = stub(spaces={"BIG": 260, "OTHER": 3}, body_size=500)
+
+    pages = await confluence.get_pages_from_space("BIG", page_size=100)
+
+    assert len({page.id for page in pages}) == 260
+    assert all(len(page.body) >= 500 for page in pages)
+    # Capped to 50 with bodies: one first page, a count, then four offsets
+    assert server.stats.requests == 7
+
+
+@pytest.mark.asyncio
+async def test_client_recovers_from_rate_limits_and_errors(stub):
+    server = stub(
+        spaces={"S": 120}, rate_limit=3, rate_window=0.05, error_rate=0.2, seed=1
+    )
+
+    pages = await confluence.list_space_pages("S", page_size=10)
+
+    assert [page.version for page in pages] == [1] * 120
+    assert server.stats.throttled > 0
+    assert server.stats.errors > 0
+
+
+@pytest.mark.asyncio
+async def test_updates_check_the_version(stub):
+    server = stub(spaces={"S": 1})
+    page = (await confluence.list_space_pages("S"))[0]
+
+    await confluence.update_page(page.id, "New", "<p>New</p>", 2)
+    with pytest.raises(httpx.HTTPStatusError) as conflict:
+        await confluence.update_page(page.id, "New", "<p>New</p>", 2)
+
+    assert conflict.value.response.status_code == 409
+    assert await confluence.get_page_version(page.id) == 2
+    assert (await confluence.get_page(page.id)).body == "<p>New</p>"
+    assert server.stats.updates == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_bumps_the_current_version_in_one_update(stub):
+    server = stub(spaces={"S": 1})
+    page = (await confluence.list_space_pages("S"))[0]
+    await confluence.update_page(page.id, "Edited", "<p>Edited</p>", 2)
+    server.reset_stats()
+    job = RefinementJob(
+        id="j1",
+        page_id=page.id,
+        status=RefinementStatus.COMPLETED,
+        refined_text="<p>Refined</p>",
+        page_version=2,
+    )
+
+    result = await publish_job(job)
+
+    assert (result.status, result.version) == ("published", 3)
+    assert server.page_version(page.id) == 3
+    assert server.stats.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_recorded_responses_are_replayed(stub, tmp_path):
+    recording = tmp_path / "recording.jsonl"
+    recorded = stub(spaces={"S": 2})
+    page_id = (await confluence.list_space_pages("S"))[0].id
+    confluence._client.event_hooks["response"].append(Recorder(recording))
+    original = await confluence.get_page(page_id)
+
+    entry = json.loads(recording.read_text())
+    entry["body"]["title"] = "Recorded title"
+    recording.write_text(json.dumps(entry) + "\n")
+    replaying = stub(spaces={}, replay=recording)
+
+    page = await confluence.get_page(page_id)
+
+    assert (page.title, page.body) == ("Recorded title", original.body)
+    assert replaying.stats.replayed == 1
+    assert recorded.stats.replayed == 0
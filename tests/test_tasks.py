@@ -239,7 +239,41 @@ async def test_publish_page_success(mock_confluence_client):
         )
         assert response.status_code == 200
         assert response.json()["message"] == "Page published successfully"
-        assert mock_update_page.called
+        assert response.json()["version"] == 2
+        assert mock_update_page.await_args.kwargs["version_number"] == 2
+
+
+@pytest.mark.asyncio
+async def test_publish_page_skips_unchanged_text(mock_confluence_client):
+    job = RefinementJob(
+        id="same-job",
+        page_id="page1",
+        status=RefinementStatus.COMPLETED,
+        refined_text="<p>Same  text</p>",
+    )
+    save_job_sync(job)
+
+    page = ConfluencePage(
+        id="page1", title="Title", space_key="SPACE", body="<p>Same text</p>"
+    )
+    with (
+        patch(
+            "src.services.confluence.get_page",
+            new_callable=AsyncMock,
+            return_value=page,
+        ),
+        patch(
+            "src.services.confluence.update_page",
+            new_callable=AsyncMock,
+        ) as mock_update_page,
+    ):
+        response = client.post(
+            "/publish/same-job", headers={"X-API-Key": "dummy-api-key"}
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "Page is unchanged, nothing to publish"
+        assert response.json()["version"] == 1
+        mock_update_page.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,123 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import tracing
+from src.main import app
+from src.models.domain import (
+    AnalysisResult,
+    ConfluencePage,
+    RefinementJob,
+    RefinementStatus,
+)
+from src.tasks import _perform_refinement
+
+
+@pytest.fixture
+def exporter():
+    exporter = tracing.InMemoryExporter()
+    tracing.set_exporter(exporter)
+    yield exporter
+    tracing.set_exporter(None)
+
+
+def _by_name(exporter: tracing.InMemoryExporter) -> dict[str, tracing.Span]:
+    return {s.name: s for s in exporter.spans}
+
+
+def test_span_is_noop_without_exporter():
+    with tracing.span("noop") as active:
+        assert active is None
+        assert tracing.current_span() is None
+
+
+def test_nested_spans_share_trace(exporter):
+    with tracing.span("parent", key="value"):
+        with tracing.span("child"):
+            tracing.set_attribute("answer", 42)
+
+    spans = _by_name(exporter)
+    assert spans["child"].parent_id == spans["parent"].span_id
+    assert spans["child"].trace_id == spans["parent"].trace_id
+    assert spans["child"].attributes == {"answer": 42}
+    assert spans["parent"].attributes == {"key": "value"}
+    assert spans["parent"].parent_id is None
+
+
+def test_span_records_errors(exporter):
+    with pytest.raises(ValueError):
+        with tracing.span("boom"):
+            raise ValueError("bad")
+
+    assert exporter.spans[0].status == "error"
+    assert exporter.spans[0].error == "ValueError: bad"
+
+
+@pytest.mark.asyncio
+async def test_context_propagates_to_tasks_and_threads(exporter):
+    def in_thread() -> None:
+        with tracing.span("thread"):
+            pass
+
+    @tracing.traced("task")
+    async def in_task() -> None:
+        await asyncio.to_thread(in_thread)
+
+    with tracing.span("root"):
+        await asyncio.create_task(in_task())
+
+    spans = _by_name(exporter)
+    assert spans["task"].parent_id == spans["root"].span_id
+    assert spans["thread"].parent_id == spans["task"].span_id
+    assert len({s.trace_id for s in exporter.spans}) == 1
+
+
+def test_json_file_exporter(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracing.set_exporter(tracing.JsonFileExporter(str(path)))
+    try:
+        with tracing.span("outer"):
+            with tracing.span("inner"):
+                pass
+    finally:
+        tracing.set_exporter(None)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["inner", "outer"]
+    assert records[0]["parent_id"] == records[1]["span_id"]
+
+
+@pytest.mark.asyncio
+async def test_refinement_stages_are_traced(exporter):
+    job = RefinementJob(id="job1", page_id="page1", status=RefinementStatus.PENDING)
+    page = ConfluencePage(id="page1", title="T", space_key="S", body="Text")
+
+    with (
+        patch("src.services.rag.query_context", new_callable=AsyncMock) as m_query,
+        patch("src.agents.analyst.analyze_content", new_callable=AsyncMock) as m_an,
+        patch("src.tasks.save_job", new_callable=AsyncMock),
+    ):
+        m_query.return_value = []
+        m_an.return_value = AnalysisResult(critiques=[])
+        with tracing.span("refinement.job"):
+            await _perform_refinement(job, page)
+
+    spans = _by_name(exporter)
+    root = spans["refinement.job"]
+    assert spans["stage.rag_context"].parent_id == root.span_id
+    assert spans["stage.analyst"].parent_id == root.span_id
+
+
+def test_http_requests_are_traced(exporter):
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 401
+
+    request_span = _by_name(exporter)["http.request"]
+    assert request_span.attributes == {
+        "method": "GET",
+        "path": "/metrics",
+        "status_code": 401,
+    }
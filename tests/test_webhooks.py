@@ -0,0 +1,180 @@
+import hashlib
+import hmac
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import webhooks
+from src.config import settings
+from src.main import app
+from src.models.domain import PageRecord
+from src.services import rag
+from src.webhooks import IngestQueue
+
+client = TestClient(app)
+
+HEADERS = {"X-API-Key": "dummy-api-key", "Content-Type": "application/json"}
+PAYLOADS = Path(__file__).parent / "payloads" / "webhooks"
+
+
+def _payload(name: str) -> bytes:
+    return (PAYLOADS / f"{name}.json").read_bytes()
+
+
+def _page(page_id: str) -> PageRecord:
+    return PageRecord(id=page_id, title=page_id, space_key="DOCS", body="text")
+
+
+@pytest.fixture
+def index():
+    async def get_pages(page_ids):
+        return [_page(page_id) for page_id in page_ids]
+
+    with (
+        patch(
+            "src.services.confluence.get_pages", side_effect=get_pages
+        ) as get_pages_mock,
+        patch(
+            "src.services.rag.apply_changes", new_callable=AsyncMock
+        ) as apply_changes,
+    ):
+        yield get_pages_mock, apply_changes
+    webhooks._queue = None
+
+
+def _applied(apply_changes):
+    return [
+        ([page.id for page in call.args[0]], list(call.args[1]))
+        for call in apply_changes.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replayed_events_are_debounced_into_one_batch(index):
+    _, apply_changes = index
+    for name in ("page_created", "page_updated", "page_removed", "space_updated"):
+        response = client.post(
+            "/webhooks/confluence", content=_payload(name), headers=HEADERS
+        )
+        assert response.status_code == 202
+
+    assert response.json() == {"message": "Event ignored", "event": "space_updated"}
+    assert len(webhooks.get_queue()) == 2
+
+    await webhooks.stop()
+
+    assert _applied(apply_changes) == [(["1001"], ["1002"])]
+
+
+def test_event_type_can_come_from_the_header(index):
+    payload = json.loads(_payload("page_updated"))
+    del payload["event"]
+
+    response = client.post(
+        "/webhooks/confluence",
+        json=payload,
+        headers={**HEADERS, "X-Event-Key": "page_trashed"},
+    )
+
+    assert response.json()["operation"] == "delete"
+
+
+def test_signed_webhooks_do_not_need_the_api_key(index, monkeypatch):
+    monkeypatch.setattr(settings, "CONFLUENCE_WEBHOOK_SECRET", "s3cret")
+    body = _payload("page_created")
+    signature = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+
+    signed = client.post(
+        "/webhooks/confluence",
+        content=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-Hub-Signature": f"sha256={signature}",
+        },
+    )
+    forged = client.post(
+        "/webhooks/confluence",
+        content=body,
+        headers={**HEADERS, "X-Hub-Signature": "sha256=00"},
+    )
+
+    assert signed.status_code == 202
+    assert forged.status_code == 401
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_bursts_are_applied_once_after_the_debounce(index):
+    get_pages, apply_changes = index
+    clock = _Clock()
+    queue = IngestQueue(debounce=1, max_delay=10, batch_size=100, clock=clock)
+    queue.enqueue("p2", "upsert")
+    queue.enqueue("p2", "delete")
+    for _ in range(5):
+        queue.enqueue("p1", "upsert")
+        clock.now += 0.1
+    await queue.apply_due()
+    assert apply_changes.await_count == 0
+
+    clock.now = 1.0
+    await queue.apply_due()
+    clock.now = 1.4
+    await queue.apply_due()
+
+    # p2 fell due first; p1 was held back until its edits stopped
+    assert _applied(apply_changes) == [([], ["p2"]), (["p1"], [])]
+    assert get_pages.await_args_list[-1].args == (["p1"],)
+
+
+@pytest.mark.asyncio
+async def test_continuous_edits_are_applied_after_the_max_delay(index):
+    _, apply_changes = index
+    clock = _Clock()
+    queue = IngestQueue(debounce=0.5, max_delay=1, batch_size=100, clock=clock)
+    for i in range(10):
+        clock.now = i * 0.3
+        queue.enqueue("p1", "upsert")
+        await queue.apply_due()
+
+    # Edits every 0.3s never go quiet for the debounce, so the page is
+    # applied once per max_delay instead
+    assert apply_changes.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_applies_in_batches(index):
+    _, apply_changes = index
+    queue = IngestQueue(debounce=60, max_delay=60, batch_size=2)
+    for i in range(5):
+        queue.enqueue(f"p{i}", "upsert")
+
+    await queue.flush()
+
+    assert [ids for ids, _ in _applied(apply_changes)] == [
+        ["p0", "p1"],
+        ["p2", "p3"],
+        ["p4"],
+    ]
+    assert len(queue) == 0
+
+
+def test_apply_changes_writes_all_pages_in_one_batch():
+    collection = MagicMock()
+    with patch("src.services.rag._get_collection", return_value=collection):
+        rag._apply_changes([_page("a"), _page("b")], ["gone"])
+
+    collection.delete.assert_called_once_with(
+        where={"page_id": {"$in": ["a", "b", "gone"]}}
+    )
+    collection.add.assert_called_once()
+    assert collection.add.call_args.kwargs["ids"] == ["a_chunk_0", "b_chunk_0"]